@@ -1,6 +1,8 @@
 # /config.py
 import os
 
+from src.db.storage import DEFAULT_SQLITE_PRAGMAS
+
 # Caminho base do projeto
 basedir = os.path.abspath(os.path.dirname(__file__))
 db_path = os.path.join(basedir, "src", "db")
@@ -12,4 +14,21 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         f"sqlite:///{os.path.join(db_path, 'app.db')}"
 
+    # PRAGMAs aplicados em toda conexão SQLite (padrão definido em src/db/storage.py)
+    SQLITE_PRAGMAS = dict(DEFAULT_SQLITE_PRAGMAS)
+    # conexões somente leitura para as consultas do dashboard
+    SQLITE_READ_POOL_SIZE = int(os.environ.get('SQLITE_READ_POOL_SIZE', 8))
+    # leituras particionadas por período: 'day' ou 'week' (ver src/db/partitions.py)
+    READINGS_PARTITION = os.environ.get('READINGS_PARTITION', 'day')
+    # arquivo frio: partições fechadas há mais de N dias viram segmentos comprimidos
+    ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR') or os.path.join(db_path, 'archive')
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 30))
+    # onde o ReadingSink grava: 'sql' (banco) ou 'memory' (ring buffer, sem persistência)
+    READINGS_BACKEND = os.environ.get('READINGS_BACKEND', 'sql')
+    # leituras mantidas por registrador no backend 'memory'
+    RING_BUFFER_SIZE = int(os.environ.get('RING_BUFFER_SIZE', 3600))
+    # esquema compacto experimental (compact_readings, só `flask compact-readings` e o benchmark):
+    # grava só o valor bruto e escala na leitura
+    COMPACT_READINGS_RAW_ONLY = os.environ.get('COMPACT_READINGS_RAW_ONLY', '0') == '1'
+
 # Você pode ter classes para diferentes ambientes, como DevelopmentConfig, etc.
\ No newline at end of file
@@ -5,7 +5,9 @@ import time
 
 from src.views import create_app
 from src.utils.async_runner import async_loop     # IMPORTA a instância global, NÃO crie outra
-from src.services.polling_service import PollingService
+from src.services.polling_service import polling_service
+from src.services.archiver import cold_archiver
+from src.services.current_values import current_values
 from src.simulations.simulation import start_modbus_simulator, add_register_test
 from src.db import db
 from src.models.PLC import PLC
@@ -19,8 +21,13 @@ port = 5020
 if __name__ == '__main__':
     app = create_app()
 
-    # Cria PollingService e injeta a app (para usar app_context corretamente)
-    polling_service = PollingService(app)
+    # Injeta a app no PollingService compartilhado (para usar app_context corretamente)
+    polling_service.init_app(app)
+    # snapshot dos valores atuais carregado do banco antes de servir /clp/<ip>/values
+    with app.app_context():
+        current_values.ensure_loaded()
+    cold_archiver.init_app(app)
+    async_loop.run_coro(cold_archiver.start())
 
     # Inicia simulador Modbus em thread separada (start_modbus_simulator deve usar asyncio.run internamente)
     thread = threading.Thread(target=start_modbus_simulator, args=(host, port), daemon=True)
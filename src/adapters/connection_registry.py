@@ -0,0 +1,184 @@
+# src/adapters/connection_registry.py
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Tuple
+
+from pymodbus.client import AsyncModbusTcpClient
+
+from .modbus_pipeline import PipelinedModbusClient
+
+logger = logging.getLogger(__name__)
+
+
+class GatewayConnection:
+    """
+    Uma conexão TCP Modbus compartilhada por todos os PLCs (unit ids) atrás do
+    mesmo ip:porta. Cada unit id tem sua própria fila e os lugares livres na
+    conexão são entregues em rodízio entre as units com requisições esperando:
+    um PLC com muitos blocos não atrasa os outros slaves do gateway em mais de
+    uma requisição por vez.
+
+    Com `max_in_flight` > 1 a conexão usa o PipelinedModbusClient e mantém até
+    essa quantidade de requisições pendentes (ou a janela atual do client, se ele
+    caiu para 1); com 1 usa o client do pymodbus, uma requisição por vez.
+    """
+
+    def __init__(self, ip_address: str, port: int, timeout: float, max_in_flight: int = 1):
+        self.ip_address = ip_address
+        self.port = port
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.client = None
+        self.refs = 0
+        self._connect_lock = asyncio.Lock()
+        self._in_flight = 0
+        self._waiting: Dict[int, Deque[asyncio.Future]] = {}  # unit id -> requisições na fila
+        self._turns: Deque[int] = deque()  # units com fila, na ordem da vez
+
+    @property
+    def pipelined(self) -> bool:
+        return self.max_in_flight > 1
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        return (self.ip_address, self.port)
+
+    @property
+    def connected(self) -> bool:
+        return self.client is not None and self.client.connected
+
+    async def connect(self) -> bool:
+        """Abre o socket se ainda não estiver aberto (chamadas concorrentes compartilham a tentativa)"""
+        async with self._connect_lock:
+            if self.connected:
+                return True
+            if self.client is None:
+                if self.pipelined:
+                    self.client = PipelinedModbusClient(
+                        host=self.ip_address,
+                        port=self.port,
+                        timeout=self.timeout,
+                        window=self.max_in_flight
+                    )
+                else:
+                    # reconnect_delay=0 desliga a reconexão automática do pymodbus:
+                    # quem decide quando reconectar é o ConnectionSupervisor do poller
+                    self.client = AsyncModbusTcpClient(
+                        host=self.ip_address,
+                        port=self.port,
+                        timeout=self.timeout,
+                        reconnect_delay=0
+                    )
+            await self.client.connect()
+            if self.client.connected:
+                logger.info(f"Conectado ao gateway {self.ip_address}:{self.port}")
+            return self.client.connected
+
+    @property
+    def capacity(self) -> int:
+        """Requisições que podem estar em voo ao mesmo tempo nesta conexão"""
+        if self.pipelined and self.client is not None:
+            return max(1, min(self.max_in_flight, self.client.window))
+        return 1
+
+    @asynccontextmanager
+    async def request(self, unit_id: int = 1):
+        """Espera a vez da unit na conexão do gateway e entrega o client para uma requisição"""
+        await self._acquire(unit_id)
+        try:
+            yield self.client
+        finally:
+            self._release()
+
+    async def _acquire(self, unit_id: int):
+        if self._in_flight < self.capacity and not self._turns:
+            self._in_flight += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(unit_id, deque()).append(fut)
+        if unit_id not in self._turns:
+            self._turns.append(unit_id)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # a vez foi concedida junto com o cancelamento: devolve o lugar
+                self._release()
+            else:
+                self._forget(unit_id, fut)
+            raise
+
+    def _forget(self, unit_id: int, fut: asyncio.Future):
+        """Tira da fila uma requisição cancelada antes da sua vez"""
+        queue = self._waiting.get(unit_id)
+        if queue is None or fut not in queue:
+            return
+        queue.remove(fut)
+        if not queue:
+            del self._waiting[unit_id]
+            self._turns.remove(unit_id)
+
+    def _release(self):
+        self._in_flight -= 1
+        self._grant()
+
+    def _grant(self):
+        """Entrega os lugares livres, uma requisição por unit em cada volta do rodízio"""
+        while self._in_flight < self.capacity and self._turns:
+            unit_id = self._turns.popleft()
+            queue = self._waiting[unit_id]
+            fut = queue.popleft()
+            if queue:
+                self._turns.append(unit_id)
+            else:
+                del self._waiting[unit_id]
+            self._in_flight += 1
+            fut.set_result(None)
+
+    def close(self):
+        if self.client:
+            self.client.close()
+            self.client = None
+
+
+class ConnectionRegistry:
+    """Conexões abertas por (ip, porta), com contagem de referências"""
+
+    def __init__(self):
+        self._connections: Dict[Tuple[str, int], GatewayConnection] = {}
+
+    def acquire(self, ip_address: str, port: int, timeout: float, max_in_flight: int = 1) -> GatewayConnection:
+        key = (ip_address, port)
+        conn = self._connections.get(key)
+        if conn is None:
+            conn = GatewayConnection(ip_address, port, timeout, max_in_flight)
+            self._connections[key] = conn
+        elif conn.max_in_flight != max_in_flight:
+            logger.warning(f"Gateway {ip_address}:{port} já aberto com janela {conn.max_in_flight}, "
+                           f"ignorando janela {max_in_flight}")
+        conn.refs += 1
+        return conn
+
+    def release(self, conn: GatewayConnection):
+        """Libera uma referência; o socket é fechado quando nenhum PLC usa mais o gateway"""
+        conn.refs -= 1
+        if conn.refs <= 0:
+            conn.close()
+            if self._connections.get(conn.key) is conn:
+                del self._connections[conn.key]
+            logger.info(f"Conexão com gateway {conn.ip_address}:{conn.port} encerrada")
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            f"{ip}:{port}": {
+                'refs': conn.refs,
+                'window': conn.client.window if conn.pipelined and conn.client else 1,
+            }
+            for (ip, port), conn in self._connections.items()
+        }
+
+
+# registro compartilhado pelos adapters Modbus (usado apenas no loop assíncrono global)
+connection_registry = ConnectionRegistry()
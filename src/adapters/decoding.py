@@ -0,0 +1,135 @@
+# src/adapters/decoding.py
+import struct
+from typing import Dict, List, Tuple, Any
+
+from .read_planner import ReadBlock, BIT_TYPES
+
+# Código struct de cada tipo numérico
+STRUCT_CODES = {
+    'int16': 'h',
+    'uint16': 'H',
+    'bool': 'H',
+    'bit': 'H',
+    'int32': 'i',
+    'uint32': 'I',
+    'float32': 'f',
+    'int64': 'q',
+    'uint64': 'Q',
+    'float64': 'd',
+}
+
+# Buffers montados a partir das words do bloco
+BE_WORDS = 'be'  # cada word em big-endian (ordem natural do Modbus)
+LE_WORDS = 'le'  # cada word com os bytes trocados
+
+
+def _layout(reg: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Retorna (buffer, prefixo struct) que decodificam o registrador com um único unpack.
+
+    Com as words empacotadas em big-endian (BE) ou com bytes trocados (LE), as quatro
+    ordens possíveis de um valor de 32/64 bits viram leituras diretas:
+        ABCD (byte big, word big)       -> BE, '>'
+        DCBA (byte little, word little) -> BE, '<'
+        CDAB (byte big, word little)    -> LE, '<'
+        BADC (byte little, word big)    -> LE, '>'
+    """
+    byte_little = (reg.get('byte_order') or 'big') == 'little'
+    word_little = (reg.get('word_order') or 'big') == 'little'
+    data_type = reg.get('data_type') or 'uint16'
+
+    if data_type == 'string':
+        return (LE_WORDS if byte_little else BE_WORDS), '>'
+    if STRUCT_CODES.get(data_type, 'H') in ('h', 'H'):
+        # 16 bits: apenas a ordem dos bytes importa
+        return BE_WORDS, ('<' if byte_little else '>')
+    if byte_little == word_little:
+        return BE_WORDS, ('<' if byte_little else '>')
+    return LE_WORDS, ('<' if word_little else '>')
+
+
+class BlockDecoder:
+    """
+    Decodifica todos os registradores de um bloco de uma vez.
+
+    Na criação os registradores são agrupados por (buffer, ordem de bytes) e cada
+    grupo vira um único `struct.Struct` com bytes de preenchimento entre os
+    registradores. A cada leitura basta empacotar as words do bloco e fazer um
+    `unpack_from` por grupo; escala/offset são aplicados no mesmo laço.
+    """
+
+    def __init__(self, block: ReadBlock):
+        self.block = block
+        self.bit_block = block.register_type in BIT_TYPES
+        self._words = struct.Struct(f'>{block.count}H')
+        self._words_le = struct.Struct(f'<{block.count}H')
+        # (buffer, Struct, [registradores na ordem do formato])
+        self.groups: List[Tuple[str, struct.Struct, List[Dict[str, Any]]]] = []
+        # registradores sobrepostos a outro do mesmo grupo: decodificados individualmente
+        self.single: List[Tuple[str, struct.Struct, int, Dict[str, Any]]] = []
+        if not self.bit_block:
+            self._compile()
+        self._needs_le = any(g[0] == LE_WORDS for g in self.groups) or \
+            any(s[0] == LE_WORDS for s in self.single)
+
+    def _code(self, reg: Dict[str, Any]) -> str:
+        if reg.get('data_type') == 'string':
+            return f"{2 * (reg.get('length') or 1)}s"
+        return STRUCT_CODES.get(reg.get('data_type') or 'uint16', 'H')
+
+    def _compile(self):
+        layouts: Dict[Tuple[str, str], List[Tuple[int, Dict[str, Any]]]] = {}
+        for reg, offset in self.block.items:
+            layouts.setdefault(_layout(reg), []).append((offset * 2, reg))
+
+        for (buffer, prefix), items in layouts.items():
+            items.sort(key=lambda item: item[0])
+            fmt, position, regs = prefix, 0, []
+            for byte_offset, reg in items:
+                code = self._code(reg)
+                if byte_offset < position:
+                    self.single.append((buffer, struct.Struct(prefix + code), byte_offset, reg))
+                    continue
+                if byte_offset > position:
+                    fmt += f'{byte_offset - position}x'
+                fmt += code
+                position = byte_offset + struct.calcsize(prefix + code)
+                regs.append(reg)
+            self.groups.append((buffer, struct.Struct(fmt), regs))
+
+    def decode(self, values: List[Any]) -> List[Tuple[Dict[str, Any], Any, Any]]:
+        """Retorna (registrador, valor bruto, valor escalado) para cada registrador do bloco"""
+        if self.bit_block:
+            return [
+                self._scaled(reg, float(bool(values[offset])))
+                for reg, offset in self.block.items
+            ]
+
+        buffers = {BE_WORDS: self._words.pack(*values)}
+        if self._needs_le:
+            buffers[LE_WORDS] = self._words_le.pack(*values)
+
+        decoded = []
+        for buffer, compiled, regs in self.groups:
+            for reg, raw in zip(regs, compiled.unpack_from(buffers[buffer])):
+                decoded.append(self._convert(reg, raw))
+        for buffer, compiled, byte_offset, reg in self.single:
+            decoded.append(self._convert(reg, compiled.unpack_from(buffers[buffer], byte_offset)[0]))
+        return decoded
+
+    def _convert(self, reg: Dict[str, Any], raw: Any) -> Tuple[Dict[str, Any], Any, Any]:
+        data_type = reg.get('data_type')
+        if data_type == 'string':
+            text = raw.split(b'\x00', 1)[0].decode('latin-1')
+            return reg, text, text
+        if data_type == 'bool':
+            raw = float(raw != 0)
+        elif data_type == 'bit':
+            raw = float((raw >> (reg.get('bit_index') or 0)) & 1)
+        return self._scaled(reg, raw)
+
+    @staticmethod
+    def _scaled(reg: Dict[str, Any], raw: Any) -> Tuple[Dict[str, Any], Any, Any]:
+        scale = reg.get('scale_factor')
+        offset = reg.get('offset')
+        return reg, raw, raw * (1.0 if scale is None else scale) + (offset or 0.0)
@@ -1,114 +1,157 @@
 import asyncio
-from pymodbus.client import AsyncModbusTcpClient
+from datetime import datetime, timezone
 from pymodbus.exceptions import ModbusException
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .protocol_interface import ProtocolAdapter
+from .read_planner import plan_reads, ReadBlock, BIT_TYPES, DEFAULT_MAX_GAP
+from .decoding import BlockDecoder
+from .connection_registry import connection_registry, ConnectionRegistry, GatewayConnection
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ModbusAdapter(ProtocolAdapter):
     
-    def __init__(self, ip_address: str, port: int = 502, unit_id: int = 1, timeout: int = 3):
+    def __init__(self, ip_address: str, port: int = 502, unit_id: int = 1, timeout: int = 3,
+                 max_gap: int = DEFAULT_MAX_GAP, registry: ConnectionRegistry = None,
+                 max_in_flight: int = 1):
         self.ip_address = ip_address
         self.port = port
         self.unit_id = unit_id
         self.timeout = timeout
-        self.client = None
+        self.max_gap = max_gap  # endereços vazios tolerados ao unir registradores em um bloco
+        self.max_in_flight = max_in_flight  # requisições pendentes por conexão (pipelining)
+        # PLCs no mesmo ip:porta (gateways) compartilham um único socket
+        self.registry = registry or connection_registry
+        self.connection: Optional[GatewayConnection] = None
         self._connected = False
-    
+
+    @property
+    def client(self):
+        return self.connection.client if self.connection else None
+
     async def connect(self) -> bool:
         try:
-            self.client = AsyncModbusTcpClient(
-                host=self.ip_address,
-                port=self.port,
-                timeout=self.timeout
-            )
-            await self.client.connect()
-            self._connected = True
-            logger.info(f"Conectado ao PLC {self.ip_address}:{self.port}")
-            return True
+            if self.connection is None:
+                self.connection = self.registry.acquire(
+                    self.ip_address, self.port, self.timeout, self.max_in_flight
+                )
+            self._connected = await self.connection.connect()
+            if self._connected:
+                logger.info(f"Conectado ao PLC {self.ip_address}:{self.port} (unit {self.unit_id})")
+            else:
+                logger.error(f"Não foi possível conectar ao PLC {self.ip_address}:{self.port}")
+            return self._connected
         except Exception as e:
             logger.error(f"Erro ao conectar PLC {self.ip_address}: {e}")
             self._connected = False
             return False
-    
+
     async def disconnect(self):
-        if self.client:
-            self.client.close()
-            self._connected = False
+        if self.connection:
+            self.registry.release(self.connection)
+            self.connection = None
+        self._connected = False
     
     async def read_registers(self, registers: List[Dict]) -> List[Dict]:
         if not self.is_connected():
             return []
-        
-        results = []
-        for reg in registers:
-            try:
-                address = reg['address']
-                register_type = reg['register_type']
-                data_type = reg['data_type']
-                
-                # Leitura baseada no tipo de registrador
-                logger.info(f"Lendo do PLC, id = {self.unit_id}")
-                if register_type == 'holding':
-                    result = await self.client.read_holding_registers(
-                        address, 1, slave=self.unit_id
-                    )
-                elif register_type == 'input':
-                    result = await self.client.read_input_registers(
-                        address, 1, unit=self.unit_id
-                    )
-                elif register_type == 'coil':
-                    result = await self.client.read_coils(
-                        address, 1, unit=self.unit_id
-                    )
-                
-                if not result.isError():
-                    raw_value = self._convert_value(result.registers[0], data_type)
-                    results.append({
-                        'register_id': reg['id'],
-                        'raw_value': raw_value,
-                        'quality': 'good',
-                        'timestamp': asyncio.get_event_loop().time()
-                    })
-                else:
-                    results.append({
-                        'register_id': reg['id'],
-                        'raw_value': 0,
-                        'quality': 'bad',
-                        'timestamp': asyncio.get_event_loop().time()
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Erro lendo registrador {reg['address']}: {e}")
-                results.append({
+
+        readings = await self.read_blocks(plan_reads(registers, self.unit_id, self.max_gap))
+
+        # Mantém a ordem dos registradores recebidos
+        by_id = {r['register_id']: r for r in readings}
+        return [by_id[reg['id']] for reg in registers if reg['id'] in by_id]
+
+    async def read_blocks(self, blocks: List[ReadBlock]) -> List[Dict]:
+        """
+        Lê blocos já planejados (ex.: vindos do cache de planos de leitura).
+        Os blocos são disparados juntos; a conexão decide quantos ficam em voo.
+        """
+        if not self.is_connected():
+            return []
+
+        readings: List[Dict] = []
+        for result in await asyncio.gather(*(self._read_block(block) for block in blocks)):
+            readings.extend(result.values())
+        return readings
+
+    async def _read_block(self, block: ReadBlock) -> Dict[int, Dict]:
+        """
+        Executa uma única requisição Modbus para o bloco e decodifica todos os registradores dele.
+        Todas as leituras do bloco levam o mesmo `timestamp`: o instante (UTC) em que a
+        resposta chegou, que é o que vai para o banco mesmo se a gravação atrasar.
+        """
+        results = {}
+        decoded = None
+        timestamp = None
+        try:
+            values = await self._request_block(block)
+            timestamp = datetime.now(timezone.utc)
+            if values is not None:
+                if block.decoder is None:
+                    block.decoder = BlockDecoder(block)
+                decoded = block.decoder.decode(values)
+        except Exception as e:
+            logger.error(f"Erro lendo bloco {block} do PLC {self.ip_address}: {e}")
+
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+        if decoded is None:
+            for reg, _ in block.items:
+                results[reg['id']] = {
                     'register_id': reg['id'],
                     'raw_value': 0,
+                    'scaled_value': 0,
                     'quality': 'bad',
-                    'timestamp': asyncio.get_event_loop().time()
-                })
-        
+                    'timestamp': timestamp
+                }
+            return results
+
+        for reg, raw_value, scaled_value in decoded:
+            results[reg['id']] = {
+                'register_id': reg['id'],
+                'raw_value': raw_value,
+                'scaled_value': scaled_value,
+                'quality': 'good',
+                'timestamp': timestamp
+            }
         return results
-    
-    def _convert_value(self, raw_value: int, data_type: str) -> float:
-        """Converte valor bruto conforme tipo de dado"""
-        if data_type == 'int16':
-            # Converte para signed int16
-            if raw_value > 32767:
-                return raw_value - 65536
-            return raw_value
-        elif data_type == 'float32':
-            # Implementar conversão IEEE 754
-            pass
-        elif data_type == 'bool':
-            return float(bool(raw_value))
-        else:  # uint16
-            return float(raw_value)
-    
+
+    async def _request_block(self, block: ReadBlock) -> Optional[List[Any]]:
+        """Lê o bloco conforme o tipo de registrador; retorna None em caso de erro do PLC"""
+        async with self.connection.request(block.unit_id) as client:
+            if block.register_type == 'holding':
+                result = await client.read_holding_registers(
+                    block.start, block.count, slave=block.unit_id
+                )
+            elif block.register_type == 'input':
+                result = await client.read_input_registers(
+                    block.start, block.count, slave=block.unit_id
+                )
+            elif block.register_type == 'coil':
+                result = await client.read_coils(
+                    block.start, block.count, slave=block.unit_id
+                )
+            elif block.register_type == 'discrete':
+                result = await client.read_discrete_inputs(
+                    block.start, block.count, slave=block.unit_id
+                )
+            else:
+                logger.error(f"Tipo de registrador desconhecido: {block.register_type}")
+                return None
+
+        if result.isError():
+            logger.warning(f"PLC {self.ip_address} respondeu erro para {block}: {result}")
+            return None
+
+        if block.register_type in BIT_TYPES:
+            return result.bits[:block.count]
+        return result.registers
+
     async def write_register(self, address: int, value: Any) -> bool:
         # Implementar escrita se necessário
         pass
     
     def is_connected(self) -> bool:
-        return self._connected and self.client is not None
+        return self._connected and self.connection is not None and self.connection.connected
@@ -0,0 +1,175 @@
+# src/adapters/modbus_pipeline.py
+import asyncio
+import logging
+import struct
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# MBAP: transaction id, protocol id, length, unit id
+MBAP_HEADER = struct.Struct('>HHHB')
+READ_REQUEST = struct.Struct('>BHH')
+
+FC_READ_COILS = 1
+FC_READ_DISCRETE_INPUTS = 2
+FC_READ_HOLDING_REGISTERS = 3
+FC_READ_INPUT_REGISTERS = 4
+
+
+class ModbusReadResponse:
+    """Resposta de leitura com a mesma interface usada do pymodbus (isError, registers, bits)"""
+
+    def __init__(self, function_code: int, registers: List[int] = None, bits: List[bool] = None,
+                 exception_code: Optional[int] = None):
+        self.function_code = function_code
+        self.registers = registers or []
+        self.bits = bits or []
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:
+        return self.exception_code is not None
+
+    def __str__(self):
+        if self.isError():
+            return f"ExceptionResponse(fc={self.function_code}, code={self.exception_code})"
+        return f"ReadResponse(fc={self.function_code}, count={len(self.registers) or len(self.bits)})"
+
+
+class PipelinedModbusClient:
+    """
+    Cliente Modbus TCP (somente leitura) com várias requisições em voo na mesma
+    conexão. As respostas são associadas às requisições pelo transaction id do
+    cabeçalho MBAP, então podem chegar em qualquer ordem.
+
+    `window` limita as requisições pendentes. Se o dispositivo não responder
+    (timeout) ou derrubar a conexão com mais de uma requisição em voo, a janela
+    cai para 1 e o cliente passa a operar de forma sequencial.
+    """
+
+    def __init__(self, host: str, port: int = 502, timeout: float = 3, window: int = 4):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.window = max(1, window)
+        self.degraded = False
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._recv_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_tid = 0
+        self._in_flight = 0
+        self._window_cond = asyncio.Condition()
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> bool:
+        if self.connected:
+            return True
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.error(f"Erro ao conectar {self.host}:{self.port}: {e}")
+            return False
+        self._recv_task = asyncio.create_task(self._recv_loop())
+        return True
+
+    def close(self):
+        if self._recv_task:
+            self._recv_task.cancel()
+            self._recv_task = None
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        self._fail_pending(ConnectionError("Conexão encerrada"))
+
+    def _fail_pending(self, exc: Exception):
+        for fut in self._pending.values():
+            if not fut.done():
+                fut.set_exception(exc)
+        self._pending.clear()
+
+    def _fall_back(self, reason: str):
+        if self.window > 1:
+            logger.warning(f"{self.host}:{self.port} não suporta pipelining ({reason}), usando janela 1")
+            self.window = 1
+            self.degraded = True
+
+    async def _recv_loop(self):
+        try:
+            while True:
+                header = await self._reader.readexactly(MBAP_HEADER.size)
+                tid, _, length, _ = MBAP_HEADER.unpack(header)
+                pdu = await self._reader.readexactly(length - 1)
+                fut = self._pending.pop(tid, None)
+                if fut is not None and not fut.done():
+                    fut.set_result(pdu)
+                # respostas sem requisição pendente (ex.: chegaram após timeout) são descartadas
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if len(self._pending) > 1:
+                self._fall_back("conexão encerrada com requisições em voo")
+            logger.error(f"Conexão com {self.host}:{self.port} perdida: {e}")
+            if self._writer:
+                self._writer.close()
+                self._writer = None
+            self._fail_pending(ConnectionError(str(e)))
+
+    def _allocate_tid(self) -> int:
+        while True:
+            self._next_tid = self._next_tid % 0xFFFF + 1
+            if self._next_tid not in self._pending:
+                return self._next_tid
+
+    async def _execute(self, unit_id: int, pdu: bytes) -> bytes:
+        async with self._window_cond:
+            await self._window_cond.wait_for(lambda: self._in_flight < self.window)
+            self._in_flight += 1
+        tid = None
+        try:
+            if not self.connected:
+                raise ConnectionError(f"Sem conexão com {self.host}:{self.port}")
+            tid = self._allocate_tid()
+            fut = asyncio.get_running_loop().create_future()
+            self._pending[tid] = fut
+            self._writer.write(MBAP_HEADER.pack(tid, 0, len(pdu) + 1, unit_id) + pdu)
+            await self._writer.drain()
+            return await asyncio.wait_for(fut, self.timeout)
+        except asyncio.TimeoutError:
+            if self._in_flight > 1:
+                self._fall_back("timeout com requisições em voo")
+            raise
+        finally:
+            if tid is not None:
+                self._pending.pop(tid, None)
+            async with self._window_cond:
+                self._in_flight -= 1
+                self._window_cond.notify()
+
+    async def _read(self, function_code: int, address: int, count: int, slave: int) -> ModbusReadResponse:
+        resp = await self._execute(slave, READ_REQUEST.pack(function_code, address, count))
+        if resp[0] & 0x80:
+            return ModbusReadResponse(function_code, exception_code=resp[1])
+
+        data = resp[2:2 + resp[1]]
+        if function_code in (FC_READ_COILS, FC_READ_DISCRETE_INPUTS):
+            bits = [bool(data[i // 8] >> (i % 8) & 1) for i in range(count)]
+            return ModbusReadResponse(function_code, bits=bits)
+        return ModbusReadResponse(function_code, registers=list(struct.unpack(f'>{len(data) // 2}H', data)))
+
+    async def read_coils(self, address: int, count: int = 1, slave: int = 1) -> ModbusReadResponse:
+        return await self._read(FC_READ_COILS, address, count, slave)
+
+    async def read_discrete_inputs(self, address: int, count: int = 1, slave: int = 1) -> ModbusReadResponse:
+        return await self._read(FC_READ_DISCRETE_INPUTS, address, count, slave)
+
+    async def read_holding_registers(self, address: int, count: int = 1, slave: int = 1) -> ModbusReadResponse:
+        return await self._read(FC_READ_HOLDING_REGISTERS, address, count, slave)
+
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = 1) -> ModbusReadResponse:
+        return await self._read(FC_READ_INPUT_REGISTERS, address, count, slave)
@@ -0,0 +1,106 @@
+# src/adapters/read_planner.py
+from typing import Dict, List, Tuple, Any
+
+# Limites do protocolo Modbus por requisição
+MAX_WORDS_PER_READ = 125
+MAX_BITS_PER_READ = 2000
+
+# Gap padrão (em endereços) que ainda vale a pena ler junto em vez de abrir outra requisição
+DEFAULT_MAX_GAP = 8
+
+BIT_TYPES = ('coil', 'discrete')
+
+# Quantidade de words (16 bits) ocupada por cada tipo de dado
+DATA_TYPE_WIDTH = {
+    'bool': 1,
+    'bit': 1,
+    'int16': 1,
+    'uint16': 1,
+    'int32': 2,
+    'uint32': 2,
+    'float32': 2,
+    'int64': 4,
+    'uint64': 4,
+    'float64': 4,
+}
+
+
+def register_width(reg: Dict[str, Any]) -> int:
+    """Retorna quantos endereços o registrador ocupa na tabela Modbus"""
+    if reg['register_type'] in BIT_TYPES:
+        return 1
+    if reg.get('data_type') == 'string':
+        # `length` = quantidade de registradores (2 caracteres cada)
+        return reg.get('length') or 1
+    return DATA_TYPE_WIDTH.get(reg.get('data_type') or 'uint16', 1)
+
+
+class ReadBlock:
+    """Uma requisição Modbus contígua cobrindo um ou mais registradores"""
+
+    def __init__(self, register_type: str, unit_id: int, start: int):
+        self.register_type = register_type
+        self.unit_id = unit_id
+        self.start = start
+        self.count = 0
+        # (registrador, deslocamento dentro do bloco)
+        self.items: List[Tuple[Dict[str, Any], int]] = []
+        # BlockDecoder compilado na primeira leitura e reaproveitado nos ciclos seguintes
+        self.decoder = None
+
+    @property
+    def end(self) -> int:
+        return self.start + self.count
+
+    def add(self, reg: Dict[str, Any], width: int):
+        offset = reg['address'] - self.start
+        self.items.append((reg, offset))
+        self.count = max(self.count, offset + width)
+
+    def split(self, values: List[Any]) -> List[Tuple[Dict[str, Any], List[Any]]]:
+        """Separa a resposta do bloco nos valores de cada registrador"""
+        return [
+            (reg, values[offset:offset + register_width(reg)])
+            for reg, offset in self.items
+        ]
+
+    def __repr__(self):
+        return (f"ReadBlock({self.register_type}, unit={self.unit_id}, "
+                f"start={self.start}, count={self.count}, regs={len(self.items)})")
+
+
+def plan_reads(registers: List[Dict[str, Any]], default_unit_id: int = 1,
+               max_gap: int = DEFAULT_MAX_GAP) -> List[ReadBlock]:
+    """
+    Agrupa registradores por tipo e unit id e junta endereços vizinhos em blocos
+    de até 125 words (ou 2000 bits para coils/discretes).
+
+    Buracos entre registradores de até `max_gap` endereços são lidos junto com o
+    bloco (os valores do buraco são descartados). Com max_gap=0 apenas endereços
+    contíguos são unidos.
+    """
+    groups: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+    for reg in registers:
+        unit_id = reg.get('unit_id') or default_unit_id
+        groups.setdefault((reg['register_type'], unit_id), []).append(reg)
+
+    blocks: List[ReadBlock] = []
+    for (register_type, unit_id), regs in groups.items():
+        limit = MAX_BITS_PER_READ if register_type in BIT_TYPES else MAX_WORDS_PER_READ
+        regs.sort(key=lambda r: r['address'])
+
+        block = None
+        for reg in regs:
+            width = register_width(reg)
+            address = reg['address']
+            if block is not None:
+                gap = address - block.end
+                fits = max(block.end, address + width) - block.start <= limit
+                if gap <= max_gap and fits:
+                    block.add(reg, width)
+                    continue
+            block = ReadBlock(register_type, unit_id, address)
+            block.add(reg, width)
+            blocks.append(block)
+
+    return blocks
@@ -1,6 +1,15 @@
-from flask import jsonify
+from datetime import datetime, timedelta, timezone
+
+from flask import jsonify, request, Response, stream_with_context
 from src.services.plc_service import CLPService
 from src.utils.async_runner import async_loop
+from src.services.reading_sink import reading_sink
+from src.services.polling_service import polling_service
+from src.services.archiver import cold_archiver
+from src.services.live_values import live_values
+from src.services.export_service import ExportService, EXPORT_FORMATS
+from src.services.trend_service import TrendService, DEFAULT_POINTS, MAX_POINTS
+from src.services.downsample import METHODS
 
 plc_service = CLPService()
 
@@ -19,3 +28,104 @@ def stop_polling_controller(plc_id):
 
     future = async_loop.run_coro(plc_service.stop_polling(plc_id))
     return jsonify({'success': True, 'message': 'Parada do polling agendada'}), 202
+
+
+def _parse_bool(value):
+    if value is None:
+        return None
+    if value.lower() in ('1', 'true', 'yes', 'sim'):
+        return True
+    if value.lower() in ('0', 'false', 'no', 'nao', 'não'):
+        return False
+    raise ValueError(value)
+
+
+def list_plcs_controller():
+    """
+    PLCs com contagem de registradores e estado das últimas leituras.
+    Query opcional: manual e active (true/false).
+    """
+    try:
+        manual = _parse_bool(request.args.get('manual'))
+        active = _parse_bool(request.args.get('active'))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'manual e active devem ser true ou false'}), 400
+    plcs = plc_service.listar_resumos(manual=manual, ativo=active)
+    return jsonify({'success': True, 'plcs': plcs, 'count': len(plcs)}), 200
+
+
+def ingest_stats_controller():
+    stats = reading_sink.stats()
+    stats['deadband'] = polling_service.deadband.stats()
+    stats['archive'] = cold_archiver.stats()
+    stats['live'] = live_values.stats()
+    return jsonify({'success': True, 'stats': stats}), 200
+
+
+def scan_stats_controller():
+    return jsonify({'success': True, 'stats': polling_service.scan_stats()}), 200
+
+
+def _parse_time(value, default):
+    if not value:
+        return default
+    ts = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    # o SQLite grava sem fuso: tudo é comparado em UTC
+    return ts.astimezone(timezone.utc) if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def export_readings_controller():
+    """
+    Exporta o histórico em streaming.
+    Query: register_id (repetível ou separado por vírgula), start, end (ISO 8601,
+    padrão: últimas 24 h) e format=csv|ndjson.
+    """
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': 'format deve ser csv ou ndjson'}), 400
+
+    try:
+        register_ids = sorted({int(rid) for value in request.args.getlist('register_id')
+                               for rid in value.split(',') if rid.strip()})
+        end = _parse_time(request.args.get('end'), datetime.now(timezone.utc))
+        start = _parse_time(request.args.get('start'), end - timedelta(days=1))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Parâmetros inválidos'}), 400
+    if not register_ids:
+        return jsonify({'success': False, 'message': 'register_id é obrigatório'}), 400
+    if start > end:
+        return jsonify({'success': False, 'message': 'start deve ser anterior a end'}), 400
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    filename = f"readings_{start:%Y%m%d%H%M}_{end:%Y%m%d%H%M}.{fmt}"
+    body = ExportService().stream(fmt, register_ids, start, end)
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+
+def history_readings_controller():
+    """
+    Histórico de um registrador reduzido para gráficos.
+    Query: register_id, start, end (ISO 8601, padrão: últimas 24 h),
+    points (padrão 1000) e method=lttb|minmax.
+    """
+    method = request.args.get('method', 'lttb').lower()
+    if method not in METHODS:
+        return jsonify({'success': False, 'message': 'method deve ser lttb ou minmax'}), 400
+
+    try:
+        register_id = int(request.args['register_id'])
+        points = int(request.args.get('points', DEFAULT_POINTS))
+        end = _parse_time(request.args.get('end'), datetime.now(timezone.utc))
+        start = _parse_time(request.args.get('start'), end - timedelta(days=1))
+    except KeyError:
+        return jsonify({'success': False, 'message': 'register_id é obrigatório'}), 400
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Parâmetros inválidos'}), 400
+    if start > end:
+        return jsonify({'success': False, 'message': 'start deve ser anterior a end'}), 400
+    if not 2 <= points <= MAX_POINTS:
+        return jsonify({'success': False, 'message': f'points deve estar entre 2 e {MAX_POINTS}'}), 400
+
+    history = TrendService().history(register_id, start, end, points, method)
+    return jsonify({'success': True, 'register_id': register_id, **history}), 200
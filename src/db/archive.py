@@ -0,0 +1,295 @@
+# src/db/archive.py
+import logging
+import mmap
+import os
+import shutil
+import struct
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Sequence, Iterator
+
+import numpy as np
+
+from src.db.partitions import as_utc
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'CLPSEG01'
+# magic, quantidade, primeiro timestamp (µs), primeiro delta (µs), tamanho de cada coluna comprimida
+HEADER = struct.Struct('<8sIqq4I')
+
+QUALITY_NAMES = ('good', 'bad', 'uncertain')
+QUALITY_CODES = {name: code for code, name in enumerate(QUALITY_NAMES)}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+
+def to_us(ts: datetime) -> int:
+    """datetime -> µs desde a época (UTC), sem perda de precisão"""
+    return (as_utc(ts) - _EPOCH) // _US
+
+
+def from_us(us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(us))
+
+
+def _shuffle(arr: np.ndarray) -> bytes:
+    """Agrupa os bytes de mesma posição (byte shuffle): deltas e XORs pequenos viram longas sequências de zeros"""
+    return arr.view(np.uint8).reshape(-1, arr.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle(buf: bytes, dtype: str, count: int) -> np.ndarray:
+    itemsize = np.dtype(dtype).itemsize
+    return np.frombuffer(buf, np.uint8).reshape(itemsize, count).T.copy().view(dtype).ravel()
+
+
+def _xor_encode(values: np.ndarray) -> np.ndarray:
+    bits = np.ascontiguousarray(values, dtype='<f8').view('<u8')
+    out = bits.copy()
+    out[1:] ^= bits[:-1]
+    return out
+
+
+def _xor_decode(xored: np.ndarray) -> np.ndarray:
+    return np.bitwise_xor.accumulate(xored).view('<f8')
+
+
+def encode_segment(ts_us: np.ndarray, raw: np.ndarray, scaled: np.ndarray, quality: np.ndarray) -> bytes:
+    """
+    Segmento colunar comprimido:
+      - timestamps em delta-of-delta (amostragem periódica vira quase só zeros);
+      - floats em XOR com o valor anterior (valores estáveis viram zeros);
+      - cada coluna com byte shuffle + zlib.
+    """
+    count = len(ts_us)
+    ts_us = np.asarray(ts_us, dtype='<i8')
+    deltas = np.diff(ts_us)
+    first_delta = int(deltas[0]) if count > 1 else 0
+    dod = np.diff(deltas).astype('<i8')
+
+    columns = [
+        zlib.compress(_shuffle(dod), 6),
+        zlib.compress(_shuffle(_xor_encode(raw)), 6),
+        zlib.compress(_shuffle(_xor_encode(scaled)), 6),
+        zlib.compress(np.asarray(quality, dtype=np.uint8).tobytes(), 6),
+    ]
+    header = HEADER.pack(MAGIC, count, int(ts_us[0]) if count else 0, first_delta, *(len(c) for c in columns))
+    return header + b''.join(columns)
+
+
+def decode_segment(buf) -> Dict[str, np.ndarray]:
+    """Decodifica um segmento a partir de qualquer buffer (bytes ou mmap)"""
+    magic, count, ts0, first_delta, *sizes = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("Segmento de arquivo inválido")
+    offset = HEADER.size
+    parts = []
+    for size in sizes:
+        parts.append(zlib.decompress(buf[offset:offset + size]))
+        offset += size
+
+    if count > 1:
+        dod = _unshuffle(parts[0], '<i8', count - 2) if count > 2 else np.zeros(0, '<i8')
+        deltas = first_delta + np.concatenate(([0], np.cumsum(dod)))
+        ts = np.concatenate(([ts0], ts0 + np.cumsum(deltas))).astype('<i8')
+    else:
+        ts = np.array([ts0] * count, dtype='<i8')
+
+    return {
+        'timestamp': ts,
+        'raw_value': _xor_decode(_unshuffle(parts[1], '<u8', count)),
+        'scaled_value': _xor_decode(_unshuffle(parts[2], '<u8', count)),
+        'quality': np.frombuffer(parts[3], np.uint8),
+    }
+
+
+_ROW = np.dtype([('timestamp', '<i8'), ('raw', '<u8'), ('scaled', '<u8'), ('quality', 'u1')])
+
+
+def _rows(ts, raw, scaled, quality) -> np.ndarray:
+    rows = np.empty(len(ts), dtype=_ROW)
+    rows['timestamp'] = ts
+    rows['raw'] = np.ascontiguousarray(raw, dtype='<f8').view('<u8')
+    rows['scaled'] = np.ascontiguousarray(scaled, dtype='<f8').view('<u8')
+    rows['quality'] = quality
+    return rows
+
+
+def merge_segment(existing: Dict[str, np.ndarray], ts, raw, scaled, quality):
+    """
+    União das linhas de um segmento com novas linhas, ordenada por timestamp.
+    Linhas idênticas (timestamp, valores e qualidade) aparecem o máximo de vezes
+    em que aparecem em um dos lados: regravar a mesma partição não duplica nada,
+    e amostras distintas com o mesmo timestamp são mantidas.
+    """
+    old_rows, old_counts = np.unique(_rows(existing['timestamp'], existing['raw_value'],
+                                           existing['scaled_value'], existing['quality']), return_counts=True)
+    new_rows, new_counts = np.unique(_rows(ts, raw, scaled, quality), return_counts=True)
+    merged, inverse = np.unique(np.concatenate((old_rows, new_rows)), return_inverse=True)
+    counts = np.zeros(len(merged), dtype=np.int64)
+    np.maximum.at(counts, inverse.ravel(), np.concatenate((old_counts, new_counts)))
+    merged = np.repeat(merged, counts)
+    return (merged['timestamp'].copy(), merged['raw'].copy().view('<f8'), merged['scaled'].copy().view('<f8'),
+            merged['quality'].copy())
+
+
+class ColdArchive:
+    """
+    Camada fria das leituras: um arquivo de segmento por registrador por dia (UTC)
+    em `<root>/AAAA/MM/DD/<register_id>.seg`.
+
+    Os segmentos são reescritos por inteiro (atomicamente via os.replace, mesclando
+    com o conteúdo anterior) e lidos por mmap. Não há índice no banco: o caminho é derivado
+    de (registrador, dia).
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root
+
+    def configure(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def day_dir(self, day: date) -> str:
+        return os.path.join(self.root, f"{day:%Y}", f"{day:%m}", f"{day:%d}")
+
+    def segment_path(self, register_id: int, day: date) -> str:
+        return os.path.join(self.day_dir(day), f"{register_id}.seg")
+
+    def read_segment(self, path: str) -> Dict[str, np.ndarray]:
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return decode_segment(mm)
+
+    def write_segment(self, register_id: int, day: date, rows: Sequence[Dict[str, Any]]):
+        """
+        Grava as leituras de um registrador em um dia. Se o segmento já existe
+        (leituras atrasadas recriaram a partição do dia, ou um arquivamento
+        repetido após uma falha), as linhas são mescladas às já arquivadas.
+        """
+        ts = np.fromiter((to_us(r['timestamp']) for r in rows), dtype='<i8', count=len(rows))
+        raw = np.fromiter((r['raw_value'] for r in rows), dtype='<f8', count=len(rows))
+        scaled = np.fromiter((r['scaled_value'] for r in rows), dtype='<f8', count=len(rows))
+        quality = np.fromiter((QUALITY_CODES.get(r.get('quality'), QUALITY_CODES['uncertain']) for r in rows),
+                              dtype=np.uint8, count=len(rows))
+
+        path = self.segment_path(register_id, day)
+        if os.path.exists(path):
+            ts, raw, scaled, quality = merge_segment(self.read_segment(path), ts, raw, scaled, quality)
+        else:
+            order = np.argsort(ts, kind='stable')
+            ts, raw, scaled, quality = ts[order], raw[order], scaled[order], quality[order]
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(encode_segment(ts, raw, scaled, quality))
+        os.replace(tmp, path)
+
+    def query(self, register_id: int, start_time: datetime, end_time: datetime,
+              limit: int) -> List[Dict[str, Any]]:
+        """Leituras arquivadas em [start_time, end_time], mais recentes primeiro"""
+        if not self.root or limit <= 0:
+            return []
+        start_us, end_us = to_us(start_time), to_us(end_time)
+        first_day = as_utc(start_time).date()
+        day = as_utc(end_time).date()
+
+        result: List[Dict[str, Any]] = []
+        while day >= first_day and len(result) < limit:
+            path = self.segment_path(register_id, day)
+            day -= timedelta(days=1)
+            if not os.path.exists(path):
+                continue
+            seg = self.read_segment(path)
+            lo = np.searchsorted(seg['timestamp'], start_us, side='left')
+            hi = np.searchsorted(seg['timestamp'], end_us, side='right')
+            for i in range(hi - 1, max(lo, hi - (limit - len(result))) - 1, -1):
+                result.append({
+                    'id': None,
+                    'register_id': register_id,
+                    'timestamp': from_us(seg['timestamp'][i]),
+                    'raw_value': float(seg['raw_value'][i]),
+                    'scaled_value': float(seg['scaled_value'][i]),
+                    'quality': QUALITY_NAMES[seg['quality'][i]],
+                })
+        return result
+
+    def scan(self, register_id: int, start_time: datetime, end_time: datetime) -> Iterator[Dict[str, Any]]:
+        """Leituras arquivadas em [start_time, end_time] em ordem crescente, um segmento por vez"""
+        if not self.root:
+            return
+        start_us, end_us = to_us(start_time), to_us(end_time)
+        day = as_utc(start_time).date()
+        last_day = as_utc(end_time).date()
+        while day <= last_day:
+            path = self.segment_path(register_id, day)
+            day += timedelta(days=1)
+            if not os.path.exists(path):
+                continue
+            seg = self.read_segment(path)
+            lo = np.searchsorted(seg['timestamp'], start_us, side='left')
+            hi = np.searchsorted(seg['timestamp'], end_us, side='right')
+            for i in range(lo, hi):
+                yield {
+                    'register_id': register_id,
+                    'timestamp': from_us(seg['timestamp'][i]),
+                    'raw_value': float(seg['raw_value'][i]),
+                    'scaled_value': float(seg['scaled_value'][i]),
+                    'quality': QUALITY_NAMES[seg['quality'][i]],
+                }
+
+    def scan_range(self, start_time: Optional[datetime] = None,
+                   end_time: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Leituras arquivadas de todos os registradores em [start_time, end_time)
+        (sem limite quando None), dia a dia e um segmento por vez
+        """
+        start = as_utc(start_time) if start_time is not None else None
+        end = as_utc(end_time) if end_time is not None else None
+        for day in self.days():
+            day_start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+            day_end = day_start + timedelta(days=1)
+            if (start is not None and day_end <= start) or (end is not None and day_start >= end):
+                continue
+            lo = max(day_start, start) if start is not None else day_start
+            hi = (min(day_end, end) if end is not None else day_end) - timedelta(microseconds=1)
+            for register_id in self.registers(day):
+                yield from self.scan(register_id, lo, hi)
+
+    def days(self) -> List[date]:
+        """Dias presentes no arquivo"""
+        if not self.root or not os.path.isdir(self.root):
+            return []
+        found = []
+        for year in os.listdir(self.root):
+            for month in os.listdir(os.path.join(self.root, year)):
+                for day in os.listdir(os.path.join(self.root, year, month)):
+                    try:
+                        found.append(date(int(year), int(month), int(day)))
+                    except ValueError:
+                        continue
+        return sorted(found)
+
+    def registers(self, day: date) -> List[int]:
+        """Registradores com segmento arquivado no dia"""
+        path = self.day_dir(day) if self.root else None
+        if not path or not os.path.isdir(path):
+            return []
+        return sorted(int(name[:-4]) for name in os.listdir(path)
+                      if name.endswith('.seg') and name[:-4].isdigit())
+
+    def drop_before(self, cutoff: datetime) -> int:
+        """Retenção: remove os dias inteiramente anteriores a `cutoff`"""
+        cutoff_day = as_utc(cutoff).date()
+        dropped = 0
+        for day in self.days():
+            if day < cutoff_day:
+                shutil.rmtree(self.day_dir(day), ignore_errors=True)
+                dropped += 1
+        return dropped
+
+
+# arquivo compartilhado; diretório definido por Config.ARCHIVE_DIR em storage.init_app
+cold_archive = ColdArchive()
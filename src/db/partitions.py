@@ -0,0 +1,165 @@
+# src/db/partitions.py
+import logging
+import re
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Float, Index, Integer, MetaData, String, Table, inspect
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+PARTITION_DAY = 'day'
+PARTITION_WEEK = 'week'
+
+TABLE_PREFIX = 'readings_'
+_TABLE_RE = re.compile(r'^readings_(\d{8})$')
+
+
+def as_utc(ts: datetime) -> datetime:
+    """Timestamps sem fuso são tratados como UTC (é o que o SQLite devolve)"""
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+class ReadingPartitions:
+    """
+    Roteamento das leituras para tabelas por período (`readings_AAAAMMDD`).
+
+    Cada partição cobre um dia ou uma semana (começando na segunda-feira) em UTC
+    e tem o mesmo esquema de `readings`, com índice (register_id, timestamp).
+    A partição é criada na primeira gravação que cai nela; a retenção apaga
+    partições inteiras (DROP TABLE) e as consultas por intervalo só tocam as
+    partições que se sobrepõem ao intervalo pedido.
+    """
+
+    def __init__(self, period: str = PARTITION_DAY):
+        self.period = period
+        self.metadata = MetaData()
+        self._tables: Dict[date, Table] = {}   # partições existentes no banco
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def configure(self, period: str):
+        if period not in (PARTITION_DAY, PARTITION_WEEK):
+            raise ValueError(f"Período de partição inválido: {period}")
+        with self._lock:
+            self.period = period
+            self.metadata = MetaData()
+            self._tables.clear()
+            self._loaded = False
+
+    @property
+    def span(self) -> timedelta:
+        return timedelta(days=7 if self.period == PARTITION_WEEK else 1)
+
+    def partition_key(self, ts: datetime) -> date:
+        """Data de início da partição que contém `ts`"""
+        day = as_utc(ts).date()
+        if self.period == PARTITION_WEEK:
+            day -= timedelta(days=day.weekday())
+        return day
+
+    def bounds(self, key: date) -> Tuple[datetime, datetime]:
+        """Intervalo [início, fim) coberto pela partição"""
+        start = datetime(key.year, key.month, key.day, tzinfo=timezone.utc)
+        return start, start + self.span
+
+    @staticmethod
+    def table_name(key: date) -> str:
+        return f"{TABLE_PREFIX}{key:%Y%m%d}"
+
+    def _table(self, key: date) -> Table:
+        name = self.table_name(key)
+        table = self.metadata.tables.get(name)
+        if table is None:
+            table = Table(
+                name, self.metadata,
+                Column('id', Integer, primary_key=True),
+                Column('register_id', Integer, nullable=False),
+                Column('timestamp', DateTime(timezone=True), nullable=False),
+                Column('raw_value', Float, nullable=False),
+                Column('scaled_value', Float, nullable=False),
+                Column('quality', String(20), default='good'),
+                Index(f'idx_{name}_register_timestamp', 'register_id', 'timestamp'),
+            )
+        return table
+
+    def load(self, engine: Engine):
+        """Descobre as partições já existentes no banco (uma vez por processo)"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for name in inspect(engine).get_table_names():
+                match = _TABLE_RE.match(name)
+                if match:
+                    key = datetime.strptime(match.group(1), '%Y%m%d').date()
+                    self._tables[key] = self._table(key)
+            self._loaded = True
+
+    def reset(self):
+        """Esquece as partições conhecidas; a próxima `load` relê o banco"""
+        with self._lock:
+            self._tables.clear()
+            self._loaded = False
+
+    def ensure(self, conn: Connection, key: date, created: Dict[date, Table]) -> Table:
+        """
+        Tabela da partição, criando-a na transação de `conn` se ainda não existir.
+        Partições criadas agora vão para `created` e só ficam visíveis às
+        consultas (`tables_for_range` etc.) quando o chamador confirmar a
+        transação e chamar `publish(created)`; antes disso a tabela pode não
+        existir para as outras conexões.
+        """
+        table = self._tables.get(key)
+        if table is None:
+            table = created.get(key)
+        if table is not None:
+            return table
+        with self._lock:
+            table = self._table(key)
+        table.create(conn, checkfirst=True)
+        created[key] = table
+        logger.info("Partição de leituras criada: %s", table.name)
+        return table
+
+    def publish(self, created: Dict[date, Table]):
+        """Torna visíveis as partições criadas por `ensure` depois do commit"""
+        if not created:
+            return
+        with self._lock:
+            self._tables.update(created)
+
+    def table(self, key: date) -> Optional[Table]:
+        return self._tables.get(key)
+
+    def tables_for_range(self, start: Optional[datetime] = None,
+                         end: Optional[datetime] = None) -> List[Table]:
+        """Partições que se sobrepõem a [start, end], da mais nova para a mais antiga"""
+        first = self.partition_key(start) if start is not None else None
+        last = self.partition_key(end) if end is not None else None
+        items = [(k, t) for k, t in list(self._tables.items())
+                 if (first is None or k >= first) and (last is None or k <= last)]
+        return [t for _, t in sorted(items, key=lambda item: item[0], reverse=True)]
+
+    def expired(self, cutoff: datetime) -> List[date]:
+        """Partições inteiramente anteriores a `cutoff`"""
+        cutoff = as_utc(cutoff)
+        return sorted(k for k in list(self._tables) if self.bounds(k)[1] <= cutoff)
+
+    def drop(self, conn: Connection, key: date):
+        with self._lock:
+            table = self._tables.pop(key, None)
+            if table is None:
+                return
+            table.drop(conn, checkfirst=True)
+            self.metadata.remove(table)
+        logger.info("Partição de leituras removida: %s", table.name)
+
+
+# roteador compartilhado; período definido por Config.READINGS_PARTITION em storage.init_app
+reading_partitions = ReadingPartitions()
@@ -0,0 +1,35 @@
+# src/db/schema.py
+import logging
+from typing import List
+
+from sqlalchemy import Table, inspect, literal, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+logger = logging.getLogger(__name__)
+
+
+def add_missing_columns(conn: Connection, table: Table) -> List[str]:
+    """
+    `ALTER TABLE ... ADD COLUMN` para as colunas do modelo que ainda não existem
+    na tabela (o `create_all` só cria tabelas novas). Idempotente: colunas já
+    presentes são ignoradas. Colunas com `default` escalar recebem o mesmo valor
+    como DEFAULT, então as linhas antigas ficam com o valor do modelo em vez de NULL.
+    Retorna os nomes das colunas adicionadas.
+    """
+    existing = {c['name'] for c in inspect(conn).get_columns(table.name)}
+    dialect = conn.dialect
+    added = []
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        ddl = str(CreateColumn(column).compile(dialect=dialect))
+        if column.server_default is None and column.default is not None and column.default.is_scalar:
+            value = literal(column.default.arg, column.type).compile(
+                dialect=dialect, compile_kwargs={'literal_binds': True})
+            ddl += f" DEFAULT {value}"
+        conn.execute(text(f"ALTER TABLE {dialect.identifier_preparer.format_table(table)} ADD COLUMN {ddl}"))
+        added.append(column.name)
+    if added:
+        logger.info("Colunas adicionadas a %s: %s", table.name, ", ".join(added))
+    return added
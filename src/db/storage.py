@@ -0,0 +1,131 @@
+# src/db/storage.py
+import logging
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+from flask import Flask
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+
+from src.db import db
+from src.db.partitions import reading_partitions, PARTITION_DAY
+from src.db.archive import cold_archive
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',        # leitores não bloqueiam o escritor (e vice-versa)
+    'synchronous': 'NORMAL',      # seguro com WAL, evita fsync a cada commit
+    'cache_size': -64000,         # ~64 MB de cache de páginas por conexão
+    'mmap_size': 268435456,       # 256 MB mapeados em memória para leitura
+    'busy_timeout': 5000,         # espera o lock em vez de "database is locked"
+    'temp_store': 'MEMORY',
+}
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]):
+    """Executa os PRAGMAs em toda nova conexão do engine"""
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+class SQLiteStorage:
+    """
+    Camada de configuração do armazenamento.
+
+    Em SQLite:
+      - liga WAL e os PRAGMAs de desempenho em todas as conexões (`SQLITE_PRAGMAS`);
+      - `writer()` entrega a única conexão de escrita (pool de tamanho 1), então as
+        gravações de ingestão são serializadas dentro do processo em vez de
+        disputarem o lock do arquivo;
+      - `reader()` entrega conexões somente leitura de um pool
+        (`SQLITE_READ_POOL_SIZE`) para as consultas do dashboard.
+    Em outros bancos (DATABASE_URL) writer e reader usam o engine do Flask-SQLAlchemy.
+    """
+
+    def __init__(self, app: Flask = None):
+        self.app = app
+        self.writer_engine: Optional[Engine] = None
+        self.read_engine: Optional[Engine] = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        """Deve ser chamado logo após db.init_app(app), antes de abrir conexões"""
+        self.app = app
+        uri = app.config['SQLALCHEMY_DATABASE_URI']
+        url = make_url(uri)
+
+        reading_partitions.configure(app.config.get('READINGS_PARTITION', PARTITION_DAY))
+        if app.config.get('ARCHIVE_DIR'):
+            cold_archive.configure(app.config['ARCHIVE_DIR'])
+
+        with app.app_context():
+            engine = db.engine
+
+        if url.get_backend_name() != 'sqlite':
+            self.writer_engine = self.read_engine = engine
+            return
+
+        pragmas = app.config.get('SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS)
+        apply_sqlite_pragmas(engine, pragmas)
+
+        path = url.database
+        if not path or path == ':memory:':
+            # banco em memória (testes): uma única base, sem engines extras
+            self.writer_engine = self.read_engine = engine
+            return
+
+        self.writer_engine = create_engine(
+            uri,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=60,
+            connect_args={'check_same_thread': False},
+        )
+        apply_sqlite_pragmas(self.writer_engine, pragmas)
+
+        self.read_engine = create_engine(
+            f"sqlite:///file:{path}?mode=ro&uri=true",
+            pool_size=app.config.get('SQLITE_READ_POOL_SIZE', 8),
+            max_overflow=0,
+            connect_args={'check_same_thread': False},
+        )
+        read_pragmas = {k: v for k, v in pragmas.items() if k not in ('journal_mode', 'synchronous')}
+        read_pragmas['query_only'] = 1
+        apply_sqlite_pragmas(self.read_engine, read_pragmas)
+
+        logger.info("SQLite configurado: %s", ", ".join(f"{k}={v}" for k, v in pragmas.items()))
+
+    @contextmanager
+    def writer(self):
+        """Conexão de escrita serializada, já dentro de uma transação (commit ao sair)"""
+        with self.writer_engine.begin() as conn:
+            yield conn
+
+    @contextmanager
+    def reader(self):
+        """Conexão somente leitura do pool"""
+        with self.read_engine.connect() as conn:
+            yield conn
+
+    @contextmanager
+    def write_session(self):
+        """Session ORM ligada à conexão de escrita (commit ao sair)"""
+        with Session(self.writer_engine, expire_on_commit=False) as session:
+            with session.begin():
+                yield session
+
+    @contextmanager
+    def read_session(self):
+        """Session ORM somente leitura (objetos continuam acessíveis após fechar)"""
+        with Session(self.read_engine, expire_on_commit=False) as session:
+            yield session
+
+
+storage = SQLiteStorage()
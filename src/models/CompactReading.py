@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, Float, Index
+from src.db import db
+
+
+class CompactReading(db.Model):
+    """
+    Leitura em esquema compacto (tabela `compact_readings`), experimental: nada
+    na aplicação lê esta tabela (ver CompactReadingRepository).
+
+    `ts` é epoch em ms (UTC) e `quality` o código de QUALITY_NAMES (0 = good),
+    então nenhuma coluna guarda texto. `scaled_value` pode ficar NULL: nesse caso
+    a escala/offset do registrador é aplicada na leitura. Só existe o índice
+    (register_id, ts); `id` é o próprio rowid no SQLite.
+    """
+    __tablename__ = 'compact_readings'
+
+    id = Column(Integer, primary_key=True)
+    register_id = Column(Integer, nullable=False)
+    ts = Column(BigInteger, nullable=False)
+    raw_value = Column(Float, nullable=False)
+    scaled_value = Column(Float)
+    quality = Column(SmallInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('idx_compact_readings_register_ts', 'register_id', 'ts'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'register_id': self.register_id,
+            'ts': self.ts,
+            'raw_value': self.raw_value,
+            'scaled_value': self.scaled_value,
+            'quality': self.quality
+        }
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Float, DateTime, String
+from src.db import db
+
+
+class CurrentValue(db.Model):
+    """Último valor gravado de cada registrador (uma linha por registrador)"""
+    __tablename__ = 'current_values'
+
+    register_id = Column(Integer, primary_key=True)
+    timestamp = Column(DateTime(timezone=True), nullable=False)
+    raw_value = Column(Float, nullable=False)
+    scaled_value = Column(Float, nullable=False)
+    quality = Column(String(20), default='good')
+
+    def to_dict(self):
+        return {
+            'register_id': self.register_id,
+            'timestamp': self.timestamp.isoformat(),
+            'raw_value': self.raw_value,
+            'scaled_value': self.scaled_value,
+            'quality': self.quality
+        }
@@ -1,13 +1,29 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, JSON
-from sqlalchemy.orm import relationship
+from typing import Optional
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, JSON, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from src.db import db
 
+
+def search_key(text: Optional[str]) -> str:
+    """
+    Forma normalizada para busca sem diferenciar maiúsculas (Unicode, como
+    str.casefold). O lower() do SQLite só converte ASCII, então nome e termo
+    são normalizados no Python e comparados já normalizados no banco.
+    """
+    return (text or '').casefold()
+
+
+def _name_search_default(context) -> str:
+    return search_key(context.get_current_parameters().get('name'))
+
+
 class PLC(db.Model):
     __tablename__ = 'plcs'
     
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
+    name_search = Column(String(100), default=_name_search_default)  # search_key(name), mantido por `name`
     mac = Column(String(50), default="None")
     ip_address = Column(String(15), nullable=False)
     subnet = Column(String(100), default="None")
@@ -17,6 +33,7 @@ class PLC(db.Model):
     unit_id = Column(Integer, default=1)  # Slave ID
     polling_interval = Column(Integer, default=1000)  # ms
     timeout = Column(Integer, default=3000)  # ms
+    pipeline_window = Column(Integer, default=1)  # requisições Modbus em voo por conexão (1 = sem pipelining)
     is_active = Column(Boolean, default=True)
     is_online = Column(Boolean, default=False)
     last_connection = Column(DateTime(timezone=True))
@@ -25,22 +42,44 @@ class PLC(db.Model):
     
     # Relacionamentos
     registers = relationship("Register", back_populates="plc", cascade="all, delete-orphan")
+
+    # busca por prefixo e ordenação do dashboard (ver PLCRepository.search)
+    __table_args__ = (
+        Index('idx_plcs_name_search', 'name_search', 'id'),
+        Index('idx_plcs_ip_address', 'ip_address'),
+        Index('idx_plcs_mac_lower', func.lower(mac)),
+    )
     
-    def to_dict(self):
+    @validates('name')
+    def _sync_name_search(self, key, value):
+        self.name_search = search_key(value)
+        return value
+
+    def to_dict(self, register_count: Optional[int] = None):
+        """
+        `register_count` pode vir de uma consulta agregada; sem ele a contagem
+        carrega a relação `registers` (uma consulta por PLC em listagens, ver
+        PLCRepository.list_summaries).
+        """
+        return self.summary_dict(self, len(self.registers) if register_count is None else register_count)
+
+    @staticmethod
+    def summary_dict(plc, register_count: int):
+        """Mesmo formato de `to_dict` a partir de um objeto ou de uma linha com as colunas de `plcs`"""
         return {
-            'id': self.id,
-            'name': self.name,
-            'mac': self.mac,
-            'ip_address': self.ip_address,
-            'subnet': self.subnet,
-            'tipo': self.tipo,
-            'portas': self.portas,
-            'protocol': self.protocol,
-            'unit_id': self.unit_id,
-            'polling_interval': self.polling_interval,
-            'is_active': self.is_active,
-            'is_online': self.is_online,
-            'register_count': len(self.registers),
-            'manual' : self.manual
+            'id': plc.id,
+            'name': plc.name,
+            'mac': plc.mac,
+            'ip_address': plc.ip_address,
+            'subnet': plc.subnet,
+            'tipo': plc.tipo,
+            'portas': plc.portas,
+            'protocol': plc.protocol,
+            'unit_id': plc.unit_id,
+            'polling_interval': plc.polling_interval,
+            'pipeline_window': plc.pipeline_window,
+            'is_active': plc.is_active,
+            'is_online': plc.is_online,
+            'register_count': register_count,
+            'manual' : plc.manual
         }
-    
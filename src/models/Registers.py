@@ -10,10 +10,18 @@ class Register(db.Model):
     name = Column(String(100), nullable=False)  # Nome descritivo
     address = Column(Integer, nullable=False)  # Endereço do registrador
     register_type = Column(String(20), nullable=False)  # holding, input, coil, discrete
-    data_type = Column(String(20), default='uint16')  # uint16, int16, float32, bool
+    data_type = Column(String(20), default='uint16')  # uint16, int16, (u)int32, (u)int64, float32, float64, bool, bit, string
+    byte_order = Column(String(10), default='big')  # big, little (bytes dentro de cada word)
+    word_order = Column(String(10), default='big')  # big, little (words de tipos 32/64 bits)
+    bit_index = Column(Integer)  # para data_type='bit' (0-15)
+    length = Column(Integer)  # para data_type='string': quantidade de registradores
     scale_factor = Column(Float, default=1.0)  # Para conversões
     offset = Column(Float, default=0.0)
+    deadband = Column(Float)  # banda morta para gravação (None = grava toda leitura)
+    deadband_mode = Column(String(10), default='absolute')  # absolute, percent
+    heartbeat_interval = Column(Integer)  # ms: grava mesmo sem variação após esse tempo
     unit = Column(String(10))  # °C, bar, rpm, etc.
+    scan_class = Column(Integer)  # ms: período de leitura do registrador (None = polling_interval do PLC)
     is_active = Column(Boolean, default=True)
     
     # Relacionamentos
@@ -28,8 +36,16 @@ class Register(db.Model):
             'address': self.address,
             'register_type': self.register_type,
             'data_type': self.data_type,
+            'byte_order': self.byte_order,
+            'word_order': self.word_order,
+            'bit_index': self.bit_index,
+            'length': self.length,
             'scale_factor': self.scale_factor,
             'offset': self.offset,
+            'deadband': self.deadband,
+            'deadband_mode': self.deadband_mode,
+            'heartbeat_interval': self.heartbeat_interval,
             'unit': self.unit,
+            'scan_class': self.scan_class,
             'is_active': self.is_active
         }
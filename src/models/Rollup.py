@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, Float
+from src.db import db
+
+
+class RollupMixin:
+    """
+    Agregado de um registrador em um bucket de tempo (apenas leituras 'good').
+    `bucket`, `first_time` e `last_time` são epoch em segundos (UTC).
+    """
+    register_id = Column(Integer, primary_key=True)
+    bucket = Column(Integer, primary_key=True)  # início do bucket
+    count = Column(Integer, nullable=False)
+    sum_value = Column(Float, nullable=False)  # avg = sum_value / count
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+    first_time = Column(Float, nullable=False)
+    first_value = Column(Float, nullable=False)
+    last_time = Column(Float, nullable=False)
+    last_value = Column(Float, nullable=False)
+
+    def to_dict(self):
+        return {
+            'register_id': self.register_id,
+            'bucket': self.bucket,
+            'count': self.count,
+            'avg_value': self.sum_value / self.count if self.count else None,
+            'min_value': self.min_value,
+            'max_value': self.max_value,
+            'first_value': self.first_value,
+            'last_value': self.last_value,
+        }
+
+
+class Rollup1m(RollupMixin, db.Model):
+    __tablename__ = 'readings_rollup_1m'
+    SECONDS = 60
+
+
+class Rollup1h(RollupMixin, db.Model):
+    __tablename__ = 'readings_rollup_1h'
+    SECONDS = 3600
+
+
+class Rollup1d(RollupMixin, db.Model):
+    __tablename__ = 'readings_rollup_1d'
+    SECONDS = 86400
+
+
+# do mais fino ao mais grosso
+ROLLUP_MODELS = (Rollup1m, Rollup1h, Rollup1d)
@@ -2,11 +2,19 @@ from .PLC import PLC
 from .Users import User, UserRole
 from .Reading import Reading
 from .Registers import Register
+from .Rollup import Rollup1m, Rollup1h, Rollup1d
+from .CurrentValue import CurrentValue
+from .CompactReading import CompactReading
 
 __all__ = [
     "PLC",
     "User",
     "Reading",
     "Register",
-    "UserRole"
+    "UserRole",
+    "Rollup1m",
+    "Rollup1h",
+    "Rollup1d",
+    "CurrentValue",
+    "CompactReading",
 ]
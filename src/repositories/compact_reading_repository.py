@@ -0,0 +1,160 @@
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import List, Dict, Optional, Iterable, Iterator, Any, Tuple
+
+from sqlalchemy import and_, desc, insert, select
+
+from src.db.archive import QUALITY_CODES, QUALITY_NAMES, cold_archive, to_us, from_us
+from src.db.partitions import reading_partitions
+from src.db.storage import storage
+from src.models.CompactReading import CompactReading
+from src.models.Reading import Reading
+from src.models.Registers import Register
+
+logger = logging.getLogger(__name__)
+
+# linhas por executemany / por lote da migração
+COMPACT_CHUNK_SIZE = 10000
+
+
+def to_ms(ts: datetime) -> int:
+    """datetime -> ms desde a época (UTC)"""
+    return to_us(ts) // 1000
+
+
+def encode_row(row: Dict[str, Any], raw_only: bool = False) -> Dict[str, Any]:
+    """Leitura no formato de `readings` -> linha de `compact_readings`"""
+    return {
+        'register_id': row['register_id'],
+        'ts': to_ms(row['timestamp']),
+        'raw_value': row['raw_value'],
+        'scaled_value': None if raw_only else row['scaled_value'],
+        'quality': QUALITY_CODES.get(row.get('quality') or 'good', QUALITY_CODES['uncertain']),
+    }
+
+
+def decode_row(row: Dict[str, Any], scale: Tuple[float, float] = (1.0, 0.0)) -> Dict[str, Any]:
+    """Linha de `compact_readings` -> leitura no formato de `readings` (escala aplicada se preciso)"""
+    scaled = row['scaled_value']
+    if scaled is None:
+        factor, offset = scale
+        scaled = row['raw_value'] * factor + offset
+    return {
+        'register_id': row['register_id'],
+        'timestamp': from_us(row['ts'] * 1000),
+        'raw_value': row['raw_value'],
+        'scaled_value': scaled,
+        'quality': QUALITY_NAMES[row['quality']],
+    }
+
+
+class CompactReadingRepository:
+    """
+    Leituras no esquema compacto (`CompactReading`): grava, consulta no mesmo
+    formato de `ReadingRepository` e migra o histórico do esquema atual.
+    Com `raw_only` só o valor bruto é gravado e a escala é aplicada na leitura.
+
+    Experimental: a ingestão e as rotas continuam em `readings`; a tabela serve
+    para medir o esquema (src/simulations/benchmark_schema.py) e para testar a
+    migração antes de trocar o caminho de produção.
+    """
+
+    def __init__(self, raw_only: bool = False):
+        self.raw_only = raw_only
+
+    def insert_many(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """INSERT Core em executemany, em pedaços de COMPACT_CHUNK_SIZE, numa transação"""
+        table = CompactReading.__table__
+        rows = iter(rows)
+        total = 0
+        with storage.writer() as conn:
+            while True:
+                chunk = [encode_row(row, self.raw_only) for row in islice(rows, COMPACT_CHUNK_SIZE)]
+                if not chunk:
+                    break
+                conn.execute(insert(table), chunk)
+                total += len(chunk)
+        return total
+
+    @staticmethod
+    def _scale(conn, register_id: int) -> Tuple[float, float]:
+        row = conn.execute(
+            select(Register.scale_factor, Register.offset).where(Register.id == register_id)
+        ).first()
+        if row is None:
+            return 1.0, 0.0
+        return (row.scale_factor if row.scale_factor is not None else 1.0), (row.offset or 0.0)
+
+    def get_historical_data(self, register_id: int, start_time: datetime,
+                            end_time: datetime, limit: int = 1000) -> List[Dict]:
+        """Leituras de um registrador em [start_time, end_time], mais recentes primeiro"""
+        table = CompactReading.__table__
+        with storage.reader() as conn:
+            scale = self._scale(conn, register_id)
+            rows = conn.execute(
+                select(table).where(
+                    and_(
+                        table.c.register_id == register_id,
+                        table.c.ts >= to_ms(start_time),
+                        table.c.ts <= to_ms(end_time)
+                    )
+                ).order_by(desc(table.c.ts)).limit(limit)
+            ).mappings().all()
+        return [decode_row(row, scale) for row in rows]
+
+    def migrate(self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> int:
+        """
+        Copia as leituras de [start_time, end_time) das partições, da tabela
+        legada e do arquivo frio para `compact_readings`. Cada lote de
+        COMPACT_CHUNK_SIZE linhas é lido por uma conexão de leitura e gravado em
+        sua própria transação, então a conexão de escrita fica livre entre os
+        lotes (o ReadingSink continua gravando durante a migração). Os dados de
+        origem não são apagados. Retorna o número de linhas copiadas.
+        """
+        target = CompactReading.__table__
+        with storage.writer() as conn:
+            # migrar de novo o mesmo intervalo não duplica linhas
+            stmt = target.delete()
+            if start_time is not None:
+                stmt = stmt.where(target.c.ts >= to_ms(start_time))
+            if end_time is not None:
+                stmt = stmt.where(target.c.ts < to_ms(end_time))
+            conn.execute(stmt)
+
+        total = 0
+        for chunk in self._source_chunks(start_time, end_time):
+            with storage.writer() as conn:
+                conn.execute(insert(target), [encode_row(row, self.raw_only) for row in chunk])
+            total += len(chunk)
+        logger.info("Migração para compact_readings concluída: %s leituras", total)
+        return total
+
+    def _source_chunks(self, start_time: Optional[datetime],
+                       end_time: Optional[datetime]) -> Iterator[List[Dict[str, Any]]]:
+        """Lotes de leituras de origem: tabelas quentes (keyset por id) e depois o arquivo frio"""
+        reading_partitions.load(storage.read_engine)
+        for table in reading_partitions.tables_for_range(start_time, end_time) + [Reading.__table__]:
+            last_id = None
+            while True:
+                query = select(table.c.id, table.c.register_id, table.c.timestamp, table.c.raw_value,
+                               table.c.scaled_value, table.c.quality)
+                if start_time is not None:
+                    query = query.where(table.c.timestamp >= start_time)
+                if end_time is not None:
+                    query = query.where(table.c.timestamp < end_time)
+                if last_id is not None:
+                    query = query.where(table.c.id > last_id)
+                with storage.reader() as conn:
+                    chunk = conn.execute(query.order_by(table.c.id).limit(COMPACT_CHUNK_SIZE)).mappings().all()
+                if not chunk:
+                    break
+                last_id = chunk[-1]['id']
+                yield chunk
+
+        rows = cold_archive.scan_range(start_time, end_time)
+        while True:
+            chunk = list(islice(rows, COMPACT_CHUNK_SIZE))
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,86 @@
+from typing import List, Dict, Any, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from src.db.partitions import as_utc
+from src.db.storage import storage
+from src.models.CurrentValue import CurrentValue
+from src.models.PLC import PLC
+from src.models.Registers import Register
+
+COLUMNS = ('register_id', 'timestamp', 'raw_value', 'scaled_value', 'quality')
+
+
+def newest_per_register(rows: Iterable[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """Linha mais recente de cada registrador dentro de um lote"""
+    newest: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        current = newest.get(row['register_id'])
+        if current is None or as_utc(row['timestamp']) >= as_utc(current['timestamp']):
+            newest[row['register_id']] = row
+    return newest
+
+
+class CurrentValueRepository:
+    """Tabela `current_values`: uma linha por registrador com o último valor gravado"""
+
+    def apply(self, conn: Connection, rows: Iterable[Dict[str, Any]]):
+        """
+        UPSERT do valor mais recente de cada registrador do lote, na transação
+        de `conn`. Uma linha mais antiga que a já gravada não sobrescreve.
+        """
+        latest = [{c: row.get(c, 'good' if c == 'quality' else None) for c in COLUMNS}
+                  for row in newest_per_register(rows).values()]
+        if not latest:
+            return
+        table = CurrentValue.__table__
+        dialect = postgresql if conn.dialect.name == 'postgresql' else sqlite
+        stmt = dialect.insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.register_id],
+            set_={c: stmt.excluded[c] for c in COLUMNS[1:]},
+            where=stmt.excluded.timestamp >= table.c.timestamp,
+        )
+        conn.execute(stmt, latest)
+
+    def get_by_plc(self, plc_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Valores atuais com plc_id, nome e unidade do registrador (todos os PLCs se plc_id=None)"""
+        table = CurrentValue.__table__
+        query = select(table, Register.plc_id, Register.name, Register.unit).join(
+            Register, Register.id == table.c.register_id
+        )
+        if plc_id is not None:
+            query = query.where(Register.plc_id == plc_id)
+        with storage.reader() as conn:
+            return [dict(row) for row in conn.execute(query).mappings()]
+
+    def missing_register_ids(self) -> List[int]:
+        """Registradores que ainda não têm linha em `current_values`"""
+        table = CurrentValue.__table__
+        query = select(Register.id).outerjoin(table, table.c.register_id == Register.id).where(
+            table.c.register_id.is_(None)
+        )
+        with storage.reader() as conn:
+            return list(conn.execute(query).scalars())
+
+    def plc_ids(self, register_ids: Iterable[int]) -> Dict[int, int]:
+        """register_id -> plc_id"""
+        register_ids = list(register_ids)
+        if not register_ids:
+            return {}
+        with storage.reader() as conn:
+            return dict(conn.execute(
+                select(Register.id, Register.plc_id).where(Register.id.in_(register_ids))
+            ).all())
+
+    def plc_addresses(self) -> Dict[int, str]:
+        """plc_id -> ip_address"""
+        with storage.reader() as conn:
+            return dict(conn.execute(select(PLC.id, PLC.ip_address)).all())
+
+    def upsert(self, rows: List[Dict[str, Any]]):
+        """UPSERT avulso pela conexão de escrita (usado na reconstrução)"""
+        with storage.writer() as conn:
+            self.apply(conn, rows)
@@ -1,7 +1,45 @@
-from typing import List, Optional, Dict
-from src.models.PLC import PLC
+import sys
+from typing import List, Optional, Dict, Tuple
+from src.models.PLC import PLC, search_key
+from src.models.Registers import Register
+from src.models.CurrentValue import CurrentValue
 from src.repositories.base_repository import BaseRepository
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, func, select, case, update, bindparam
+from sqlalchemy.engine import Connection, Row
+
+# colunas da listagem do dashboard (sem carregar objetos ORM nem relacionamentos)
+LISTING_COLUMNS = (PLC.id, PLC.name, PLC.ip_address, PLC.mac, PLC.subnet, PLC.portas,
+                   PLC.protocol, PLC.unit_id)
+
+_current = CurrentValue.__table__.c
+# colunas agregadas por PLC em list_summaries (registradores + valores atuais)
+SUMMARY_AGGREGATES = (
+    func.count(Register.id).label('register_count'),
+    func.count(case((Register.is_active == True, 1))).label('active_register_count'),
+    func.count(case((_current.quality != 'good', 1))).label('bad_register_count'),
+    func.max(_current.timestamp).label('last_reading_at'),
+)
+
+
+def _prefix(expr, term: str):
+    """
+    `expr` começa com `term`, como faixa [term, próximo prefixo) para usar o índice.
+    O próximo prefixo incrementa o último caractere; caracteres finais já no
+    maior code point (U+10FFFF) não têm sucessor e saem antes do incremento.
+    """
+    stem = term.rstrip(chr(sys.maxunicode))
+    if not stem:
+        return expr >= term
+    upper = stem[:-1] + chr(ord(stem[-1]) + 1)
+    return and_(expr >= term, expr < upper)
+
+def fill_name_search(conn: Connection) -> int:
+    """Preenche `name_search` dos PLCs que ainda não o têm (bancos anteriores à coluna)"""
+    rows = conn.execute(select(PLC.id, PLC.name).where(PLC.name_search.is_(None))).all()
+    if rows:
+        conn.execute(update(PLC.__table__).where(PLC.__table__.c.id == bindparam('plc_id')),
+                     [{'plc_id': row.id, 'name_search': search_key(row.name)} for row in rows])
+    return len(rows)
 
 class PLCRepository(BaseRepository[PLC]):
     
@@ -24,6 +62,58 @@ class PLCRepository(BaseRepository[PLC]):
             and_(PLC.is_active == True, PLC.is_online == True)
         ).all()
     
+    def search(self, term: Optional[str] = None, limit: int = 21,
+               offset: int = 0) -> Tuple[List[Row], int]:
+        """
+        Página da listagem filtrada no banco: nome, IP ou MAC começando com `term`
+        (sem diferenciar maiúsculas, inclusive acentuadas: o nome é comparado
+        pela coluna `name_search`), ordenada por nome. Retorna as linhas
+        (LISTING_COLUMNS) e o total de PLCs que casam com o filtro. Filtro e
+        ordenação usam os índices de `plcs`, então o custo depende do tamanho da
+        página e não do número de PLCs.
+        """
+        condition = None
+        term = search_key(term.strip() if term else term)
+        if term:
+            condition = or_(
+                _prefix(PLC.name_search, term),
+                _prefix(PLC.ip_address, term),
+                _prefix(func.lower(PLC.mac), term),
+            )
+
+        count = select(func.count()).select_from(PLC)
+        query = select(*LISTING_COLUMNS).order_by(PLC.name_search, PLC.id).limit(limit).offset(offset)
+        if condition is not None:
+            count = count.where(condition)
+            query = query.where(condition)
+
+        session = self.db.session
+        total = session.execute(count).scalar_one()
+        rows = session.execute(query).all() if offset < total else []
+        return rows, total
+
+    def list_summaries(self, manual: Optional[bool] = None,
+                       active: Optional[bool] = None) -> List[Row]:
+        """
+        Todos os PLCs (filtráveis por `manual`/`is_active`) com as colunas de
+        `plcs` e os agregados de SUMMARY_AGGREGATES: registradores cadastrados e
+        ativos, registradores cujo último valor não é 'good' e o instante da
+        leitura mais recente. Uma única consulta agrupada, em vez de carregar
+        `PLC.registers` de cada objeto (N+1 consultas).
+        """
+        query = (
+            select(*PLC.__table__.c, *SUMMARY_AGGREGATES)
+            .outerjoin(Register, Register.plc_id == PLC.id)
+            .outerjoin(CurrentValue.__table__, _current.register_id == Register.id)
+            .group_by(PLC.id)
+            .order_by(PLC.id)
+        )
+        if manual is not None:
+            query = query.where(PLC.manual == manual)
+        if active is not None:
+            query = query.where(PLC.is_active == active)
+        return self.db.session.execute(query).all()
+
     def update_connection_status(self, plc_id: int, is_online: bool):
         """Atualiza status de conexão"""
         plc = self.get_by_id(plc_id)
@@ -1,78 +1,225 @@
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from itertools import islice, repeat
+from typing import List, Dict, Optional, Iterable, Iterator, Any, Sequence
+from datetime import date, datetime, timedelta, timezone
 from src.models.Reading import Reading
-from src.models.Registers import Register
 from src.repositories.base_repository import BaseRepository
-from sqlalchemy import and_, func, desc
+from src.repositories.rollup_repository import RollupRepository
+from src.repositories.current_value_repository import CurrentValueRepository
+from src.db.storage import storage
+from src.db.partitions import reading_partitions, as_utc
+from src.db.archive import cold_archive
+from sqlalchemy import Table, and_, or_, func, desc, insert, delete, select
+
+# linhas por executemany: limita a memória de cada lote, qualquer que seja a entrada
+INSERT_CHUNK_SIZE = 10000
+# linhas por página de keyset na exportação
+EXPORT_PAGE_SIZE = 5000
 
 class ReadingRepository(BaseRepository[Reading]):
     
     def __init__(self):
         super().__init__(Reading)
+        self.rollups = RollupRepository()
+        self.current = CurrentValueRepository()
     
+    def _partition_tables(self, start_time: Optional[datetime] = None,
+                          end_time: Optional[datetime] = None) -> List[Table]:
+        """Partições que cobrem o intervalo (mais nova primeiro) + a tabela legada `readings`"""
+        reading_partitions.load(storage.read_engine)
+        return reading_partitions.tables_for_range(start_time, end_time) + [Reading.__table__]
+
     def get_latest_readings(self, plc_id: int) -> List[Dict]:
-        """Retorna as últimas leituras de todos os registradores de um PLC"""
-        subquery = self.db.session.query(
-            Reading.register_id,
-            func.max(Reading.timestamp).label('latest_timestamp')
-        ).join(Register).filter(
-            Register.plc_id == plc_id
-        ).group_by(Reading.register_id).subquery()
-        
-        return self.db.session.query(
-            Reading, Register
-        ).join(Register).join(
-            subquery,
-            and_(
-                Reading.register_id == subquery.c.register_id,
-                Reading.timestamp == subquery.c.latest_timestamp
-            )
-        ).all()
-    
-    def get_historical_data(self, register_id: int, start_time: datetime, 
-                           end_time: datetime, limit: int = 1000) -> List[Reading]:
-        """Retorna dados históricos de um registrador"""
-        return self.db.session.query(Reading).filter(
-            and_(
-                Reading.register_id == register_id,
-                Reading.timestamp >= start_time,
-                Reading.timestamp <= end_time
+        """
+        Retorna as últimas leituras de todos os registradores de um PLC, lidas da
+        tabela `current_values` (uma linha por registrador, custo independente do histórico).
+        """
+        return self.current.get_by_plc(plc_id)
+
+    def latest_from_history(self, register_ids: Iterable[int]) -> List[Dict]:
+        """
+        Última leitura de cada registrador procurada nas leituras brutas.
+        Percorre as partições da mais nova para a mais antiga e para assim que
+        todos os registradores tiverem valor (usado para reconstruir `current_values`).
+        """
+        result = []
+        pending = set(register_ids)
+        with storage.reader() as conn:
+            for table in self._partition_tables():
+                if not pending:
+                    break
+                latest = select(
+                    table.c.register_id,
+                    func.max(table.c.timestamp).label('latest_timestamp')
+                ).where(table.c.register_id.in_(pending)).group_by(table.c.register_id).subquery()
+
+                rows = conn.execute(
+                    select(table).join(
+                        latest,
+                        and_(
+                            table.c.register_id == latest.c.register_id,
+                            table.c.timestamp == latest.c.latest_timestamp
+                        )
+                    )
+                ).mappings()
+                for row in rows:
+                    if row['register_id'] not in pending:
+                        continue
+                    pending.discard(row['register_id'])
+                    result.append(dict(row))
+        return result
+
+    def get_historical_data(self, register_id: int, start_time: datetime,
+                           end_time: datetime, limit: int = 1000) -> List[Dict]:
+        """
+        Retorna dados históricos de um registrador (mais recentes primeiro) como
+        uma série única: partições quentes, depois o arquivo frio e por fim a
+        tabela legada. Timestamps sempre em UTC com fuso.
+        """
+        result = []
+        *hot, legacy = self._partition_tables(start_time, end_time)
+        with storage.reader() as conn:
+            for table in hot:
+                if len(result) >= limit:
+                    break
+                result.extend(self._history_rows(conn, table, register_id, start_time, end_time, limit - len(result)))
+
+            if len(result) < limit:
+                result.extend(cold_archive.query(register_id, start_time, end_time, limit - len(result)))
+            if len(result) < limit:
+                result.extend(self._history_rows(conn, legacy, register_id, start_time, end_time, limit - len(result)))
+
+        for row in result:
+            row['timestamp'] = as_utc(row['timestamp'])
+        return result
+
+    def iter_history(self, register_id: int, start_time: datetime, end_time: datetime,
+                     page_size: int = EXPORT_PAGE_SIZE) -> Iterator[Dict]:
+        """
+        Todas as leituras de um registrador em [start_time, end_time], em ordem
+        crescente, como gerador (memória constante). Tabela legada, arquivo frio
+        e partições quentes são lidos nessa ordem; em cada tabela a paginação é
+        por keyset em (timestamp, id) e cada página usa uma conexão do pool só
+        pelo tempo da consulta, sem manter transação de leitura aberta durante
+        toda a exportação.
+        """
+        *hot, legacy = self._partition_tables(start_time, end_time)
+        yield from self._iter_table(legacy, register_id, start_time, end_time, page_size)
+        for row in cold_archive.scan(register_id, start_time, end_time):
+            yield row
+        for table in reversed(hot):
+            yield from self._iter_table(table, register_id, start_time, end_time, page_size)
+
+    @staticmethod
+    def _iter_table(table: Table, register_id: int, start_time: datetime, end_time: datetime,
+                    page_size: int) -> Iterator[Dict]:
+        columns = (table.c.id, table.c.register_id, table.c.timestamp,
+                   table.c.raw_value, table.c.scaled_value, table.c.quality)
+        last_ts, last_id = None, None
+        while True:
+            query = select(*columns).where(
+                table.c.register_id == register_id,
+                table.c.timestamp <= end_time,
             )
-        ).order_by(desc(Reading.timestamp)).limit(limit).all()
-    
-    def get_aggregated_data(self, register_id: int, start_time: datetime, 
+            if last_ts is None:
+                query = query.where(table.c.timestamp >= start_time)
+            else:
+                query = query.where(or_(
+                    table.c.timestamp > last_ts,
+                    and_(table.c.timestamp == last_ts, table.c.id > last_id)
+                ))
+            query = query.order_by(table.c.timestamp, table.c.id).limit(page_size)
+
+            with storage.reader() as conn:
+                page = [dict(row) for row in conn.execute(query).mappings()]
+            if not page:
+                return
+            last_ts, last_id = page[-1]['timestamp'], page[-1]['id']
+            for row in page:
+                del row['id']
+                row['timestamp'] = as_utc(row['timestamp'])
+                yield row
+            if len(page) < page_size:
+                return
+
+    @staticmethod
+    def _history_rows(conn, table: Table, register_id: int, start_time: datetime,
+                      end_time: datetime, limit: int) -> List[Dict]:
+        rows = conn.execute(
+            select(table).where(
+                and_(
+                    table.c.register_id == register_id,
+                    table.c.timestamp >= start_time,
+                    table.c.timestamp <= end_time
+                )
+            ).order_by(desc(table.c.timestamp)).limit(limit)
+        ).mappings()
+        return [dict(row) for row in rows]
+
+    def get_aggregated_data(self, register_id: int, start_time: datetime,
                            end_time: datetime, interval_minutes: int = 5) -> List[Dict]:
-        """Retorna dados agregados (média, min, max) por intervalo"""
-        # Agrupa por intervalos de tempo
-        time_bucket = func.date_trunc('minute', Reading.timestamp)
-        
-        return self.db.session.query(
-            time_bucket.label('time_bucket'),
-            func.avg(Reading.scaled_value).label('avg_value'),
-            func.min(Reading.scaled_value).label('min_value'),
-            func.max(Reading.scaled_value).label('max_value'),
-            func.count(Reading.id).label('count')
-        ).filter(
-            and_(
-                Reading.register_id == register_id,
-                Reading.timestamp >= start_time,
-                Reading.timestamp <= end_time,
-                Reading.quality == 'good'
-            )
-        ).group_by(time_bucket).order_by(time_bucket).all()
-    
-    def cleanup_old_data(self, days_to_keep: int = 30):
-        """Remove dados antigos para manter performance"""
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-        
-        deleted_count = self.db.session.query(Reading).filter(
-            Reading.timestamp < cutoff_date
-        ).delete()
-        
-        self.db.session.commit()
-        return deleted_count
-    
+        """Retorna dados agregados (média, min, max, first, last) por intervalo, lidos dos rollups"""
+        return self.rollups.get_series(register_id, start_time, end_time, interval_minutes)
+
+    def cleanup_old_data(self, days_to_keep: int = 30) -> int:
+        """
+        Retenção: apaga as partições inteiramente mais antigas que o corte
+        (DROP TABLE, instantâneo). Na tabela legada `readings` ainda faz o DELETE.
+        Dias do arquivo frio anteriores ao corte também são apagados.
+        Retorna o número de partições removidas.
+        """
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
+        reading_partitions.load(storage.read_engine)
+        expired = reading_partitions.expired(cutoff_date)
+
+        with storage.writer() as conn:
+            for key in expired:
+                reading_partitions.drop(conn, key)
+            conn.execute(delete(Reading.__table__).where(Reading.__table__.c.timestamp < cutoff_date))
+        cold_archive.drop_before(cutoff_date)
+        return len(expired)
+
+    def insert_many(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Caminho rápido de ingestão: INSERT Core em executemany, sem objetos ORM.
+        `rows` pode ser um gerador de dicts {register_id, timestamp, raw_value,
+        scaled_value, quality}; é consumido em pedaços de INSERT_CHUNK_SIZE, todos
+        na mesma transação da conexão de escrita. Cada linha vai para a partição
+        do seu timestamp e é somada aos rollups; `current_values` recebe o valor
+        mais recente de cada registrador. Retorna o total de linhas.
+        """
+        reading_partitions.load(storage.read_engine)
+        rows = iter(rows)
+        total = 0
+        created: Dict[date, Table] = {}
+        with storage.writer() as conn:
+            while True:
+                chunk = list(islice(rows, INSERT_CHUNK_SIZE))
+                if not chunk:
+                    break
+                by_partition: Dict[date, List[Dict[str, Any]]] = {}
+                for row in chunk:
+                    by_partition.setdefault(reading_partitions.partition_key(row['timestamp']), []).append(row)
+                for key, partition_rows in by_partition.items():
+                    conn.execute(insert(reading_partitions.ensure(conn, key, created)), partition_rows)
+                self.rollups.apply(conn, chunk)
+                self.current.apply(conn, chunk)
+                total += len(chunk)
+        # só agora (após o commit) as partições novas aparecem para as consultas;
+        # se a transação falhar, as criadas nela são desfeitas e nunca publicadas
+        reading_partitions.publish(created)
+        return total
+
+    def insert_columns(self, register_ids: Sequence[int], timestamps: Sequence[datetime],
+                       raw_values: Sequence[float], scaled_values: Sequence[float],
+                       qualities: Optional[Sequence[str]] = None) -> int:
+        """Mesma ingestão a partir de colunas paralelas (qualidade padrão 'good')"""
+        qualities = repeat('good') if qualities is None else qualities
+        return self.insert_many(
+            {'register_id': r, 'timestamp': t, 'raw_value': raw, 'scaled_value': scaled, 'quality': q}
+            for r, t, raw, scaled, q in zip(register_ids, timestamps, raw_values, scaled_values, qualities)
+        )
+
     def bulk_insert(self, readings: List[Reading]):
-        """Inserção em lote para melhor performance"""
-        self.db.session.add_all(readings)
-        self.db.session.commit()
+        """Inserção em lote pela conexão de escrita serializada (uma transação)"""
+        with storage.write_session() as session:
+            session.add_all(readings)
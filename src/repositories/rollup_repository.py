@@ -0,0 +1,203 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import List, Dict, Optional, Iterable, Any, Tuple
+
+from sqlalchemy import and_, case, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from src.db.archive import cold_archive
+from src.db.partitions import as_utc, reading_partitions
+from src.db.storage import storage
+from src.models.Reading import Reading
+from src.models.Rollup import ROLLUP_MODELS
+
+logger = logging.getLogger(__name__)
+
+# linhas brutas por lote durante o backfill
+BACKFILL_CHUNK_SIZE = 10000
+
+
+def aggregate_rows(rows: Iterable[Dict[str, Any]], seconds: int) -> List[Dict[str, Any]]:
+    """Agrega um lote de leituras 'good' por (register_id, bucket) em memória"""
+    acc: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for row in rows:
+        if row.get('quality', 'good') != 'good':
+            continue
+        ts = as_utc(row['timestamp']).timestamp()
+        value = row['scaled_value']
+        key = (row['register_id'], int(ts // seconds) * seconds)
+        agg = acc.get(key)
+        if agg is None:
+            acc[key] = {
+                'register_id': key[0], 'bucket': key[1], 'count': 1, 'sum_value': value,
+                'min_value': value, 'max_value': value,
+                'first_time': ts, 'first_value': value, 'last_time': ts, 'last_value': value,
+            }
+            continue
+        agg['count'] += 1
+        agg['sum_value'] += value
+        if value < agg['min_value']:
+            agg['min_value'] = value
+        if value > agg['max_value']:
+            agg['max_value'] = value
+        if ts < agg['first_time']:
+            agg['first_time'], agg['first_value'] = ts, value
+        if ts >= agg['last_time']:
+            agg['last_time'], agg['last_value'] = ts, value
+    return list(acc.values())
+
+
+class RollupRepository:
+    """
+    Tabelas de rollup (1 min / 1 h / 1 dia) com min/max/avg/count/first/last.
+
+    `apply` é chamado na mesma transação da ingestão: agrega o lote em memória
+    e faz UPSERT somando ao bucket existente, então as consultas de tendência
+    leem poucos buckets em vez das leituras brutas. `backfill` recalcula um
+    intervalo a partir das leituras brutas (partições, tabela legada e arquivo frio).
+    """
+
+    def _upsert(self, conn: Connection, model, rows: List[Dict[str, Any]]):
+        table = model.__table__
+        if conn.dialect.name == 'postgresql':
+            stmt = postgresql.insert(table)
+            least, greatest = func.least, func.greatest
+        else:
+            stmt = sqlite.insert(table)
+            least, greatest = func.min, func.max  # min/max com 2 argumentos são escalares no SQLite
+        new = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.register_id, table.c.bucket],
+            set_={
+                # no UPDATE todas as expressões enxergam os valores antigos da linha
+                'count': table.c.count + new.count,
+                'sum_value': table.c.sum_value + new.sum_value,
+                'min_value': least(table.c.min_value, new.min_value),
+                'max_value': greatest(table.c.max_value, new.max_value),
+                'first_value': case((new.first_time < table.c.first_time, new.first_value),
+                                    else_=table.c.first_value),
+                'first_time': least(table.c.first_time, new.first_time),
+                'last_value': case((new.last_time >= table.c.last_time, new.last_value),
+                                   else_=table.c.last_value),
+                'last_time': greatest(table.c.last_time, new.last_time),
+            },
+        )
+        conn.execute(stmt, rows)
+
+    def apply(self, conn: Connection, rows: List[Dict[str, Any]]):
+        """Soma um lote de leituras brutas aos rollups, na transação de `conn`"""
+        for model in ROLLUP_MODELS:
+            buckets = aggregate_rows(rows, model.SECONDS)
+            if buckets:
+                self._upsert(conn, model, buckets)
+
+    def backfill(self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> int:
+        """
+        Recalcula os rollups de [start_time, end_time) a partir das leituras brutas:
+        partições quentes, tabela legada e os dias já movidos para o arquivo frio
+        (sem eles o backfill apagaria os rollups dos dias arquivados). O intervalo
+        é alargado para dias inteiros (UTC) para não deixar buckets diários pela
+        metade. Retorna a quantidade de leituras processadas.
+        """
+        if start_time is not None:
+            start_time = as_utc(start_time).replace(hour=0, minute=0, second=0, microsecond=0)
+        if end_time is not None:
+            end_time = as_utc(end_time).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+        reading_partitions.load(storage.read_engine)
+        tables = reading_partitions.tables_for_range(start_time, end_time) + [Reading.__table__]
+        total = 0
+        with storage.writer() as conn:
+            for model in ROLLUP_MODELS:
+                stmt = delete(model.__table__)
+                if start_time is not None:
+                    stmt = stmt.where(model.__table__.c.bucket >= start_time.timestamp())
+                if end_time is not None:
+                    stmt = stmt.where(model.__table__.c.bucket < end_time.timestamp())
+                conn.execute(stmt)
+
+            for table in tables:
+                query = select(table.c.register_id, table.c.timestamp, table.c.scaled_value, table.c.quality)
+                if start_time is not None:
+                    query = query.where(table.c.timestamp >= start_time)
+                if end_time is not None:
+                    query = query.where(table.c.timestamp < end_time)
+                result = conn.execution_options(stream_results=True).execute(query).mappings()
+                for chunk in result.partitions(BACKFILL_CHUNK_SIZE):
+                    self.apply(conn, chunk)
+                    total += len(chunk)
+
+            rows = cold_archive.scan_range(start_time, end_time)
+            while True:
+                chunk = list(islice(rows, BACKFILL_CHUNK_SIZE))
+                if not chunk:
+                    break
+                self.apply(conn, chunk)
+                total += len(chunk)
+        logger.info("Backfill de rollups concluído: %s leituras", total)
+        return total
+
+    @staticmethod
+    def model_for(interval_minutes: int):
+        """Rollup mais grosso cujo bucket ainda divide o intervalo pedido"""
+        seconds = max(1, interval_minutes) * 60
+        for model in reversed(ROLLUP_MODELS):
+            if seconds >= model.SECONDS and seconds % model.SECONDS == 0:
+                return model
+        return ROLLUP_MODELS[0]
+
+    def get_buckets(self, model, register_id: int, start_time: datetime,
+                    end_time: datetime) -> List[Dict[str, Any]]:
+        """Buckets de um rollup que tocam [start_time, end_time], em ordem crescente"""
+        table = model.__table__
+        start = as_utc(start_time).timestamp()
+        end = as_utc(end_time).timestamp()
+        with storage.reader() as conn:
+            return conn.execute(
+                select(table).where(
+                    and_(
+                        table.c.register_id == register_id,
+                        table.c.bucket >= int(start // model.SECONDS) * model.SECONDS,
+                        table.c.bucket <= end
+                    )
+                ).order_by(table.c.bucket)
+            ).mappings().all()
+
+    def get_series(self, register_id: int, start_time: datetime, end_time: datetime,
+                   interval_minutes: int = 5) -> List[Dict[str, Any]]:
+        """
+        Série agregada em buckets de `interval_minutes`, lida do rollup adequado
+        e reagrupada em memória (alguns milhares de linhas no máximo).
+        """
+        model = self.model_for(interval_minutes)
+        step = max(model.SECONDS, interval_minutes * 60)
+        rows = self.get_buckets(model, register_id, start_time, end_time)
+
+        series: List[Dict[str, Any]] = []
+        current = None
+        for row in rows:
+            bucket = int(row['bucket'] // step) * step
+            if current is None or current['bucket'] != bucket:
+                current = {
+                    'bucket': bucket, 'count': 0, 'sum': 0.0,
+                    'min_value': row['min_value'], 'max_value': row['max_value'],
+                    'first_value': row['first_value'], 'last_value': row['last_value'],
+                }
+                series.append(current)
+            current['count'] += row['count']
+            current['sum'] += row['sum_value']
+            current['min_value'] = min(current['min_value'], row['min_value'])
+            current['max_value'] = max(current['max_value'], row['max_value'])
+            current['last_value'] = row['last_value']
+
+        return [{
+            'time_bucket': datetime.fromtimestamp(s['bucket'], tz=timezone.utc),
+            'avg_value': s['sum'] / s['count'],
+            'min_value': s['min_value'],
+            'max_value': s['max_value'],
+            'first_value': s['first_value'],
+            'last_value': s['last_value'],
+            'count': s['count'],
+        } for s in series]
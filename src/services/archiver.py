@@ -0,0 +1,128 @@
+# src/services/archiver.py
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional
+
+from flask import Flask
+from sqlalchemy import select
+
+from src.db.archive import cold_archive
+from src.db.partitions import as_utc, reading_partitions
+from src.db.storage import storage
+
+logger = logging.getLogger(__name__)
+
+
+class ColdArchiver:
+    """
+    Move partições fechadas de leituras para o arquivo frio.
+
+    Uma partição é arquivada quando termina antes de `archive_after_days` atrás:
+    as leituras são lidas em ordem (register_id, timestamp) do pool somente
+    leitura, gravadas em um segmento por registrador por dia e, só depois de
+    todos os segmentos gravados, a partição é removida do banco. Se o processo
+    cair no meio, a partição continua no banco e a próxima execução regrava os
+    segmentos; leituras atrasadas que recriam a partição de um dia já arquivado
+    são mescladas ao segmento existente (ColdArchive.write_segment).
+    """
+
+    def __init__(self, app: Flask = None, archive_after_days: int = 30, interval_s: float = 3600.0):
+        self.app = app
+        self.archive_after_days = archive_after_days
+        self.interval_s = interval_s
+        self._task: Optional[asyncio.Task] = None
+
+        # métricas
+        self.partitions_archived = 0
+        self.rows_archived = 0
+        self.last_run: Optional[datetime] = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        self.app = app
+        self.archive_after_days = app.config.get('ARCHIVE_AFTER_DAYS', self.archive_after_days)
+
+    def run_once(self) -> int:
+        """Arquiva todas as partições vencidas; retorna quantas foram arquivadas"""
+        if not cold_archive.root:
+            logger.warning("Arquivo frio sem diretório configurado (ARCHIVE_DIR)")
+            return 0
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.archive_after_days)
+        reading_partitions.load(storage.read_engine)
+        archived = 0
+        for key in reading_partitions.expired(cutoff):
+            table = reading_partitions.table(key)
+            if table is None:
+                continue
+            rows = self._archive_table(table)
+            with storage.writer() as conn:
+                reading_partitions.drop(conn, key)
+            archived += 1
+            self.partitions_archived += 1
+            self.rows_archived += rows
+            logger.info("Partição %s arquivada (%s leituras)", table.name, rows)
+        self.last_run = datetime.now(timezone.utc)
+        return archived
+
+    def _archive_table(self, table) -> int:
+        total = 0
+        query = select(table.c.register_id, table.c.timestamp, table.c.raw_value,
+                       table.c.scaled_value, table.c.quality).order_by(table.c.register_id, table.c.timestamp)
+
+        current_id = None
+        pending: List[Dict[str, Any]] = []
+        with storage.reader() as conn:
+            for row in conn.execute(query).mappings():
+                if row['register_id'] != current_id:
+                    total += self._write_register(current_id, pending)
+                    current_id, pending = row['register_id'], []
+                pending.append(row)
+            total += self._write_register(current_id, pending)
+        return total
+
+    @staticmethod
+    def _write_register(register_id: Optional[int], rows: List[Dict[str, Any]]) -> int:
+        """Divide as leituras de um registrador por dia (UTC) e grava um segmento por dia"""
+        if register_id is None or not rows:
+            return 0
+        by_day: Dict[Any, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_day.setdefault(as_utc(row['timestamp']).date(), []).append(row)
+        for day, day_rows in by_day.items():
+            cold_archive.write_segment(register_id, day, day_rows)
+        return len(rows)
+
+    async def start(self):
+        """Executa `run_once` a cada `interval_s` no loop atual (idempotente)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.exception(f"Erro no arquivamento de leituras: {e}")
+            await asyncio.sleep(self.interval_s)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'partitions_archived': self.partitions_archived,
+            'rows_archived': self.rows_archived,
+            'last_run': self.last_run.isoformat() if self.last_run else None,
+            'archive_days': len(cold_archive.days()),
+        }
+
+
+# instância compartilhada
+cold_archiver = ColdArchiver()
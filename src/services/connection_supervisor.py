@@ -0,0 +1,105 @@
+# src/services/connection_supervisor.py
+import asyncio
+import random
+import time
+from typing import Dict, Any, Optional
+
+# Estados do circuit breaker
+CIRCUIT_CLOSED = 'closed'        # dispositivo saudável, requisições liberadas
+CIRCUIT_OPEN = 'open'            # dispositivo inalcançável, nenhuma requisição até `retry_at`
+CIRCUIT_HALF_OPEN = 'half_open'  # uma tentativa de prova liberada após o backoff
+
+# Limite de tentativas de conexão simultâneas no loop compartilhado, para que a
+# queda de um switch não vire uma tempestade de reconexões.
+MAX_CONCURRENT_CONNECTS = 16
+_connect_slots: Optional[asyncio.Semaphore] = None
+
+
+def connect_slots() -> asyncio.Semaphore:
+    global _connect_slots
+    if _connect_slots is None:
+        _connect_slots = asyncio.Semaphore(MAX_CONCURRENT_CONNECTS)
+    return _connect_slots
+
+
+class ConnectionSupervisor:
+    """
+    Supervisiona a conexão de um dispositivo: backoff exponencial com jitter e
+    circuit breaker.
+
+    Após `failure_threshold` falhas seguidas o circuito abre e o poller deixa de
+    enviar requisições até `retry_at`. Vencido o prazo, uma única tentativa
+    (half-open) é liberada; sucesso fecha o circuito, falha reabre com o dobro
+    do atraso (até `max_delay`).
+    """
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 60.0,
+                 failure_threshold: int = 3, jitter: float = 0.5):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.jitter = jitter
+
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+        self.current_delay = 0.0
+
+        # métricas
+        self.total_failures = 0
+        self.trips = 0
+        self.reconnects = 0
+        self.last_error: Optional[str] = None
+
+    def _backoff(self) -> float:
+        """Atraso exponencial com jitter (fração aleatória de `jitter` para mais ou para menos)"""
+        exponent = max(0, self.consecutive_failures - self.failure_threshold)
+        delay = min(self.max_delay, self.base_delay * (2 ** exponent))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def allow_request(self) -> bool:
+        """Se o poller pode falar com o dispositivo neste ciclo"""
+        if self.state == CIRCUIT_CLOSED:
+            return True
+        if time.monotonic() >= self.retry_at:
+            self.state = CIRCUIT_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> bool:
+        """Registra sucesso; retorna True se o circuito estava aberto (dispositivo voltou)"""
+        recovered = self.state != CIRCUIT_CLOSED
+        if recovered:
+            self.reconnects += 1
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.current_delay = 0.0
+        return recovered
+
+    def record_failure(self, error: Any = None) -> bool:
+        """Registra falha; retorna True se o circuito acabou de abrir"""
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        if error is not None:
+            self.last_error = str(error)
+
+        if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            tripped = self.state == CIRCUIT_CLOSED
+            if tripped:
+                self.trips += 1
+            self.state = CIRCUIT_OPEN
+            self.current_delay = self._backoff()
+            self.retry_at = time.monotonic() + self.current_delay
+            return tripped
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'total_failures': self.total_failures,
+            'trips': self.trips,
+            'reconnects': self.reconnects,
+            'retry_in_s': round(max(0.0, self.retry_at - time.monotonic()), 2) if self.state != CIRCUIT_CLOSED else 0.0,
+            'last_error': self.last_error,
+        }
@@ -0,0 +1,152 @@
+# src/services/current_values.py
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Set
+
+from src.db.partitions import as_utc
+from src.repositories.current_value_repository import CurrentValueRepository, newest_per_register
+from src.repositories.reading_repository import ReadingRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CurrentValueCache:
+    """
+    Valores atuais de todos os registradores em memória (um slot por registrador).
+
+    Carregado de `current_values` na primeira consulta ou em `rebuild` (o
+    PollingService reconstrói ao iniciar); depois o PollingService grava aqui o
+    valor decodificado de cada leitura (`record`), antes da banda morta e da
+    fila de gravação, e o ReadingSink aplica cada lote gravado. Consultar um PLC
+    custa O(registradores do PLC) e a frota inteira O(registradores), sem tocar
+    no banco.
+    """
+
+    def __init__(self):
+        self.repository = CurrentValueRepository()
+        self._values: Dict[int, Dict[str, Any]] = {}  # register_id -> linha
+        self._by_plc: Dict[int, Set[int]] = {}        # plc_id -> register_ids
+        self._plc_of: Dict[int, int] = {}             # register_id -> plc_id
+        self._plc_by_ip: Dict[str, int] = {}          # ip_address -> plc_id
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def rebuild(self):
+        """
+        Reconstrói o cache a partir do banco. Registradores sem linha em
+        `current_values` (dados anteriores à tabela ou gravados fora do caminho
+        de ingestão) são preenchidos com a última leitura do histórico.
+        """
+        missing = self.repository.missing_register_ids()
+        if missing:
+            recovered = ReadingRepository().latest_from_history(missing)
+            if recovered:
+                self.repository.upsert(recovered)
+                logger.info("current_values: %s registradores recuperados do histórico", len(recovered))
+
+        rows = self.repository.get_by_plc()
+        addresses = self.repository.plc_addresses()
+        with self._lock:
+            # leituras registradas pelos pollers antes da carga continuam valendo se forem mais novas
+            recorded = [(self._plc_of[rid], row) for rid, row in self._values.items()]
+            self._values.clear()
+            self._by_plc.clear()
+            self._plc_of.clear()
+            for row in rows:
+                self._store(row['plc_id'], row)
+            for plc_id, row in recorded:
+                self._store_if_newer(plc_id, row)
+            for plc_id, ip in addresses.items():
+                self._plc_by_ip.setdefault(ip, plc_id)
+            self._loaded = True
+        logger.info("Cache de valores atuais carregado: %s registradores", len(rows))
+
+    def ensure_loaded(self):
+        """Carrega do banco se ainda não foi carregado (aquecimento na inicialização)"""
+        if not self._loaded:
+            self.rebuild()
+
+    def _store(self, plc_id: int, row: Dict[str, Any]):
+        register_id = row['register_id']
+        self._values[register_id] = row
+        self._plc_of[register_id] = plc_id
+        self._by_plc.setdefault(plc_id, set()).add(register_id)
+
+    def _store_if_newer(self, plc_id: int, row: Dict[str, Any]):
+        current = self._values.get(row['register_id'])
+        if current is not None and as_utc(row['timestamp']) < as_utc(current['timestamp']):
+            return
+        self._store(plc_id, dict(current or {}, **row))
+
+    def record(self, plc_id: int, readings: List[Dict[str, Any]], registers_by_id: Dict[int, Dict[str, Any]],
+               ip_address: Optional[str] = None):
+        """
+        Valores decodificados de um ciclo de leitura do PLC (chamado pelo
+        PollingService logo após a leitura, antes de qualquer gravação).
+        """
+        with self._lock:
+            if ip_address:
+                self._plc_by_ip.setdefault(ip_address, plc_id)
+            for reading in readings:
+                register = registers_by_id.get(reading['register_id'])
+                if register is None:
+                    continue
+                self._store_if_newer(plc_id, {
+                    'register_id': reading['register_id'],
+                    'timestamp': reading['timestamp'],
+                    'raw_value': reading['raw_value'],
+                    'scaled_value': reading['scaled_value'],
+                    'quality': reading.get('quality'),
+                    'plc_id': plc_id,
+                    'name': register.get('name'),
+                    'unit': register.get('unit'),
+                })
+
+    def update(self, rows: List[Dict[str, Any]]):
+        """Aplica um lote já gravado (chamado pelo ReadingSink após o commit)"""
+        if not self._loaded:
+            return  # o primeiro acesso carrega tudo do banco, já com este lote
+        latest = newest_per_register(rows)
+        unknown = [rid for rid in latest if rid not in self._plc_of]
+        plc_ids = self.repository.plc_ids(unknown) if unknown else {}
+
+        with self._lock:
+            for register_id, row in latest.items():
+                plc_id = self._plc_of.get(register_id, plc_ids.get(register_id))
+                if plc_id is None:
+                    continue  # registrador removido
+                self._store_if_newer(plc_id, row)
+
+    def get(self, register_id: int) -> Optional[Dict[str, Any]]:
+        self.ensure_loaded()
+        return self._values.get(register_id)
+
+    def for_plc(self, plc_id: int) -> List[Dict[str, Any]]:
+        """Valores atuais dos registradores de um PLC"""
+        self.ensure_loaded()
+        with self._lock:
+            return [self._values[rid] for rid in self._by_plc.get(plc_id, ())]
+
+    def fleet(self) -> Dict[int, List[Dict[str, Any]]]:
+        """Valores atuais de todos os PLCs: plc_id -> linhas"""
+        self.ensure_loaded()
+        with self._lock:
+            return {plc_id: [self._values[rid] for rid in rids] for plc_id, rids in self._by_plc.items()}
+
+    def plc_for_ip(self, ip_address: str) -> Optional[int]:
+        """PLC com esse IP (o primeiro conhecido, se um gateway atende vários)"""
+        self.ensure_loaded()
+        return self._plc_by_ip.get(ip_address)
+
+    def forget_plc(self, plc_id: int):
+        """Remove do cache os registradores de um PLC (ex.: PLC excluído)"""
+        with self._lock:
+            for register_id in self._by_plc.pop(plc_id, set()):
+                self._values.pop(register_id, None)
+                self._plc_of.pop(register_id, None)
+            for ip in [ip for ip, pid in self._plc_by_ip.items() if pid == plc_id]:
+                del self._plc_by_ip[ip]
+
+
+# cache compartilhado do processo
+current_values = CurrentValueCache()
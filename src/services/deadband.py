@@ -0,0 +1,76 @@
+# src/services/deadband.py
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+DEADBAND_ABSOLUTE = 'absolute'
+DEADBAND_PERCENT = 'percent'
+
+
+class DeadbandFilter:
+    """
+    Decide em memória quais leituras vão para o banco (report by exception).
+
+    Uma leitura é gravada quando:
+      - é a primeira do registrador ou a qualidade mudou;
+      - o valor saiu da banda morta em relação ao último valor gravado
+        (absoluta, ou percentual sobre o último valor gravado);
+      - passou `heartbeat_interval` ms desde a última gravação.
+    Registradores sem banda morta e sem heartbeat gravam todas as leituras.
+    """
+
+    def __init__(self):
+        # register_id -> (valor escalado, qualidade, instante monotônico) da última gravação
+        self._last: Dict[int, Tuple[Any, Optional[str], float]] = {}
+        self._lock = threading.Lock()
+        self.stored = 0
+        self.suppressed = 0
+
+    def reset(self, register_id: Optional[int] = None):
+        with self._lock:
+            if register_id is None:
+                self._last.clear()
+            else:
+                self._last.pop(register_id, None)
+
+    def should_store(self, register: Dict[str, Any], value: Any, quality: Optional[str],
+                     now: Optional[float] = None) -> bool:
+        deadband = register.get('deadband')
+        heartbeat = register.get('heartbeat_interval')
+        if not deadband and not heartbeat:
+            return True
+
+        now = time.monotonic() if now is None else now
+        last = self._last.get(register['id'])
+        if last is None:
+            return True
+        last_value, last_quality, last_time = last
+
+        if quality != last_quality:
+            return True
+        if heartbeat and (now - last_time) * 1000.0 >= heartbeat:
+            return True
+        if not deadband:
+            return value != last_value
+
+        delta = abs(value - last_value)
+        if register.get('deadband_mode') == DEADBAND_PERCENT:
+            return delta > abs(last_value) * deadband / 100.0
+        return delta > deadband
+
+    def filter(self, rows: List[Dict[str, Any]], registers_by_id: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Mantém apenas as linhas que devem ser gravadas e atualiza o último valor gravado"""
+        now = time.monotonic()
+        kept = []
+        with self._lock:
+            for row in rows:
+                register = registers_by_id[row['register_id']]
+                if self.should_store(register, row['scaled_value'], row.get('quality'), now):
+                    self._last[row['register_id']] = (row['scaled_value'], row.get('quality'), now)
+                    kept.append(row)
+        self.stored += len(kept)
+        self.suppressed += len(rows) - len(kept)
+        return kept
+
+    def stats(self) -> Dict[str, int]:
+        return {'stored': self.stored, 'suppressed': self.suppressed}
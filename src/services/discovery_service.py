@@ -7,6 +7,8 @@ import ipaddress
 
 from src.utils.network.discovery import run_enhanced_discovery
 from src.models.PLC import PLC
+from src.repositories.plc_repository import PLCRepository
+from src.services.plc_service import CLPService
 from src.db import db
 
 logger = logging.getLogger(__name__)
@@ -309,27 +311,9 @@ class AutoDiscoveryService:
         return protocol_map.get(detected_protocol.lower(), 'modbus_tcp')
     
     def get_discovered_plcs_summary(self) -> List[Dict[str, Any]]:
-        """Retorna resumo dos PLCs descobertos automaticamente"""
+        """Retorna resumo dos PLCs descobertos automaticamente (uma consulta agrupada)"""
         try:
-            auto_plcs = db.session.query(PLC).filter_by(manual=False).all()
-            
-            summary = []
-            for plc in auto_plcs:
-                summary.append({
-                    'id': plc.id,
-                    'name': plc.name,
-                    'ip_address': plc.ip_address,
-                    'mac': plc.mac,
-                    'tipo': plc.tipo,
-                    'protocol': plc.protocol,
-                    'portas': plc.portas,
-                    'is_active': plc.is_active,
-                    'is_online': plc.is_online,
-                    'last_connection': plc.last_connection.isoformat() if plc.last_connection else None,
-                    'created_at': plc.created_at.isoformat() if plc.created_at else None
-                })
-            
-            return summary
+            return [CLPService.resumo_clp(row) for row in PLCRepository().list_summaries(manual=False)]
             
         except Exception as e:
             logger.error(f"Erro ao obter resumo dos PLCs descobertos: {e}")
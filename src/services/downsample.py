@@ -0,0 +1,66 @@
+# src/services/downsample.py
+import numpy as np
+
+LTTB = 'lttb'
+MINMAX = 'minmax'
+METHODS = (LTTB, MINMAX)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: índices de `threshold` pontos que preservam
+    o formato da série. O primeiro e o último ponto sempre ficam; de cada bucket
+    intermediário fica o ponto que forma o maior triângulo com o ponto escolhido
+    no bucket anterior e a média do bucket seguinte. `x` deve estar ordenado.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    # bucket i = [bounds[i], bounds[i + 1]); o último "bucket seguinte" é o último ponto
+    bounds = np.append((np.arange(threshold - 1) * every).astype(np.int64) + 1, n)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end, next_end = bounds[i], bounds[i + 1], bounds[i + 2]
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(x: np.ndarray, y: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    Mínimo e máximo de cada uma de `buckets` faixas de tempo de mesma largura
+    (um "pixel" do gráfico), em ordem de tempo. Picos nunca somem, ao custo de
+    até 2 pontos por faixa. `x` deve estar ordenado.
+    """
+    n = len(x)
+    if buckets < 1 or n <= 2 * buckets:
+        return np.arange(n)
+
+    span = x[-1] - x[0]
+    if span <= 0:
+        bucket_ids = np.zeros(n, dtype=np.int64)
+    else:
+        bucket_ids = np.minimum(((x - x[0]) * (buckets / span)).astype(np.int64), buckets - 1)
+    # dentro de cada faixa, ordena por valor: o primeiro é o mínimo e o último o máximo
+    order = np.lexsort((y, bucket_ids))
+    firsts = np.flatnonzero(np.diff(bucket_ids[order], prepend=-1))
+    lasts = np.append(firsts[1:], n) - 1
+    return np.unique(np.concatenate((order[firsts], order[lasts])))
+
+
+def downsample(x: np.ndarray, y: np.ndarray, points: int, method: str = LTTB) -> np.ndarray:
+    """Índices dos pontos que ficam ao reduzir a série para ~`points` pontos"""
+    if method == MINMAX:
+        return minmax(x, y, max(1, points // 2))
+    if method == LTTB:
+        return lttb(x, y, points)
+    raise ValueError(f"Método de redução desconhecido: {method}")
@@ -0,0 +1,72 @@
+# src/services/export_service.py
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Dict, Iterator, List, Any
+
+from src.services.reading_backend import ReadingBackend
+from src.services.reading_sink import reading_sink
+
+EXPORT_COLUMNS = ('register_id', 'timestamp', 'raw_value', 'scaled_value', 'quality')
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+# linhas por pedaço enviado ao cliente
+FLUSH_ROWS = 1000
+
+
+class ExportService:
+    """
+    Exportação do histórico em streaming (CSV ou NDJSON).
+
+    As linhas vêm de `iter_history` do backend de leituras (o mesmo em que o
+    ReadingSink grava; no SQL, keyset em ordem crescente por registrador) e são
+    serializadas em pedaços de FLUSH_ROWS linhas, então a memória não cresce
+    com o tamanho do intervalo.
+    """
+
+    def __init__(self, backend: ReadingBackend = None):
+        self.backend = backend or reading_sink.backend
+
+    def iter_rows(self, register_ids: List[int], start_time: datetime, end_time: datetime) -> Iterator[Dict[str, Any]]:
+        for register_id in register_ids:
+            yield from self.backend.iter_history(register_id, start_time, end_time)
+
+    def stream(self, fmt: str, register_ids: List[int], start_time: datetime, end_time: datetime) -> Iterator[str]:
+        rows = self.iter_rows(register_ids, start_time, end_time)
+        if fmt == 'csv':
+            return self._csv(rows)
+        return self._ndjson(rows)
+
+    @staticmethod
+    def _csv(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        count = 0
+        for row in rows:
+            writer.writerow((row['register_id'], row['timestamp'].isoformat(), row['raw_value'],
+                             row['scaled_value'], row['quality']))
+            count += 1
+            if count % FLUSH_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    @staticmethod
+    def _ndjson(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+        chunk = []
+        for row in rows:
+            chunk.append(json.dumps({
+                'register_id': row['register_id'],
+                'timestamp': row['timestamp'].isoformat(),
+                'raw_value': row['raw_value'],
+                'scaled_value': row['scaled_value'],
+                'quality': row['quality'],
+            }))
+            if len(chunk) >= FLUSH_ROWS:
+                yield '\n'.join(chunk) + '\n'
+                chunk = []
+        if chunk:
+            yield '\n'.join(chunk) + '\n'
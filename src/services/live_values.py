@@ -0,0 +1,156 @@
+# src/services/live_values.py
+import json
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Iterator, Optional
+
+from src.db.partitions import as_utc
+from src.services.current_values import current_values
+
+# segundos sem mudança até mandar um comentário de keepalive no stream
+KEEPALIVE_S = 15.0
+
+
+def _event_value(reading: Dict[str, Any], register: Dict[str, Any]) -> Dict[str, Any]:
+    ts = reading.get('timestamp')
+    return {
+        'register_id': reading['register_id'],
+        'name': register.get('name'),
+        'unit': register.get('unit'),
+        'value': reading['scaled_value'],
+        'quality': reading.get('quality'),
+        'timestamp': as_utc(ts).isoformat() if isinstance(ts, datetime) else ts,
+    }
+
+
+class LiveSubscription:
+    """
+    Uma conexão de stream de um PLC. As mudanças ficam em um dict por registrador
+    (só o valor mais novo de cada um), então um cliente lento recebe o estado
+    atual agrupado em vez de acumular uma fila sem limite.
+    """
+
+    def __init__(self, plc_id: int):
+        self.plc_id = plc_id
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._cond = threading.Condition()
+
+    def offer(self, changes: Dict[int, Dict[str, Any]]):
+        with self._cond:
+            self._pending.update(changes)
+            self._cond.notify()
+
+    def wait(self, timeout: float) -> Dict[int, Dict[str, Any]]:
+        """Bloqueia até haver mudanças (ou `timeout`) e as entrega, esvaziando o pendente"""
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            changes, self._pending = self._pending, {}
+        return changes
+
+
+class LiveValueBroadcaster:
+    """
+    Difusão em processo dos valores lidos pelos pollers.
+
+    `PollingService` chama `publish` a cada leitura; só registradores cujo valor
+    ou qualidade mudou desde a última publicação seguem para os assinantes do
+    PLC. O custo por ciclo é uma comparação por registrador e uma entrega por
+    assinante, sem consultas ao banco, qualquer que seja o número de telas abertas.
+
+    `seed(plc_id)` devolve os valores atuais do PLC (linhas de `current_values`)
+    e completa o estado inicial dos registradores que ainda não foram publicados
+    desde a inicialização do processo.
+    """
+
+    def __init__(self, seed: Optional[Callable[[int], List[Dict[str, Any]]]] = None):
+        self.seed = seed
+        self._last: Dict[int, Dict[int, Dict[str, Any]]] = {}  # plc_id -> register_id -> valor
+        self._subscribers: Dict[int, List[LiveSubscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def publish(self, plc_id: int, readings: List[Dict[str, Any]], registers_by_id: Dict[int, Dict[str, Any]]):
+        """Registra as leituras de um ciclo e entrega as que mudaram aos assinantes do PLC"""
+        changes: Dict[int, Dict[str, Any]] = {}
+        with self._lock:
+            last = self._last.setdefault(plc_id, {})
+            for reading in readings:
+                register = registers_by_id.get(reading['register_id'])
+                if register is None:
+                    continue
+                previous = last.get(reading['register_id'])
+                if (previous is not None and previous['value'] == reading['scaled_value']
+                        and previous['quality'] == reading.get('quality')):
+                    continue
+                value = _event_value(reading, register)
+                last[reading['register_id']] = value
+                changes[reading['register_id']] = value
+            subscribers = list(self._subscribers.get(plc_id, ()))
+        if not changes:
+            return
+        self.published += len(changes)
+        for subscription in subscribers:
+            subscription.offer(changes)
+
+    def snapshot(self, plc_id: int) -> List[Dict[str, Any]]:
+        """Último valor publicado de cada registrador do PLC (ou o de `seed`, se nunca publicado)"""
+        rows = self.seed(plc_id) if self.seed else []
+        with self._lock:
+            last = self._last.get(plc_id, {})
+            if rows:
+                last = self._last.setdefault(plc_id, last)
+                for row in rows:
+                    if row['register_id'] not in last:
+                        last[row['register_id']] = _event_value(row, row)
+            return list(last.values())
+
+    def forget_plc(self, plc_id: int):
+        with self._lock:
+            self._last.pop(plc_id, None)
+
+    def subscribe(self, plc_id: int) -> LiveSubscription:
+        subscription = LiveSubscription(plc_id)
+        with self._lock:
+            self._subscribers.setdefault(plc_id, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LiveSubscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.plc_id, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.plc_id, None)
+
+    def stream(self, plc_id: int, keepalive: float = KEEPALIVE_S) -> Iterator[str]:
+        """
+        Gerador Server-Sent Events: primeiro o estado atual do PLC, depois só as
+        mudanças. Cada evento `data:` é um JSON {"registers": [...]}.
+        """
+        subscription = self.subscribe(plc_id)
+        try:
+            yield self._event(self.snapshot(plc_id))
+            while True:
+                changes = subscription.wait(keepalive)
+                if not changes:
+                    yield ": keepalive\n\n"
+                    continue
+                yield self._event(list(changes.values()))
+        finally:
+            self.unsubscribe(subscription)
+
+    @staticmethod
+    def _event(values: List[Dict[str, Any]]) -> str:
+        return f"data: {json.dumps({'registers': values}, default=str)}\n\n"
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'subscribers': sum(len(s) for s in self._subscribers.values()),
+                'published': self.published,
+            }
+
+
+# difusão compartilhada do processo (pollers publicam, rotas de stream assinam)
+live_values = LiveValueBroadcaster(current_values.for_plc)
@@ -1,9 +1,10 @@
 # src/services/clp_service.py
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 from src.repositories.plc_repository import PLCRepository
 from src.models.PLC import PLC # Importar o modelo para type hinting
+from src.db.partitions import as_utc
 
 repository = PLCRepository()
 
@@ -20,10 +21,34 @@ class CLPService:
 
     @staticmethod
     def buscar_todos_clps() -> List[Dict[str, Any]]:
-        """Busca todos os CLPs e retorna uma lista de dicionários."""
-        clps_orm = repository.get_all()
-        # Garante que a lista retornada seja de dicionários
-        return [CLPService._serialize_clp(clp) for clp in clps_orm]
+        """Busca todos os CLPs (só as colunas da listagem) e retorna uma lista de dicionários."""
+        linhas, _ = repository.search(None, limit=None)
+        return [CLPService._serialize_clp(linha) for linha in linhas]
+
+    @staticmethod
+    def listar_resumos(manual: Optional[bool] = None, ativo: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """CLPs com contagem de registradores e estado das últimas leituras, em uma consulta."""
+        return [CLPService.resumo_clp(linha) for linha in repository.list_summaries(manual=manual, active=ativo)]
+
+    @staticmethod
+    def resumo_clp(linha) -> Dict[str, Any]:
+        """Linha de PLCRepository.list_summaries -> dicionário no formato de PLC.to_dict com os agregados."""
+        resumo = PLC.summary_dict(linha, linha.register_count)
+        resumo.update({
+            'active_register_count': linha.active_register_count,
+            'bad_register_count': linha.bad_register_count,
+            'last_reading_at': as_utc(linha.last_reading_at).isoformat() if linha.last_reading_at else None,
+            'last_connection': as_utc(linha.last_connection).isoformat() if linha.last_connection else None,
+            'created_at': linha.created_at.isoformat() if linha.created_at else None,
+        })
+        return resumo
+
+    @staticmethod
+    def buscar_pagina(termo: Optional[str], pagina: int, por_pagina: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Uma página de CLPs filtrada e paginada no banco; retorna (dicionários, total)."""
+        pagina = max(1, pagina)
+        linhas, total = repository.search(termo, limit=por_pagina, offset=(pagina - 1) * por_pagina)
+        return [CLPService._serialize_clp(linha) for linha in linhas], total
 
     @staticmethod
     def buscar_clp_por_ip(ip: str) -> Optional[Dict[str, Any]]:
@@ -79,7 +104,7 @@ class CLPService:
 
     @staticmethod
     def _serialize_clp(clp: PLC) -> Dict[str, Any]:
-        """Converte um objeto CLP ORM para um dicionário com as chaves corretas para o template."""
+        """Converte um CLP (objeto ORM ou linha com as mesmas colunas) para um dicionário com as chaves corretas para o template."""
         # CORREÇÃO: Usar os nomes de atributos que existem no seu modelo PLC
         return {
             "id": clp.id,
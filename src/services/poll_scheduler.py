@@ -0,0 +1,103 @@
+# src/services/poll_scheduler.py
+import asyncio
+import math
+import time
+from typing import Dict, Any
+
+# Políticas quando um ciclo passa do prazo
+OVERRUN_SKIP = 'skip'    # descarta os ticks perdidos e espera o próximo tick da grade
+OVERRUN_MERGE = 'merge'  # junta os ticks perdidos em uma única leitura imediata
+
+
+class FixedRateScheduler:
+    """
+    Agenda ciclos em ticks fixos, alinhados a uma grade de relógio de parede
+    (múltiplos de `period` + `phase`), independente de quanto o ciclo demorou.
+
+    O prazo de cada tick é calculado a partir da grade e não do fim do ciclo
+    anterior, então o período real não acumula o tempo de leitura/gravação.
+    A espera usa o relógio monotônico; o relógio de parede só define a fase.
+    """
+
+    def __init__(self, period: float, phase: float = 0.0, overrun_policy: str = OVERRUN_SKIP):
+        if period <= 0:
+            raise ValueError("period deve ser positivo")
+        self.period = period
+        self.phase = phase
+        self.overrun_policy = overrun_policy
+
+        # diferença entre relógio de parede e monotônico, medida uma vez
+        self._wall_offset = time.time() - time.monotonic()
+        self._deadline = self._next_grid_tick(time.monotonic())
+
+        # métricas
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.last_jitter = 0.0
+        self.max_jitter = 0.0
+        self._jitter_total = 0.0
+
+    def _next_grid_tick(self, now: float) -> float:
+        """Próximo tick da grade (em tempo monotônico) estritamente depois de `now`"""
+        wall = now + self._wall_offset - self.phase
+        k = math.floor(wall / self.period) + 1
+        return k * self.period + self.phase - self._wall_offset
+
+    def set_period(self, period: float, phase: float = None):
+        """Altera o período (ex.: plano de leitura mudou) e realinha na nova grade"""
+        if phase is not None:
+            self.phase = phase
+        if period == self.period and phase is None:
+            return
+        self.period = period
+        self._deadline = self._next_grid_tick(time.monotonic())
+
+    @property
+    def deadline_wall(self) -> float:
+        """Instante (epoch) do tick atual na grade"""
+        return self._deadline + self._wall_offset
+
+    async def wait_next(self) -> float:
+        """
+        Dorme até o próximo tick e retorna o instante nominal (epoch) dele.
+        Deve ser chamado uma vez por ciclo.
+        """
+        now = time.monotonic()
+        if now > self._deadline:
+            # o ciclo anterior terminou depois do tick seguinte
+            self.overruns += 1
+            missed = math.floor((now - self._deadline) / self.period)
+            if self.overrun_policy == OVERRUN_MERGE:
+                # uma única leitura imediata no lugar de todos os ticks perdidos
+                self.skipped_ticks += missed
+                self._deadline += missed * self.period
+            else:
+                self.skipped_ticks += missed + 1
+                self._deadline = self._next_grid_tick(now)
+
+        delay = self._deadline - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        fired = time.monotonic()
+        jitter = max(0.0, fired - self._deadline)
+        self.ticks += 1
+        self.last_jitter = jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        self._jitter_total += jitter
+
+        nominal = self.deadline_wall
+        self._deadline += self.period
+        return nominal
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'period_ms': round(self.period * 1000, 3),
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'skipped_ticks': self.skipped_ticks,
+            'last_jitter_ms': round(self.last_jitter * 1000, 3),
+            'avg_jitter_ms': round(self._jitter_total / self.ticks * 1000, 3) if self.ticks else 0.0,
+            'max_jitter_ms': round(self.max_jitter * 1000, 3),
+        }
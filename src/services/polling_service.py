@@ -1,9 +1,14 @@
 import asyncio
-from typing import Dict, List
+from typing import Dict, List, Optional, FrozenSet
 from src.models.PLC import PLC
-from src.models.Registers import Register
-from src.models.Reading import Reading
 from src.adapters.modbus_adapter import ModbusAdapter
+from src.services.read_plan_cache import read_plan_cache, PLCReadPlan
+from src.services.reading_sink import reading_sink, ReadingSink
+from src.services.current_values import current_values
+from src.services.live_values import live_values
+from src.services.poll_scheduler import FixedRateScheduler
+from src.services.deadband import DeadbandFilter
+from src.services.connection_supervisor import ConnectionSupervisor, connect_slots, CIRCUIT_OPEN
 from src.db import db
 import logging
 from src.utils.async_runner import async_loop
@@ -12,13 +17,19 @@ from flask import Flask
 logger = logging.getLogger(__name__)
 
 class PollingService:
-    def __init__(self, app: Flask = None):
+    def __init__(self, app: Flask = None, sink: ReadingSink = None):
         """
         Recebe optionalmente a app para usar app_context.
+        As leituras são entregues ao `sink` (por padrão o ReadingSink compartilhado).
         """
         self.app = app
+        self.sink = sink or reading_sink
         self.polling_tasks: Dict[int, asyncio.Future] = {}
         self.adapters: Dict[int, ModbusAdapter] = {}
+        self.schedulers: Dict[int, FixedRateScheduler] = {}
+        self.supervisors: Dict[int, ConnectionSupervisor] = {}
+        # decide em memória o que vai para o banco (banda morta / heartbeat por registrador)
+        self.deadband = DeadbandFilter()
         self.running = False
 
     def init_app(self, app: Flask):
@@ -30,6 +41,17 @@ class PollingService:
             return
 
         self.running = True
+        if not self.sink.app:
+            self.sink.init_app(self.app)
+
+        # valores atuais vêm do banco antes da primeira leitura dos PLCs
+        if self.sink.backend.persistent:
+            try:
+                await asyncio.to_thread(current_values.ensure_loaded)
+            except Exception as e:
+                logger.exception(f"Erro reconstruindo o cache de valores atuais: {e}")
+
+        await self.sink.start()
         logger.info("Sistema de polling iniciado")
 
         def _get_active_plcs():
@@ -41,6 +63,14 @@ class PollingService:
         for plc in active_plcs:
             await self.start_plc_polling(plc.id)
 
+    async def stop_polling(self):
+        """Para todos os pollers e grava as leituras pendentes no sink"""
+        self.running = False
+        for plc_id in list(self.polling_tasks.keys()):
+            await self.stop_plc_polling(plc_id)
+        await self.sink.stop()
+        logger.info("Sistema de polling parado")
+
     async def start_plc_polling(self, plc_id: int):
         """Inicia polling para um PLC específico (recebe plc_id para evitar passar ORM entre threads)"""
         logger.info("Chamado start_plc_polling para PLC id=%s", plc_id)
@@ -48,30 +78,21 @@ class PollingService:
             logger.info("Polling já está ativo para PLC id=%s", plc_id)
             return
 
-        # busca o objeto PLC dentro do app_context (thread-safe)
-        def _get_plc():
-            with self.app.app_context():
-                return db.session.get(PLC, plc_id)
-
-        plc = await asyncio.to_thread(_get_plc)
-        if not plc:
+        plan = await self._get_read_plan(plc_id)
+        if not plan:
             logger.error("PLC id=%s não encontrado no DB", plc_id)
             return
 
         try:
             logger.info("Criando adapter para PLC id=%s (ip=%s port=%s unit=%s)",
-                        plc_id, plc.ip_address, plc.portas, getattr(plc, "unit_id", None))
-            adapter = ModbusAdapter(
-                ip_address=plc.ip_address,
-                port=int(plc.portas[0]),
-                timeout=plc.timeout
-            )
+                        plc_id, plan.ip_address, plan.port, plan.unit_id)
+            adapter = self._create_adapter(plan)
             self.adapters[plc_id] = adapter
 
             # Agenda a tarefa de polling no loop global (async_loop importado no módulo)
             future = async_loop.run_coro(self._poll_plc_loop(plc_id, adapter))
             self.polling_tasks[plc_id] = future
-            logger.info("Polling iniciado para PLC %s (%s) -> future=%s", plc.name, plc.ip_address, future)
+            logger.info("Polling iniciado para PLC %s (%s) -> future=%s", plan.name, plan.ip_address, future)
 
         except Exception as e:
             logger.exception("Erro ao iniciar polling para PLC id=%s: %s", plc_id, e)
@@ -81,6 +102,7 @@ class PollingService:
             fut = self.polling_tasks[plc_id]
             fut.cancel()
             del self.polling_tasks[plc_id]
+        self.schedulers.pop(plc_id, None)
 
         if plc_id in self.adapters:
             try:
@@ -90,99 +112,194 @@ class PollingService:
             finally:
                 del self.adapters[plc_id]
 
-    async def _poll_plc_loop(self, plc_id: int, adapter: ModbusAdapter):
-        logger.info(f"Leitura iniciada para PLC id={plc_id}")
+    def scan_stats(self) -> Dict[int, Dict]:
+        """Jitter, overruns e ticks perdidos de cada PLC, com o estado da conexão"""
+        stats = {}
+        for plc_id, sched in list(self.schedulers.items()):
+            stats[plc_id] = sched.stats()
+            supervisor = self.supervisors.get(plc_id)
+            if supervisor:
+                stats[plc_id]['connection'] = supervisor.stats()
+        return stats
+
+    @staticmethod
+    def _create_adapter(plan: PLCReadPlan) -> ModbusAdapter:
+        return ModbusAdapter(
+            ip_address=plan.ip_address,
+            port=plan.port,
+            unit_id=plan.unit_id,
+            timeout=plan.timeout,
+            max_in_flight=plan.pipeline_window
+        )
+
+    async def _refresh_adapter(self, plc_id: int, adapter: ModbusAdapter, plan: PLCReadPlan) -> ModbusAdapter:
+        """
+        Adapter para o plano atual: se ip, porta, unit id, timeout ou janela de
+        pipelining mudaram, fecha o adapter antigo e cria outro (a conexão é
+        reaberta no próximo ciclo).
+        """
+        current = (adapter.ip_address, adapter.port, adapter.unit_id, adapter.timeout, adapter.max_in_flight)
+        wanted = (plan.ip_address, plan.port, plan.unit_id, plan.timeout, plan.pipeline_window)
+        if current == wanted:
+            return adapter
+        logger.info("Conexão do PLC id=%s mudou (%s -> %s), recriando adapter", plc_id, current, wanted)
+        try:
+            await adapter.disconnect()
+        except Exception:
+            logger.exception("Erro ao desconectar adapter antigo")
+        adapter = self._create_adapter(plan)
+        self.adapters[plc_id] = adapter
+        return adapter
+
+    async def _get_read_plan(self, plc_id: int) -> Optional[PLCReadPlan]:
+        """Plano de leitura do PLC; só vai ao banco quando a configuração mudou"""
+        plan = read_plan_cache.get(plc_id)
+        if plan is not None:
+            return plan
+
+        def _build():
+            with self.app.app_context():
+                return read_plan_cache.build(plc_id)
 
-        def _get_plc():
+        return await asyncio.to_thread(_build)
+
+    async def _set_online(self, plc_id: int, value: bool):
+        def _update():
             with self.app.app_context():
-                return db.session.get(PLC, plc_id)
+                p = db.session.get(PLC, plc_id)
+                if p:
+                    p.is_online = value
+                    db.session.commit()
+
+        await asyncio.to_thread(_update)
+
+    async def _poll_plc_loop(self, plc_id: int, adapter: ModbusAdapter):
+        logger.info(f"Leitura iniciada para PLC id={plc_id}")
 
-        plc = await asyncio.to_thread(_get_plc)
-        if not plc:
+        plan = await self._get_read_plan(plc_id)
+        if not plan:
             logger.error(f"PLC id={plc_id} removido antes do polling iniciar")
             return
 
-        try:
-            ok = await adapter.connect()
-            if not ok:
-                logger.error(f"Falha ao conectar PLC {plc.name}")
-                return
+        # backoff/circuit breaker: PLC fora do ar não recebe requisições e a
+        # reconexão acontece dentro deste mesmo loop, sem recriar a tarefa
+        supervisor = ConnectionSupervisor()
+        self.supervisors[plc_id] = supervisor
+        online = False
 
-            def _set_online(value: bool):
-                with self.app.app_context():
-                    p = db.session.get(PLC, plc_id)
-                    if p:
-                        p.is_online = value
-                        db.session.commit()
-
-            await asyncio.to_thread(_set_online, True)
+        try:
+            # ciclos em ticks fixos: o tempo de leitura não se soma ao período.
+            # O tick é a base comum das classes de varredura do PLC.
+            scheduler = FixedRateScheduler(plan.base_interval, self._scan_phase(plc_id, plan.base_interval))
+            self.schedulers[plc_id] = scheduler
+            next_due: Dict[int, int] = {}  # classe (ms) -> próximo instante (epoch ms) em que vence
 
             while self.running:
                 try:
-                    def _get_registers():
-                        with self.app.app_context():
-                            return db.session.query(Register).filter(
-                                Register.plc_id == plc_id,
-                                Register.is_active == True
-                            ).all()
-
-                    registers = await asyncio.to_thread(_get_registers)
-
-                    if not registers:
-                        plc = await asyncio.to_thread(_get_plc)
-                        await asyncio.sleep((plc.polling_interval / 1000.0) if plc else 1.0)
-                        continue
+                    tick = await scheduler.wait_next()
+
+                    plan = await self._get_read_plan(plc_id)
+                    if not plan:
+                        logger.info(f"PLC id={plc_id} removido, encerrando polling")
+                        break
+                    if plan.base_interval != scheduler.period:
+                        scheduler.set_period(plan.base_interval, self._scan_phase(plc_id, plan.base_interval))
+                    adapter = await self._refresh_adapter(plc_id, adapter, plan)
 
-                    reg_data = [reg.to_dict() for reg in registers]
-                    readings_data = await adapter.read_registers(reg_data)
-                    await self._save_readings(readings_data, registers)
+                    if not supervisor.allow_request():
+                        continue
 
-                    plc = await asyncio.to_thread(_get_plc)
-                    await asyncio.sleep((plc.polling_interval / 1000.0) if plc else 1.0)
+                    if not adapter.is_connected():
+                        async with connect_slots():
+                            connected = await adapter.connect()
+                        if not connected:
+                            raise ConnectionError(f"Falha ao conectar PLC {plan.name}")
+
+                    due = self._due_scan_classes(plan, next_due, tick)
+                    if due:
+                        blocks = plan.blocks_for(due)
+                        readings_data = await adapter.read_blocks(blocks)
+                        if readings_data and all(r['quality'] == 'bad' for r in readings_data):
+                            raise ConnectionError(f"PLC {plan.name} não respondeu a nenhum bloco")
+                        current_values.record(plc_id, readings_data, plan.registers_by_id, plan.ip_address)
+                        await self._save_readings(readings_data, plan.registers_by_id)
+                        live_values.publish(plc_id, readings_data, plan.registers_by_id)
+
+                    if supervisor.record_success():
+                        logger.info(f"PLC id={plc_id} voltou a responder")
+                    if not online:
+                        online = True
+                        await self._set_online(plc_id, True)
 
                 except asyncio.CancelledError:
                     logger.info(f"Polling cancelado internamente para PLC id={plc_id}")
                     raise
                 except Exception as e:
-                    logger.exception(f"Erro no polling do PLC id={plc_id}: {e}")
-                    await asyncio.sleep(5)
+                    if supervisor.record_failure(e):
+                        logger.warning(f"PLC id={plc_id} inalcançável, circuito aberto: {e}")
+                    else:
+                        logger.debug(f"Falha no polling do PLC id={plc_id}: {e}")
+                    if online and supervisor.state == CIRCUIT_OPEN:
+                        online = False
+                        await self._set_online(plc_id, False)
 
         except asyncio.CancelledError:
             logger.info(f"Polling cancelado para PLC id={plc_id}")
         finally:
-            def _set_offline():
-                with self.app.app_context():
-                    p = db.session.get(PLC, plc_id)
-                    if p:
-                        p.is_online = False
-                        db.session.commit()
-
-            await asyncio.to_thread(_set_offline)
+            self.supervisors.pop(plc_id, None)
+            await self._set_online(plc_id, False)
             try:
                 await adapter.disconnect()
             except Exception:
                 logger.exception("Erro ao desconectar adapter no finally")
 
-    async def _save_readings(self, readings_data: List[Dict], registers: List[Register]):
-        def _save():
-            with self.app.app_context():
-                readings_to_add = []
-                for reading_data in readings_data:
-                    register = next((r for r in registers if r.id == reading_data['register_id']), None)
-                    if not register:
-                        continue
-                    raw_value = reading_data['raw_value']
-                    scaled_value = (raw_value * register.scale_factor) + register.offset
-                    reading = Reading(
-                        register_id=register.id,
-                        raw_value=raw_value,
-                        scaled_value=scaled_value,
-                        quality=reading_data.get('quality')
-                    )
-                    readings_to_add.append(reading)
-
-                if readings_to_add:
-                    db.session.add_all(readings_to_add)
-                    db.session.commit()
+    @staticmethod
+    def _scan_phase(plc_id: int, period: float) -> float:
+        """
+        Fase do tick do PLC dentro do período, derivada do id (sequência de
+        Weyl com a razão áurea): PLCs com o mesmo período ficam espalhados pelo
+        ciclo em vez de lerem todos no mesmo instante.
+        """
+        return (plc_id * 0.6180339887498949) % 1.0 * period
 
-        await asyncio.to_thread(_save)
+    @staticmethod
+    def _due_scan_classes(plan: PLCReadPlan, next_due: Dict[int, int], tick: float) -> FrozenSet[int]:
+        """
+        Classes de varredura que vencem neste tick. Cada classe fica alinhada à sua
+        própria grade (múltiplos do período); se um tick foi pulado, a classe lê no
+        tick seguinte em vez de esperar o próximo múltiplo.
+        """
+        now_ms = round(tick * 1000)
+        due = []
+        for period in plan.scan_classes:
+            if now_ms >= next_due.get(period, 0):
+                due.append(period)
+                next_due[period] = (now_ms // period + 1) * period
+        return frozenset(due)
+
+    async def _save_readings(self, readings_data: List[Dict], registers_by_id: Dict[int, Dict]):
+        """
+        Entrega as leituras (já decodificadas e escaladas pelo adapter) ao sink,
+        com o instante de aquisição de cada bloco, para que lotes gravados com
+        atraso mantenham o horário da leitura e não o do commit.
+        """
+        rows = []
+        for reading_data in readings_data:
+            if reading_data['register_id'] not in registers_by_id:
+                continue
+            raw_value = reading_data['raw_value']
+            if isinstance(raw_value, str):
+                # registradores texto não cabem nas colunas numéricas de readings
+                continue
+            rows.append({
+                'register_id': reading_data['register_id'],
+                'timestamp': reading_data['timestamp'],
+                'raw_value': raw_value,
+                'scaled_value': reading_data['scaled_value'],
+                'quality': reading_data.get('quality')
+            })
+        self.sink.push(self.deadband.filter(rows, registers_by_id))
+
+
+# instância compartilhada (run.py chama init_app)
+polling_service = PollingService()
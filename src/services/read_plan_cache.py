@@ -0,0 +1,185 @@
+# src/services/read_plan_cache.py
+import logging
+import math
+import threading
+from typing import Dict, List, Optional, Any, FrozenSet
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from src.adapters.read_planner import plan_reads, ReadBlock, DEFAULT_MAX_GAP
+from src.models.PLC import PLC
+from src.models.Registers import Register
+from src.db import db
+
+logger = logging.getLogger(__name__)
+
+
+class PLCReadPlan:
+    """Configuração de leitura de um PLC já compilada (sem objetos ORM)"""
+
+    def __init__(self, plc: PLC, registers: List[Register], version: int, max_gap: int):
+        self.plc_id = plc.id
+        self.version = version
+        self.name = plc.name
+        self.ip_address = plc.ip_address
+        self.port = int(plc.portas[0]) if plc.portas else 502
+        self.unit_id = plc.unit_id or 1
+        # polling_interval e timeout ficam em ms no banco
+        self.polling_interval = (plc.polling_interval or 1000) / 1000.0
+        self.timeout = (plc.timeout or 3000) / 1000.0
+        self.pipeline_window = plc.pipeline_window or 1
+
+        self.max_gap = max_gap
+
+        self.registers: List[Dict[str, Any]] = [reg.to_dict() for reg in registers]
+        self.registers_by_id: Dict[int, Dict[str, Any]] = {r['id']: r for r in self.registers}
+        self.blocks: List[ReadBlock] = plan_reads(self.registers, self.unit_id, max_gap)
+
+        # Classes de varredura: período (ms) -> registradores. Registradores sem
+        # scan_class usam o polling_interval do PLC.
+        default_period = plc.polling_interval or 1000
+        self.scan_classes: Dict[int, List[Dict[str, Any]]] = {}
+        for reg in self.registers:
+            self.scan_classes.setdefault(reg.get('scan_class') or default_period, []).append(reg)
+        self.base_interval = self._base_period(list(self.scan_classes) or [default_period]) / 1000.0
+
+        # blocos por combinação de classes que vencem no mesmo tick (montados sob demanda)
+        self._merged_blocks: Dict[FrozenSet[int], List[ReadBlock]] = {}
+        if len(self.scan_classes) <= 1:
+            self._merged_blocks[frozenset(self.scan_classes)] = self.blocks
+
+    @staticmethod
+    def _base_period(periods: List[int]) -> int:
+        """Tick do scheduler: MDC dos períodos (ou o menor período se o MDC ficar pequeno demais)"""
+        base = 0
+        for period in periods:
+            base = math.gcd(base, period)
+        shortest = min(periods)
+        return base if base * 10 >= shortest else shortest
+
+    def blocks_for(self, periods: FrozenSet[int]) -> List[ReadBlock]:
+        """Blocos que leem juntos os registradores de todas as classes vencidas no tick"""
+        blocks = self._merged_blocks.get(periods)
+        if blocks is None:
+            regs = [reg for period in periods for reg in self.scan_classes.get(period, [])]
+            blocks = plan_reads(regs, self.unit_id, self.max_gap)
+            self._merged_blocks[periods] = blocks
+        return blocks
+
+    def __repr__(self):
+        return (f"PLCReadPlan(plc={self.plc_id}, v={self.version}, registers={len(self.registers)}, "
+                f"blocks={len(self.blocks)}, scan_classes={sorted(self.scan_classes)})")
+
+
+class ReadPlanCache:
+    """
+    Mantém em memória o plano de leitura de cada PLC.
+
+    Cada PLC tem um contador de versão incrementado pelos eventos do SQLAlchemy
+    quando uma linha de PLC ou Register é inserida, alterada ou removida (após o
+    commit). O plano
+    só é reconstruído (consulta ao banco) quando a versão muda; no restante dos
+    ciclos `get` é apenas uma consulta ao dicionário.
+
+    Observação: atualizações em massa (query.update / delete) e alterações feitas
+    por outro processo não disparam os eventos; use `invalidate` nesses casos.
+    """
+
+    def __init__(self, max_gap: int = DEFAULT_MAX_GAP):
+        self.max_gap = max_gap
+        self._plans: Dict[int, PLCReadPlan] = {}
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, plc_id: int) -> int:
+        return self._versions.get(plc_id, 0)
+
+    def invalidate(self, plc_id: Optional[int] = None):
+        """Força a reconstrução do plano de um PLC (ou de todos)"""
+        with self._lock:
+            ids = [plc_id] if plc_id is not None else list(set(self._versions) | set(self._plans))
+            for i in ids:
+                self._versions[i] = self._versions.get(i, 0) + 1
+
+    def get(self, plc_id: int) -> Optional[PLCReadPlan]:
+        """Retorna o plano em cache se ainda estiver atualizado"""
+        plan = self._plans.get(plc_id)
+        if plan is not None and plan.version == self.version(plc_id):
+            return plan
+        return None
+
+    def build(self, plc_id: int) -> Optional[PLCReadPlan]:
+        """Consulta o banco e compila o plano. Precisa de app_context."""
+        version = self.version(plc_id)
+        plc = db.session.get(PLC, plc_id)
+        if not plc:
+            with self._lock:
+                self._plans.pop(plc_id, None)
+            return None
+
+        registers = db.session.query(Register).filter(
+            Register.plc_id == plc_id,
+            Register.is_active == True
+        ).order_by(Register.address).all()
+
+        plan = PLCReadPlan(plc, registers, version, self.max_gap)
+        with self._lock:
+            self._plans[plc_id] = plan
+        logger.debug(f"Plano de leitura reconstruído: {plan}")
+        return plan
+
+    def discard(self, plc_id: int):
+        with self._lock:
+            self._plans.pop(plc_id, None)
+
+
+read_plan_cache = ReadPlanCache()
+
+
+# -------------------------
+# Notificação de alterações
+# -------------------------
+# Os PLCs alterados são anotados no flush e só invalidados após o commit, para
+# que um poller não reconstrua o plano lendo dados ainda não confirmados.
+_DIRTY_KEY = "read_plan_dirty_plcs"
+
+# Campos de estado em tempo de execução, que não alteram o plano de leitura
+_RUNTIME_FIELDS = {'is_online', 'last_connection'}
+
+
+def _changed_plc_ids(obj) -> List[int]:
+    if isinstance(obj, PLC):
+        return [obj.id]
+    if isinstance(obj, Register):
+        # inclui o PLC antigo se o registrador foi movido de PLC
+        return [obj.plc_id, *(inspect(obj).attrs.plc_id.history.deleted or ())]
+    return []
+
+
+def _plan_fields_changed(obj) -> bool:
+    return any(
+        attr.history.has_changes()
+        for attr in inspect(obj).attrs
+        if attr.key not in _RUNTIME_FIELDS
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    dirty = session.info.setdefault(_DIRTY_KEY, set())
+    changed = [*session.new, *session.deleted]
+    changed.extend(obj for obj in session.dirty if _plan_fields_changed(obj))
+    for obj in changed:
+        dirty.update(i for i in _changed_plc_ids(obj) if i is not None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed(session):
+    for plc_id in session.info.pop(_DIRTY_KEY, ()):
+        read_plan_cache.invalidate(plc_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,190 @@
+# src/services/reading_backend.py
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Any, Iterable, Iterator, Mapping
+
+from src.db.partitions import as_utc
+from src.repositories.reading_repository import ReadingRepository
+from src.repositories.rollup_repository import aggregate_rows
+from src.services.current_values import current_values
+
+logger = logging.getLogger(__name__)
+
+BACKEND_SQL = 'sql'
+BACKEND_MEMORY = 'memory'
+
+# leituras guardadas por registrador no ring buffer
+DEFAULT_RING_SIZE = 3600
+
+
+class ReadingBackend(ABC):
+    """
+    Onde as leituras dos pollers são gravadas e consultadas.
+
+    Linhas de leitura são dicts {register_id, timestamp, raw_value, scaled_value,
+    quality}. `range` devolve as mais recentes primeiro e `aggregate` devolve a
+    mesma forma de `RollupRepository.get_series`. As rotas de histórico e de
+    exportação leem pelo backend do ReadingSink (`iter_history`), então com o
+    backend em memória elas mostram o ring buffer, não o banco.
+    """
+
+    name = ''
+    # False: os dados somem com o processo (nada a reconstruir do banco)
+    persistent = True
+    # True: mantém as tabelas de rollup (1m/1h/1d) usadas pelas tendências longas
+    has_rollups = True
+
+    @abstractmethod
+    def ingest(self, rows: List[Dict[str, Any]]) -> int:
+        """Grava um lote de leituras; retorna quantas foram gravadas"""
+        pass
+
+    @abstractmethod
+    def latest(self, register_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Última leitura de cada registrador (registradores sem leitura ficam de fora)"""
+        pass
+
+    @abstractmethod
+    def range(self, register_id: int, start_time: datetime, end_time: datetime,
+              limit: int = 1000) -> List[Dict[str, Any]]:
+        """Leituras de um registrador em [start_time, end_time], mais recentes primeiro"""
+        pass
+
+    @abstractmethod
+    def iter_history(self, register_id: int, start_time: datetime,
+                     end_time: datetime) -> Iterator[Dict[str, Any]]:
+        """Todas as leituras de um registrador em [start_time, end_time], em ordem crescente"""
+        pass
+
+    @abstractmethod
+    def aggregate(self, register_id: int, start_time: datetime, end_time: datetime,
+                  interval_minutes: int = 5) -> List[Dict[str, Any]]:
+        """Média, min, max, first, last e count por intervalo"""
+        pass
+
+
+class SQLReadingBackend(ReadingBackend):
+    """Banco do Flask-SQLAlchemy: partições, rollups e `current_values` (caminho padrão)"""
+
+    name = BACKEND_SQL
+    persistent = True
+
+    def __init__(self):
+        self.repository = ReadingRepository()
+
+    def ingest(self, rows: List[Dict[str, Any]]) -> int:
+        total = self.repository.insert_many(rows)
+        current_values.update(rows)
+        return total
+
+    def latest(self, register_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        rows = (current_values.get(rid) for rid in register_ids)
+        return [row for row in rows if row is not None]
+
+    def range(self, register_id: int, start_time: datetime, end_time: datetime,
+              limit: int = 1000) -> List[Dict[str, Any]]:
+        return self.repository.get_historical_data(register_id, start_time, end_time, limit)
+
+    def iter_history(self, register_id: int, start_time: datetime,
+                     end_time: datetime) -> Iterator[Dict[str, Any]]:
+        return self.repository.iter_history(register_id, start_time, end_time)
+
+    def aggregate(self, register_id: int, start_time: datetime, end_time: datetime,
+                  interval_minutes: int = 5) -> List[Dict[str, Any]]:
+        return self.repository.get_aggregated_data(register_id, start_time, end_time, interval_minutes)
+
+
+class RingBufferBackend(ReadingBackend):
+    """
+    Leituras só em memória: as últimas `size` de cada registrador em um deque
+    de tamanho fixo (a mais antiga sai quando chega uma nova).
+
+    Para gateways de borda sem disco e para testes de carga, em que o custo do
+    polling deve ser medido sem o custo do banco. A memória é limitada a
+    registradores x `size` linhas.
+    """
+
+    name = BACKEND_MEMORY
+    persistent = False
+    has_rollups = False
+
+    def __init__(self, size: int = DEFAULT_RING_SIZE):
+        self.size = size
+        self._buffers: Dict[int, Deque[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.rows_ingested = 0
+
+    def ingest(self, rows: List[Dict[str, Any]]) -> int:
+        with self._lock:
+            for row in rows:
+                buffer = self._buffers.get(row['register_id'])
+                if buffer is None:
+                    buffer = self._buffers[row['register_id']] = deque(maxlen=self.size)
+                buffer.append(row)
+            self.rows_ingested += len(rows)
+        return len(rows)
+
+    def latest(self, register_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        result = []
+        with self._lock:
+            for register_id in register_ids:
+                buffer = self._buffers.get(register_id)
+                if buffer:
+                    result.append(max(buffer, key=lambda row: as_utc(row['timestamp'])))
+        return result
+
+    def _select(self, register_id: int, start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
+        start, end = as_utc(start_time), as_utc(end_time)
+        with self._lock:
+            rows = list(self._buffers.get(register_id, ()))
+        return [row for row in rows if start <= as_utc(row['timestamp']) <= end]
+
+    def range(self, register_id: int, start_time: datetime, end_time: datetime,
+              limit: int = 1000) -> List[Dict[str, Any]]:
+        rows = self._select(register_id, start_time, end_time)
+        rows.sort(key=lambda row: as_utc(row['timestamp']), reverse=True)
+        return [dict(row, timestamp=as_utc(row['timestamp'])) for row in rows[:limit]]
+
+    def iter_history(self, register_id: int, start_time: datetime,
+                     end_time: datetime) -> Iterator[Dict[str, Any]]:
+        rows = self._select(register_id, start_time, end_time)
+        rows.sort(key=lambda row: as_utc(row['timestamp']))
+        for row in rows:
+            yield dict(row, timestamp=as_utc(row['timestamp']))
+
+    def aggregate(self, register_id: int, start_time: datetime, end_time: datetime,
+                  interval_minutes: int = 5) -> List[Dict[str, Any]]:
+        buckets = aggregate_rows(self._select(register_id, start_time, end_time),
+                                 max(1, interval_minutes) * 60)
+        buckets.sort(key=lambda b: b['bucket'])
+        return [{
+            'time_bucket': datetime.fromtimestamp(b['bucket'], tz=timezone.utc),
+            'avg_value': b['sum_value'] / b['count'],
+            'min_value': b['min_value'],
+            'max_value': b['max_value'],
+            'first_value': b['first_value'],
+            'last_value': b['last_value'],
+            'count': b['count'],
+        } for b in buckets]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'registers': len(self._buffers),
+                'rows': sum(len(b) for b in self._buffers.values()),
+                'size': self.size,
+                'rows_ingested': self.rows_ingested,
+            }
+
+
+def create_backend(config: Mapping[str, Any]) -> ReadingBackend:
+    """Backend escolhido por READINGS_BACKEND ('sql' ou 'memory') na config da app"""
+    kind = config.get('READINGS_BACKEND', BACKEND_SQL)
+    if kind == BACKEND_SQL:
+        return SQLReadingBackend()
+    if kind == BACKEND_MEMORY:
+        return RingBufferBackend(config.get('RING_BUFFER_SIZE', DEFAULT_RING_SIZE))
+    raise ValueError(f"READINGS_BACKEND {kind} não suportado")
@@ -0,0 +1,224 @@
+# src/services/reading_sink.py
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Any, Optional, Tuple
+
+from flask import Flask
+
+from src.services.reading_backend import ReadingBackend, SQLReadingBackend, create_backend
+
+logger = logging.getLogger(__name__)
+
+
+class ReadingSink:
+    """
+    Fila única (write-behind) para as leituras de todos os pollers.
+
+    Os pollers chamam `push` sem esperar o banco; uma tarefa no loop assíncrono
+    grava em lote quando a fila atinge `max_batch` linhas ou quando a leitura mais
+    antiga espera mais que `max_delay_ms`, o que ocorrer primeiro. Cada lote é
+    gravado em uma única transação do `backend` (por padrão o SQL; em `init_app`
+    a config READINGS_BACKEND pode trocá-lo pelo ring buffer em memória).
+
+    Um lote que falha (banco ocupado, "database is locked") volta para o início
+    da fila e é regravado com espera exponencial entre `retry_delay_ms` e
+    `max_retry_delay_ms`; leituras só são descartadas quando a fila passa de
+    `max_queue` (as mais antigas primeiro).
+    """
+
+    def __init__(self, app: Flask = None, max_batch: int = 5000, max_delay_ms: int = 500,
+                 max_queue: int = 200000, backend: ReadingBackend = None,
+                 retry_delay_ms: int = 500, max_retry_delay_ms: int = 30000):
+        self.app = app
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self.max_queue = max_queue
+        self.retry_delay = retry_delay_ms / 1000.0
+        self.max_retry_delay = max_retry_delay_ms / 1000.0
+        self._fixed_backend = backend is not None
+        self.backend = backend or SQLReadingBackend()
+
+        self._queue: Deque[Dict[str, Any]] = deque()
+        # [instante monotônico do push, linhas ainda na fila] por push, na ordem da fila
+        self._arrivals: Deque[List] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._failures = 0       # falhas seguidas de gravação
+        self._retry_at = 0.0     # instante (monotônico) da próxima tentativa após uma falha
+
+        # métricas
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.rows_failed = 0  # linhas em tentativas de gravação que falharam (voltaram para a fila)
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._recent: Deque[Tuple[float, int]] = deque()  # (instante, linhas) dos últimos flushes
+
+    def init_app(self, app: Flask):
+        self.app = app
+        if not self._fixed_backend:
+            self.backend = create_backend(app.config)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Inicia a tarefa de flush no loop atual (idempotente)"""
+        if self.running:
+            return
+        if not self.app:
+            raise RuntimeError("ReadingSink precisa de app (chame init_app ou passe app no construtor).")
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("ReadingSink iniciado (lote=%s, atraso=%sms)", self.max_batch, int(self.max_delay * 1000))
+
+    async def stop(self):
+        """Grava o que restou na fila (insistindo se o banco falhar) e encerra a tarefa de flush"""
+        if not self.running:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    def push(self, rows: List[Dict[str, Any]]):
+        """
+        Enfileira leituras já escaladas ({register_id, timestamp, raw_value, scaled_value,
+        quality}). `timestamp` deve ser o instante de aquisição; linhas sem ele recebem
+        o instante do push. Deve ser chamado no loop assíncrono; nunca bloqueia.
+        """
+        if not rows:
+            return
+        now = datetime.now(timezone.utc)
+        was_empty = not self._queue
+        for row in rows:
+            row.setdefault('timestamp', now)
+        self._queue.extend(rows)
+        self._arrivals.append([time.monotonic(), len(rows)])
+        self._drop_overflow()
+
+        if self._wakeup is not None and (was_empty or len(self._queue) >= self.max_batch):
+            self._wakeup.set()
+
+    def _drop_overflow(self):
+        overflow = len(self._queue) - self.max_queue
+        if overflow > 0:
+            # banco não acompanha: descarta as leituras mais antigas
+            for _ in range(overflow):
+                self._queue.popleft()
+            self._consume_arrivals(overflow)
+            self.rows_dropped += overflow
+            logger.warning("ReadingSink cheio, %s leituras descartadas", overflow)
+
+    async def _run(self):
+        while self._queue or not self._closing:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            retry_in = self._retry_at - time.monotonic()
+            if retry_in > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), retry_in)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            age = time.monotonic() - self.oldest_enqueued
+            if len(self._queue) < self.max_batch and age < self.max_delay and not self._closing:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.max_delay - age)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._flush()
+
+    async def _flush(self):
+        count = min(len(self._queue), self.max_batch)
+        enqueued = self.oldest_enqueued
+        batch = [self._queue.popleft() for _ in range(count)]
+        self._consume_arrivals(count)
+
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._write, batch)
+        except Exception as e:
+            self._requeue(batch, enqueued)
+            self.rows_failed += count
+            self._failures += 1
+            delay = min(self.max_retry_delay, self.retry_delay * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + delay
+            logger.exception(f"Erro gravando lote de {count} leituras (nova tentativa em {delay:.1f}s): {e}")
+            return
+
+        self._failures = 0
+        self._retry_at = 0.0
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.flushes += 1
+        self.rows_written += count
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        self._recent.append((time.monotonic(), count))
+
+    def _requeue(self, batch: List[Dict[str, Any]], enqueued: float):
+        """Devolve um lote que não foi gravado ao início da fila, com a idade original"""
+        self._queue.extendleft(reversed(batch))
+        self._arrivals.appendleft([enqueued, len(batch)])
+        self._drop_overflow()
+
+    @property
+    def oldest_enqueued(self) -> float:
+        """Instante (monotônico) do push da leitura mais antiga ainda na fila"""
+        return self._arrivals[0][0] if self._arrivals else time.monotonic()
+
+    def _consume_arrivals(self, count: int):
+        """Tira `count` linhas do início da fila da contabilidade de pushes"""
+        while count > 0 and self._arrivals:
+            first = self._arrivals[0]
+            if first[1] <= count:
+                count -= first[1]
+                self._arrivals.popleft()
+            else:
+                first[1] -= count
+                count = 0
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        with self.app.app_context():
+            self.backend.ingest(batch)
+
+    def stats(self, window: float = 10.0) -> Dict[str, Any]:
+        """Profundidade da fila, latência de flush e vazão (linhas/s na janela)"""
+        now = time.monotonic()
+        while self._recent and now - self._recent[0][0] > window:
+            self._recent.popleft()
+        return {
+            'backend': self.backend.name,
+            'queue_depth': len(self._queue),
+            'rows_written': self.rows_written,
+            'rows_dropped': self.rows_dropped,
+            'rows_failed': self.rows_failed,
+            'write_failures': self._failures,
+            'flushes': self.flushes,
+            'last_flush_ms': round(self.last_flush_ms, 2),
+            'avg_flush_ms': round(self._total_flush_ms / self.flushes, 2) if self.flushes else 0.0,
+            'max_flush_ms': round(self.max_flush_ms, 2),
+            'rows_per_s': round(sum(c for _, c in self._recent) / window, 1),
+        }
+
+
+# instância compartilhada por todos os pollers
+reading_sink = ReadingSink()
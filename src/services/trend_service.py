@@ -0,0 +1,89 @@
+# src/services/trend_service.py
+from datetime import datetime
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from src.db.partitions import as_utc
+from src.models.Rollup import ROLLUP_MODELS
+from src.repositories.rollup_repository import RollupRepository
+from src.services.downsample import downsample, LTTB, MINMAX
+from src.services.reading_backend import ReadingBackend
+from src.services.reading_sink import reading_sink
+
+DEFAULT_POINTS = 1000
+MAX_POINTS = 10000
+
+
+class TrendService:
+    """
+    Histórico de um registrador reduzido para gráficos (LTTB ou min/max por pixel).
+
+    A fonte é escolhida pelo intervalo pedido: se cada ponto de saída cobre pelo
+    menos um bucket de rollup, lê o rollup mais grosso que ainda cabe (um ano em
+    ~2000 pontos lê ~8800 buckets de 1 h em vez de milhões de leituras); senão lê
+    as leituras brutas 'good'. A redução roda em NumPy sobre a série selecionada.
+
+    As leituras vêm do backend do ReadingSink; o backend em memória não tem
+    rollups, então a série é sempre a bruta do ring buffer.
+    """
+
+    def __init__(self, backend: ReadingBackend = None):
+        self.backend = backend or reading_sink.backend
+        self.rollups = RollupRepository()
+
+    @staticmethod
+    def source_for(start_time: datetime, end_time: datetime, points: int):
+        """Rollup mais grosso cujo bucket não passa do tempo coberto por um ponto (None = bruto)"""
+        per_point = (as_utc(end_time) - as_utc(start_time)).total_seconds() / max(1, points)
+        chosen = None
+        for model in ROLLUP_MODELS:
+            if model.SECONDS <= per_point:
+                chosen = model
+        return chosen
+
+    def _raw_series(self, register_id: int, start_time: datetime,
+                    end_time: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        rows = [row for row in self.backend.iter_history(register_id, start_time, end_time)
+                if row['quality'] == 'good']
+        x = np.fromiter((row['timestamp'].timestamp() for row in rows), dtype=np.float64, count=len(rows))
+        y = np.fromiter((row['scaled_value'] for row in rows), dtype=np.float64, count=len(rows))
+        return x, y
+
+    def _rollup_series(self, model, register_id: int, start_time: datetime, end_time: datetime,
+                       method: str) -> Tuple[np.ndarray, np.ndarray]:
+        rows = self.rollups.get_buckets(model, register_id, start_time, end_time)
+        x = np.fromiter((row['bucket'] for row in rows), dtype=np.float64, count=len(rows))
+        if method == MINMAX:
+            # min e max de cada bucket como dois pontos no mesmo instante
+            low = np.fromiter((row['min_value'] for row in rows), dtype=np.float64, count=len(rows))
+            high = np.fromiter((row['max_value'] for row in rows), dtype=np.float64, count=len(rows))
+            return np.repeat(x, 2), np.column_stack((low, high)).ravel()
+        y = np.fromiter((row['sum_value'] / row['count'] for row in rows), dtype=np.float64, count=len(rows))
+        return x, y
+
+    def history(self, register_id: int, start_time: datetime, end_time: datetime,
+                points: int = DEFAULT_POINTS, method: str = LTTB) -> Dict[str, Any]:
+        """
+        Série reduzida: {'source': 'raw' | '1m' | '1h' | '1d', 'method', 'input_points',
+        'points': [[epoch ms, valor], ...]} em ordem crescente de tempo.
+        """
+        points = max(2, min(points, MAX_POINTS))
+        model = self.source_for(start_time, end_time, points) if self.backend.has_rollups else None
+        if model is None:
+            source = 'raw'
+            x, y = self._raw_series(register_id, start_time, end_time)
+        else:
+            source = model.__tablename__.rsplit('_', 1)[1]
+            x, y = self._rollup_series(model, register_id, start_time, end_time, method)
+
+        keep = downsample(x, y, points, method)
+        series: List[List[Any]] = np.column_stack((np.round(x[keep] * 1000), y[keep])).tolist()
+        for pair in series:
+            pair[0] = int(pair[0])
+        return {
+            'source': source,
+            'method': method,
+            'input_points': len(x),
+            'points': series,
+        }
@@ -0,0 +1,139 @@
+# src/simulations/benchmark_pipeline.py
+"""
+Benchmark de leitura Modbus com e sem pipelining contra o simulador pymodbus.
+
+Uso:
+    python -m src.simulations.benchmark_pipeline --requests 500 --rtt-ms 20 --windows 1,2,4,8
+
+O simulador roda em uma thread; entre o cliente e o simulador fica um proxy TCP
+que atrasa cada sentido em rtt/2 para imitar a latência da rede da planta.
+Se alguma resposta vier com erro (exceção Modbus) o benchmark termina com código 1:
+o tempo medido não vale para leituras que falharam.
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from typing import Tuple
+
+from pymodbus.client import AsyncModbusTcpClient
+
+from src.adapters.modbus_pipeline import PipelinedModbusClient
+from src.simulations.simulation import start_modbus_simulator
+
+
+async def _delayed_pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, delay: float):
+    """Encaminha os bytes preservando a ordem, cada pedaço com `delay` segundos de atraso"""
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _forward():
+        while True:
+            due, data = await queue.get()
+            if data is None:
+                break
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+            writer.write(data)
+            await writer.drain()
+        writer.close()
+
+    sender = asyncio.create_task(_forward())
+    while True:
+        data = await reader.read(65536)
+        await queue.put((time.monotonic() + delay, data or None))
+        if not data:
+            break
+    await sender
+
+
+async def _start_latency_proxy(listen_port: int, target_host: str, target_port: int, rtt: float):
+    async def _handle(client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection(target_host, target_port)
+        await asyncio.gather(
+            _delayed_pipe(client_reader, server_writer, rtt / 2),
+            _delayed_pipe(server_reader, client_writer, rtt / 2),
+            return_exceptions=True,
+        )
+
+    return await asyncio.start_server(_handle, "127.0.0.1", listen_port)
+
+
+async def _bench_pymodbus(host: str, port: int, requests: int, count: int) -> Tuple[float, int]:
+    """Leituras sequenciais com o cliente do pymodbus; retorna (segundos, respostas com erro)"""
+    client = AsyncModbusTcpClient(host=host, port=port, timeout=5)
+    await client.connect()
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        result = await client.read_holding_registers(0, count, slave=1)
+        errors += result.isError()
+    elapsed = time.perf_counter() - started
+    client.close()
+    if errors:
+        print(f"  pymodbus: {errors} erros")
+    return elapsed, errors
+
+
+async def _bench_pipelined(host: str, port: int, requests: int, count: int, window: int) -> Tuple[float, int]:
+    """Leituras simultâneas com o cliente em pipeline; retorna (segundos, respostas com erro)"""
+    client = PipelinedModbusClient(host, port, timeout=5, window=window)
+    await client.connect()
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(client.read_holding_registers(0, count, slave=1) for _ in range(requests))
+    )
+    elapsed = time.perf_counter() - started
+    client.close()
+    errors = sum(1 for r in results if r.isError())
+    if errors or client.degraded:
+        print(f"  janela {window}: {errors} erros, degradado={client.degraded}")
+    return elapsed, errors
+
+
+async def run_benchmark(requests: int, count: int, rtt_ms: float, windows, sim_port: int, proxy_port: int) -> int:
+    """Executa as medições e retorna o total de respostas com erro"""
+    rtt = rtt_ms / 1000.0
+    host, port = "127.0.0.1", sim_port
+    proxy = None
+    if rtt > 0:
+        proxy = await _start_latency_proxy(proxy_port, "127.0.0.1", sim_port, rtt)
+        port = proxy_port
+
+    print(f"{requests} leituras de {count} registradores, RTT simulado {rtt_ms} ms")
+    elapsed, errors = await _bench_pymodbus(host, port, requests, count)
+    print(f"  pymodbus sequencial : {elapsed:7.3f} s  {requests / elapsed:8.1f} req/s")
+    for window in windows:
+        elapsed, window_errors = await _bench_pipelined(host, port, requests, count, window)
+        errors += window_errors
+        print(f"  pipeline janela {window:<3} : {elapsed:7.3f} s  {requests / elapsed:8.1f} req/s")
+
+    if proxy:
+        proxy.close()
+        await proxy.wait_closed()
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de pipelining Modbus TCP")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--count", type=int, default=10, help="registradores por leitura (até 125)")
+    parser.add_argument("--rtt-ms", type=float, default=20.0)
+    parser.add_argument("--windows", default="1,2,4,8")
+    parser.add_argument("--sim-port", type=int, default=5021)
+    parser.add_argument("--proxy-port", type=int, default=5022)
+    args = parser.parse_args()
+
+    thread = threading.Thread(target=start_modbus_simulator, args=("127.0.0.1", args.sim_port), daemon=True)
+    thread.start()
+    time.sleep(1)
+
+    windows = [int(w) for w in args.windows.split(",") if w.strip()]
+    errors = asyncio.run(run_benchmark(args.requests, args.count, args.rtt_ms, windows,
+                                       args.sim_port, args.proxy_port))
+    if errors:
+        print(f"{errors} respostas com erro: resultados inválidos")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# src/simulations/benchmark_schema.py
+"""
+Benchmark do esquema de leituras: modelo atual (`readings`) x esquema compacto
+(`compact_readings`, com e sem `scaled_value`).
+
+Uso:
+    python -m src.simulations.benchmark_schema --rows 500000 --registers 100
+
+Cada esquema grava as mesmas N linhas em um banco temporário próprio pelo
+INSERT Core em executemany. Mostra a vazão de gravação, o tamanho do arquivo
+depois de VACUUM e os bytes por linha.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from sqlalchemy import insert
+
+from config import Config
+from src.models import Reading
+from src.db.storage import storage
+from src.repositories.compact_reading_repository import CompactReadingRepository
+from src.simulations.benchmark_storage import _seed
+from src.views import create_app
+
+CHUNK = 10000
+
+
+def _rows(rows: int, register_ids):
+    now = datetime.now(timezone.utc)
+    for i in range(rows):
+        raw = float(i % 4096)
+        yield {'register_id': register_ids[i % len(register_ids)], 'timestamp': now + timedelta(milliseconds=i),
+               'raw_value': raw, 'scaled_value': raw * 0.1, 'quality': 'good'}
+
+
+def _insert_current(rows):
+    table = Reading.__table__
+    with storage.writer() as conn:
+        while True:
+            chunk = list(islice(rows, CHUNK))
+            if not chunk:
+                break
+            conn.execute(insert(table), chunk)
+
+
+def _file_size(path: str) -> int:
+    with storage.writer_engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.exec_driver_sql("VACUUM")
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    return os.path.getsize(path)
+
+
+def run(label: str, rows: int, registers: int, write):
+    tmpdir = tempfile.mkdtemp(prefix="bench_schema_")
+    path = os.path.join(tmpdir, "bench.db")
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+    app = create_app(BenchConfig)
+    _, register_ids = _seed(app, 1, registers)
+    empty = _file_size(path)
+
+    started = time.perf_counter()
+    write(_rows(rows, register_ids))
+    elapsed = time.perf_counter() - started
+
+    size = _file_size(path) - empty
+    print(f"{label:<20} {rows / elapsed:>12,.0f} linhas/s  {size / 1048576:>8.1f} MB  {size / rows:>6.1f} B/linha")
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do esquema de leituras (atual x compacto)")
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--registers", type=int, default=100)
+    args = parser.parse_args()
+
+    current = run("readings", args.rows, args.registers, _insert_current)
+    compact = run("compact", args.rows, args.registers, CompactReadingRepository().insert_many)
+    raw_only = run("compact (raw only)", args.rows, args.registers,
+                   CompactReadingRepository(raw_only=True).insert_many)
+    print(f"compact: {compact / current:.0%} do tamanho atual, raw only: {raw_only / current:.0%}")
+
+
+if __name__ == "__main__":
+    main()
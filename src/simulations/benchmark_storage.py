@@ -0,0 +1,216 @@
+# src/simulations/benchmark_storage.py
+"""
+Benchmark de ingestão e dashboard ao mesmo tempo sobre o SQLite.
+
+Uso:
+    python -m src.simulations.benchmark_storage --seconds 20 --plcs 20 --registers 50 --readers 4
+
+Roda duas vezes sobre um banco temporário:
+  - "padrao": journal rollback, sem PRAGMAs (configuração antiga);
+  - "wal":    PRAGMAs de Config.SQLITE_PRAGMAS, escritor serializado e leitores somente leitura.
+Uma thread grava um lote por ciclo de polling (uma linha por registrador) enquanto
+`--readers` threads fazem as consultas do dashboard (últimos valores e histórico).
+Mostra latência de gravação e de leitura (p50/p95/max) e quantos "database is locked".
+
+Com `--compare-insert N` mede só a vazão de gravação de N linhas pelo caminho ORM
+(bulk_insert) e pelo caminho Core (insert_many).
+
+Com `--compare-backends N` empurra N linhas pelo ReadingSink com o backend em
+memória (ring buffer) e com o backend SQL: a diferença é o custo do banco, o
+restante é o custo da fila e do lado do polling.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+from src.db import db
+from src.models import PLC, Reading, Register
+from src.repositories.reading_repository import ReadingRepository
+from src.services.reading_backend import RingBufferBackend, SQLReadingBackend
+from src.services.reading_sink import ReadingSink
+from src.views import create_app
+
+
+def _percentiles(samples):
+    if not samples:
+        return {'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    ordered = sorted(samples)
+    return {
+        'p50': statistics.median(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'max': ordered[-1],
+    }
+
+
+def _seed(app, plcs: int, registers: int):
+    with app.app_context():
+        register_ids = []
+        for p in range(plcs):
+            plc = PLC(name=f"bench-{p}", ip_address=f"10.0.{p // 250}.{p % 250 + 1}")
+            plc.registers = [Register(name=f"r{r}", address=r, register_type='holding') for r in range(registers)]
+            db.session.add(plc)
+        db.session.commit()
+        for reg in Register.query.all():
+            register_ids.append(reg.id)
+        plc_ids = [p.id for p in PLC.query.all()]
+    return plc_ids, register_ids
+
+
+def run(label: str, pragmas, seconds: float, plcs: int, registers: int, readers: int, interval: float):
+    tmpdir = tempfile.mkdtemp(prefix="bench_storage_")
+    path = os.path.join(tmpdir, "bench.db")
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLITE_PRAGMAS = pragmas
+
+    app = create_app(BenchConfig)
+    plc_ids, register_ids = _seed(app, plcs, registers)
+    repository = ReadingRepository()
+
+    stop = threading.Event()
+    write_ms, read_ms = [], []
+    errors = {'write': 0, 'read': 0}
+    rows_written = [0]
+
+    def _ingest():
+        while not stop.is_set():
+            started = time.perf_counter()
+            now = datetime.now(timezone.utc)
+            batch = []
+            for rid in register_ids:
+                value = random.random() * 100
+                batch.append({'register_id': rid, 'timestamp': now, 'raw_value': value,
+                              'scaled_value': value, 'quality': 'good'})
+            try:
+                repository.insert_many(batch)
+                rows_written[0] += len(batch)
+                write_ms.append((time.perf_counter() - started) * 1000.0)
+            except OperationalError:
+                errors['write'] += 1
+            time.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+    def _dashboard():
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with app.app_context():
+                    if random.random() < 0.5:
+                        repository.get_latest_readings(random.choice(plc_ids))
+                    else:
+                        end = datetime.now(timezone.utc)
+                        repository.get_historical_data(random.choice(register_ids), end - timedelta(minutes=5), end)
+                read_ms.append((time.perf_counter() - started) * 1000.0)
+            except OperationalError:
+                errors['read'] += 1
+
+    threads = [threading.Thread(target=_ingest, daemon=True)]
+    threads += [threading.Thread(target=_dashboard, daemon=True) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    w, r = _percentiles(write_ms), _percentiles(read_ms)
+    print(f"[{label}] gravação: {rows_written[0] / seconds:,.0f} linhas/s  "
+          f"p50={w['p50']:.1f}ms p95={w['p95']:.1f}ms max={w['max']:.1f}ms  locked={errors['write']}")
+    print(f"[{label}] dashboard: {len(read_ms) / seconds:,.1f} consultas/s  "
+          f"p50={r['p50']:.1f}ms p95={r['p95']:.1f}ms max={r['max']:.1f}ms  locked={errors['read']}")
+
+
+def compare_insert(rows: int, registers: int):
+    tmpdir = tempfile.mkdtemp(prefix="bench_insert_")
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    app = create_app(BenchConfig)
+    _, register_ids = _seed(app, 1, registers)
+    repository = ReadingRepository()
+    now = datetime.now(timezone.utc)
+
+    def _rows():
+        for i in range(rows):
+            value = float(i % 1000)
+            yield {'register_id': register_ids[i % registers], 'timestamp': now + timedelta(microseconds=i),
+                   'raw_value': value, 'scaled_value': value, 'quality': 'good'}
+
+    started = time.perf_counter()
+    with app.app_context():
+        repository.bulk_insert([Reading(**row) for row in _rows()])
+    orm_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    repository.insert_many(_rows())
+    core_s = time.perf_counter() - started
+
+    print(f"ORM  (bulk_insert): {rows / orm_s:,.0f} linhas/s ({orm_s:.2f}s)")
+    print(f"Core (insert_many): {rows / core_s:,.0f} linhas/s ({core_s:.2f}s)")
+
+
+async def _drain(sink: ReadingSink, rows: int, register_ids, batch: int) -> float:
+    now = datetime.now(timezone.utc)
+    await sink.start()
+    started = time.perf_counter()
+    for offset in range(0, rows, batch):
+        sink.push([{'register_id': register_ids[i % len(register_ids)], 'timestamp': now + timedelta(microseconds=i),
+                    'raw_value': float(i), 'scaled_value': float(i), 'quality': 'good'}
+                   for i in range(offset, min(rows, offset + batch))])
+        await asyncio.sleep(0)
+    await sink.stop()
+    return time.perf_counter() - started
+
+
+def compare_backends(rows: int, registers: int):
+    tmpdir = tempfile.mkdtemp(prefix="bench_backend_")
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    app = create_app(BenchConfig)
+    _, register_ids = _seed(app, 1, registers)
+
+    for backend in (RingBufferBackend(), SQLReadingBackend()):
+        sink = ReadingSink(app, max_queue=rows, backend=backend)
+        elapsed = asyncio.run(_drain(sink, rows, register_ids, registers))
+        print(f"{backend.name:>6}: {sink.rows_written / elapsed:,.0f} linhas/s ({elapsed:.2f}s, "
+              f"flush médio {sink.stats()['avg_flush_ms']:.1f}ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de ingestão + dashboard no SQLite")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--plcs", type=int, default=20)
+    parser.add_argument("--registers", type=int, default=50, help="registradores por PLC")
+    parser.add_argument("--readers", type=int, default=4, help="threads de consulta do dashboard")
+    parser.add_argument("--interval-ms", type=float, default=100.0, help="intervalo entre lotes de ingestão")
+    parser.add_argument("--compare-insert", type=int, default=0, metavar="N",
+                        help="só compara a vazão ORM x Core gravando N linhas")
+    parser.add_argument("--compare-backends", type=int, default=0, metavar="N",
+                        help="só compara o ReadingSink com backend em memória x SQL gravando N linhas")
+    args = parser.parse_args()
+
+    if args.compare_insert:
+        compare_insert(args.compare_insert, args.registers)
+        return
+    if args.compare_backends:
+        compare_backends(args.compare_backends, args.registers)
+        return
+
+    for label, pragmas in (("padrao", {}), ("wal", Config.SQLITE_PRAGMAS)):
+        run(label, pragmas, args.seconds, args.plcs, args.registers, args.readers, args.interval_ms / 1000.0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,9 @@ logger = setup_logger()
 
 async def start_modbus_async(host: str = "127.0.0.1", port: int = 5020):
     # Cria blocos de dados (addresses a partir de 0)
-    hr_block_1 = ModbusSequentialDataBlock(0, [0] * 10)                 # slave 1
+    # slave 1 cobre uma leitura máxima (125 registradores) a partir do endereço 0;
+    # o pymodbus soma 1 ao endereço pedido, daí a palavra extra
+    hr_block_1 = ModbusSequentialDataBlock(0, list(range(126)))         # slave 1
     hr_block_2 = ModbusSequentialDataBlock(0, [100 + i for i in range(5)])  # slave 2
 
     # Cada slave precisa ser um ModbusSlaveContext
@@ -5,8 +5,14 @@ from flask_login import LoginManager
 from config import Config
 from flask_migrate import Migrate
 import time
+from datetime import datetime, timedelta, timezone
+
+import click
+from sqlalchemy.schema import CreateIndex
 
 from src.db import db
+from src.db.schema import add_missing_columns
+from src.db.storage import storage
 from src.models import PLC, Reading, Register, User, UserRole
 
 login_manager = LoginManager()
@@ -32,11 +38,13 @@ def create_app(config_class=Config):
 
     app.config.update(
         SECRET_KEY="minha_chave_super_secreta",
-        SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(db_path, 'app.db')}",
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
     )
+    # URI vem da config (DATABASE_URL); padrão continua sendo db/app.db
+    app.config.setdefault("SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(db_path, 'app.db')}")
 
     db.init_app(app)
+    storage.init_app(app)
     time.sleep(1)
     login_manager.init_app(app)
 
@@ -46,7 +54,15 @@ def create_app(config_class=Config):
 
     with app.app_context():
         from src.models import PLC, Reading, Register, User, UserRole
+        from src.repositories.plc_repository import fill_name_search
         db.create_all()
+        # create_all não adiciona colunas nem índices novos a tabelas que já existem
+        with db.engine.begin() as conn:
+            for table in db.metadata.sorted_tables:
+                add_missing_columns(conn, table)
+            fill_name_search(conn)
+            for index in PLC.__table__.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
 
     # Blueprints 
     from src.views.routes.main_routes import main as main_bp 
@@ -62,5 +78,34 @@ def create_app(config_class=Config):
     app.register_blueprint(plc_bp) 
     app.register_blueprint(coleta_bp)
 
+    @app.cli.command("rollup-backfill")
+    @click.option("--days", type=int, default=None, help="Só os últimos N dias (padrão: todo o histórico)")
+    def rollup_backfill(days):
+        """Recalcula os rollups 1m/1h/1d a partir das leituras brutas"""
+        from src.repositories.rollup_repository import RollupRepository
+        start = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+        total = RollupRepository().backfill(start_time=start)
+        click.echo(f"{total} leituras processadas")
+
+    @app.cli.command("archive-readings")
+    def archive_readings():
+        """Move as partições vencidas (ARCHIVE_AFTER_DAYS) para o arquivo frio"""
+        from src.services.archiver import cold_archiver
+        cold_archiver.init_app(app)
+        click.echo(f"{cold_archiver.run_once()} partições arquivadas")
+
+    @app.cli.command("compact-readings")
+    @click.option("--days", type=int, default=None, help="Só os últimos N dias (padrão: todo o histórico)")
+    @click.option("--raw-only/--with-scaled", default=None,
+                  help="Grava só o valor bruto (escala aplicada na leitura); padrão: COMPACT_READINGS_RAW_ONLY")
+    def compact_readings(days, raw_only):
+        """Copia as leituras para o esquema compacto experimental (compact_readings, não usado pelas rotas)"""
+        from src.repositories.compact_reading_repository import CompactReadingRepository
+        if raw_only is None:
+            raw_only = app.config.get('COMPACT_READINGS_RAW_ONLY', False)
+        start = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+        total = CompactReadingRepository(raw_only=raw_only).migrate(start_time=start)
+        click.echo(f"{total} leituras migradas")
+
     migrate = Migrate(app, db)
     return app
@@ -1,9 +1,12 @@
 # src/views/api_routes.py
-from flask import Blueprint, jsonify, request, render_template
+from flask import Blueprint, jsonify, request, render_template, Response, stream_with_context
 import logging
 from threading import Thread
 
 from src.services.plc_service import CLPService
+from src.services.live_values import live_values
+from src.services.current_values import current_values
+from src.db.partitions import as_utc
 
 service = CLPService
 
@@ -26,6 +29,28 @@ def _run_in_thread(target, *args, **kwargs):
 # -------------------------
 # Rotas de CLPs
 # -------------------------
+def _registers_values(rows):
+    """Linhas do cache de valores atuais -> {nome: {value, quality, timestamp, unit}}"""
+    values = {}
+    for row in rows:
+        ts = row.get("timestamp")
+        values[row.get("name") or str(row["register_id"])] = {
+            "register_id": row["register_id"],
+            "value": row["scaled_value"],
+            "quality": row.get("quality"),
+            "timestamp": as_utc(ts).isoformat() if ts else None,
+            "unit": row.get("unit"),
+        }
+    return values
+
+
+@clp_api.route("/values", methods=["GET"])
+def get_fleet_values():
+    """Valores atuais de todos os CLPs (snapshot em memória, sem consultar o banco)."""
+    plcs = {plc_id: _registers_values(rows) for plc_id, rows in current_values.fleet().items()}
+    return jsonify({"success": True, "plcs": plcs})
+
+
 # @clp_api.route("/", methods=["GET"])
 # def get_clps():
 #     """Lista todos os CLPs no banco como dicts."""
@@ -41,6 +66,35 @@ def get_clp(ip):
     return render_template("layouts/detalhes.html", clp=clp)
 
 
+@clp_api.route("/<ip>/values", methods=["GET"])
+def get_clp_values(ip):
+    """Valores atuais dos registradores do CLP (snapshot em memória atualizado pelos pollers)."""
+    plc_id = current_values.plc_for_ip(ip)
+    if plc_id is None:
+        clp = service.buscar_clp_por_ip(ip)
+        if not clp:
+            return jsonify({"success": False, "message": "CLP não encontrado"}), 404
+        plc_id = clp["id"]
+    return jsonify({"success": True, "plc_id": plc_id,
+                    "registers_values": _registers_values(current_values.for_plc(plc_id))})
+
+
+@clp_api.route("/<ip>/stream", methods=["GET"])
+def stream_clp_values(ip):
+    """
+    Server-Sent Events com os valores do CLP: o estado atual ao conectar e
+    depois só os registradores que mudaram, direto da difusão dos pollers.
+    """
+    clp = service.buscar_clp_por_ip(ip)
+    if not clp:
+        return jsonify({"success": False, "message": "CLP não encontrado"}), 404
+    return Response(
+        stream_with_context(live_values.stream(clp["id"])),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # @clp_api.route("/<ip>/rename", methods=["POST"])
 # def rename_clp(ip):
 #     """Renomeia CLP usando ORM."""
@@ -1,8 +1,12 @@
 from flask import Blueprint, request
-from src.controllers.plc_controller import start_polling_controller, stop_polling_controller
+from src.controllers.plc_controller import list_plcs_controller, start_polling_controller, stop_polling_controller, ingest_stats_controller, scan_stats_controller, export_readings_controller, history_readings_controller
 
 plc_bp = Blueprint('plc', __name__)
 
+@plc_bp.route('/plcs', methods=['GET'])
+def list_plcs():
+    return list_plcs_controller()
+
 @plc_bp.route('/plcs/<int:plc_id>/start', methods=['POST'])
 def start_plc(plc_id):
     return start_polling_controller(plc_id)
@@ -10,3 +14,23 @@ def start_plc(plc_id):
 @plc_bp.route('/plcs/<int:plc_id>/stop', methods=['POST'])
 def stop_plc(plc_id):
     return stop_polling_controller(plc_id)
+
+
+@plc_bp.route('/plcs/ingest/stats', methods=['GET'])
+def ingest_stats():
+    return ingest_stats_controller()
+
+
+@plc_bp.route('/plcs/scan/stats', methods=['GET'])
+def scan_stats():
+    return scan_stats_controller()
+
+
+@plc_bp.route('/plcs/readings/export', methods=['GET'])
+def export_readings():
+    return export_readings_controller()
+
+
+@plc_bp.route('/plcs/readings/history', methods=['GET'])
+def history_readings():
+    return history_readings_controller()
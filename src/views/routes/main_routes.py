@@ -16,26 +16,11 @@ clps_por_pagina = 21
 def index():
     """Página principal do Dashboard, protegida por login."""
     
-    # PARA: Chame o método diretamente da CLASSE.
-    # Isso garante que você use a versão @staticmethod que retorna DICIONÁRIOS.
-    clps_lista = CLPService().buscar_todos_clps()
-
-    # O resto do seu código agora funcionará sem erros,
-    # pois `clps_lista` será uma lista de dicionários.
-    search_term = request.form.get("buscar_clp", "").lower()
-    if search_term:
-        clps_lista = [
-            clp for clp in clps_lista
-            if search_term in (clp.get('nome') or '').lower()
-        ]
-    
-    # ... O resto da função continua igual ...
-    page = request.args.get('page', 1, type=int)
-    inicio = (page - 1) * clps_por_pagina
-    fim = inicio + clps_por_pagina
-    clps_pagina = clps_lista[inicio:fim]
-    total_paginas = max(1, (len(clps_lista) + clps_por_pagina - 1) // clps_por_pagina)
-
+    # filtro, ordenação e paginação são feitos no banco (só a página atual é carregada)
+    search_term = (request.values.get("buscar_clp") or "").strip().lower()
+    page = max(1, request.args.get('page', 1, type=int))
+    clps_pagina, total = CLPService.buscar_pagina(search_term, page, clps_por_pagina)
+    total_paginas = max(1, (total + clps_por_pagina - 1) // clps_por_pagina)
 
     tag_term = []
 
@@ -44,7 +29,8 @@ def index():
         clps=clps_pagina,
         page=page,
         total_paginas=total_paginas,
+        total=total,
         valor=clps_por_pagina,
         search_term=search_term,
         tag_term=tag_term
-    )
\ No newline at end of file
+    )
\ No newline at end of file
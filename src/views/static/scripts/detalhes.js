@@ -124,35 +124,59 @@
         chart.update('quiet');
     }
 
-    // --- Atualização periódica ---
+    // --- Valores dos registradores ---
+    // estado local: o stream só manda os registradores que mudaram
+    const registersValues = {};
+
+    function renderizarRegistradores() {
+        const container = $('registers-container');
+        if (!container) return;
+        container.innerHTML = '';
+        const addresses = Object.keys(registersValues);
+        if (addresses.length === 0) {
+            container.innerHTML = '<p>Nenhum registrador lido ainda.</p>';
+            return;
+        }
+        addresses.forEach(addr => {
+            const card = document.createElement('div');
+            card.className = 'register-card';
+            card.innerHTML = `<div class="register-addr">${addr}</div><div class="register-val">${JSON.stringify(registersValues[addr])}</div>`;
+            container.appendChild(card);
+        });
+    }
+
+    function aplicarValores(registers) {
+        registers.forEach(r => {
+            registersValues[r.name ?? r.register_id] = { value: r.value, quality: r.quality, timestamp: r.timestamp };
+        });
+        renderizarRegistradores();
+        atualizarGraficoRegistradores(registersValues);
+    }
+
+    // --- Stream de valores (Server-Sent Events) ---
+    function conectarStream(ip) {
+        const source = new EventSource(`/clp/${encodeURIComponent(ip)}/stream`);
+        source.onmessage = event => {
+            try { aplicarValores(JSON.parse(event.data).registers || []); }
+            catch (err) { console.error('Evento inválido do stream', err); }
+        };
+        // em erro o EventSource reconecta sozinho e recebe o estado atual de novo
+        return source;
+    }
+
+    // navegador sem EventSource: consulta periódica
     async function atualizarInfo(ip) {
         const res = await fetchJson(`/clp/${encodeURIComponent(ip)}/values`, defaultFetchOpts('GET'));
         if (!res.ok || !res.data) return;
-        const clp = res.data;
-
-        // Atualiza cards de registradores
-        if ($('registers-container') && clp.registers_values) {
-            const container = $('registers-container');
-            container.innerHTML = '';
-            const addresses = Object.keys(clp.registers_values);
-            if (addresses.length === 0) {
-                container.innerHTML = '<p>Nenhum registrador lido ainda.</p>';
-            } else {
-                addresses.forEach(addr => {
-                    const card = document.createElement('div');
-                    card.className = 'register-card';
-                    card.innerHTML = `<div class="register-addr">${addr}</div><div class="register-val">${JSON.stringify(clp.registers_values[addr])}</div>`;
-                    container.appendChild(card);
-                });
-            }
-        }
-
-        // Atualiza os gráficos
-        if (clp.registers_values) {
-            atualizarGraficoRegistradores(clp.registers_values);
+        if (res.data.registers_values) {
+            Object.assign(registersValues, res.data.registers_values);
+            renderizarRegistradores();
+            atualizarGraficoRegistradores(registersValues);
         }
+    }
 
-        // **LÓGICA ADICIONADA: Atualiza CPU e Memória com dados simulados**
+    // CPU e memória ainda são simulados no navegador (não consultam o servidor)
+    function atualizarSimulados() {
         const fakeCpuUsage = Math.random() * 100;
         const fakeMemUsage = 50 + Math.random() * 20;
         atualizarGraficoSimples(charts.cpu, fakeCpuUsage.toFixed(2));
@@ -165,7 +189,13 @@
         if (!ip) return console.error('IP do CLP não encontrado.');
 
         criarGraficos();
-        atualizarInfo(ip);
-        setInterval(() => atualizarInfo(ip), 2000);
+        if ('EventSource' in window) {
+            conectarStream(ip);
+        } else {
+            atualizarInfo(ip);
+            setInterval(() => atualizarInfo(ip), 2000);
+        }
+        atualizarSimulados();
+        setInterval(atualizarSimulados, 2000);
     });
 })();
\ No newline at end of file
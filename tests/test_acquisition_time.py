@@ -0,0 +1,39 @@
+# tests/test_acquisition_time.py
+import asyncio
+from datetime import datetime, timezone
+
+from src.adapters.modbus_adapter import ModbusAdapter
+from src.adapters.read_planner import plan_reads
+
+
+def _regs():
+    return [{'id': i, 'address': i, 'register_type': 'holding', 'data_type': 'uint16',
+             'scale_factor': 1.0, 'offset': 0.0} for i in range(3)]
+
+
+def test_block_readings_share_one_wall_clock_timestamp():
+    adapter = ModbusAdapter('127.0.0.1')
+
+    async def _request(block):
+        return [10, 20, 30]
+
+    adapter._request_block = _request
+    block = plan_reads(_regs())[0]
+    before = datetime.now(timezone.utc)
+    results = asyncio.run(adapter._read_block(block))
+    after = datetime.now(timezone.utc)
+
+    stamps = {r['timestamp'] for r in results.values()}
+    assert len(stamps) == 1
+    assert before <= stamps.pop() <= after
+
+
+def test_failed_block_is_stamped_too():
+    adapter = ModbusAdapter('127.0.0.1')
+
+    async def _request(block):
+        raise TimeoutError("sem resposta")
+
+    adapter._request_block = _request
+    results = asyncio.run(adapter._read_block(plan_reads(_regs())[0]))
+    assert all(r['quality'] == 'bad' and r['timestamp'].tzinfo is not None for r in results.values())
@@ -0,0 +1,72 @@
+# tests/test_archive.py
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from src.db.archive import ColdArchive, decode_segment, encode_segment
+
+
+def test_segment_roundtrip_is_lossless():
+    ts = np.cumsum(np.r_[1_700_000_000_000_000, np.full(999, 1_000_000)]).astype('<i8')
+    ts[500] += 37  # jitter
+    raw = np.random.default_rng(1).normal(size=1000)
+    scaled = np.repeat([20.0, 20.5], 500)
+    quality = np.zeros(1000, np.uint8)
+    seg = decode_segment(encode_segment(ts, raw, scaled, quality))
+    assert np.array_equal(seg['timestamp'], ts)
+    assert np.array_equal(seg['raw_value'], raw)
+    assert np.array_equal(seg['scaled_value'], scaled)
+    assert np.array_equal(seg['quality'], quality)
+
+
+def test_archive_query_and_rewrite_is_idempotent(tmp_path):
+    archive = ColdArchive()
+    archive.configure(str(tmp_path))
+    start = datetime(2024, 5, 16, tzinfo=timezone.utc)
+    rows = [{'timestamp': start + timedelta(seconds=i), 'raw_value': i, 'scaled_value': i * 2.0,
+             'quality': 'bad' if i == 3 else 'good'} for i in range(10)]
+    archive.write_segment(7, date(2024, 5, 16), rows[::-1])
+    archive.write_segment(7, date(2024, 5, 16), rows)
+
+    result = archive.query(7, start + timedelta(seconds=2), start + timedelta(seconds=8), limit=5)
+    assert [r['raw_value'] for r in result] == [8, 7, 6, 5, 4]
+    assert archive.query(7, start, start + timedelta(seconds=9), limit=100)[-4]['quality'] == 'bad'
+    assert archive.drop_before(datetime(2024, 5, 17, tzinfo=timezone.utc)) == 1
+    assert archive.days() == []
+
+
+def test_rewrite_merges_with_existing_segment(tmp_path):
+    archive = ColdArchive()
+    archive.configure(str(tmp_path))
+    start = datetime(2024, 5, 16, tzinfo=timezone.utc)
+    rows = [{'timestamp': start + timedelta(seconds=i // 2), 'raw_value': i, 'scaled_value': i,
+             'quality': 'good'} for i in range(6)]  # dois valores distintos por timestamp
+    archive.write_segment(7, date(2024, 5, 16), rows)
+    archive.write_segment(7, date(2024, 5, 16), rows)
+    archive.write_segment(7, date(2024, 5, 16), [{'timestamp': start + timedelta(seconds=1, milliseconds=500),
+                                                 'raw_value': 99, 'scaled_value': 99, 'quality': 'bad'}])
+
+    result = list(archive.scan(7, start, start + timedelta(seconds=10)))
+    assert [r['raw_value'] for r in result] == [0, 1, 2, 3, 99, 4, 5]
+
+
+def test_late_reading_for_archived_day_is_not_lost(tmp_path):
+    from src.repositories.reading_repository import ReadingRepository
+    from src.services.archiver import ColdArchiver
+    from tests.utils.app import storage_app
+
+    app = storage_app(tmp_path)
+    day = datetime(2024, 5, 16, tzinfo=timezone.utc)
+    with app.app_context():
+        repository = ReadingRepository()
+        archiver = ColdArchiver(app)
+        repository.insert_columns([1] * 300, [day + timedelta(minutes=i) for i in range(300)],
+                                  range(300), range(300))
+        assert archiver.run_once() == 1
+
+        repository.insert_columns([1], [day + timedelta(hours=12)], [1000], [1000])
+        assert archiver.run_once() == 1
+
+        history = repository.get_historical_data(1, day, day + timedelta(days=1), limit=1000)
+        assert len(history) == 301
+        assert history[0]['raw_value'] == 1000
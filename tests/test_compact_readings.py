@@ -0,0 +1,68 @@
+# tests/test_compact_readings.py
+from datetime import datetime, timezone
+
+from src.repositories.compact_reading_repository import encode_row, decode_row
+
+
+def _reading(quality='good'):
+    return {'register_id': 3, 'timestamp': datetime(2024, 5, 16, 10, 0, 0, 123000, tzinfo=timezone.utc),
+            'raw_value': 250.0, 'scaled_value': 25.0, 'quality': quality}
+
+
+def test_round_trip_keeps_millisecond_timestamp_and_quality():
+    row = encode_row(_reading('bad'))
+    assert row['ts'] == 1715853600123
+    assert row['quality'] == 1
+    assert decode_row(row) == _reading('bad')
+
+
+def test_raw_only_applies_register_scale_on_read():
+    row = encode_row(_reading(), raw_only=True)
+    assert row['scaled_value'] is None
+    assert decode_row(row, scale=(0.1, 0.0))['scaled_value'] == 25.0
+
+
+def test_unknown_quality_is_stored_as_uncertain():
+    assert decode_row(encode_row(_reading('comm_error')))['quality'] == 'uncertain'
+
+
+def test_migrate_copies_hot_and_archived_rows_in_separate_transactions(tmp_path, monkeypatch):
+    from datetime import timedelta
+
+    from sqlalchemy import event, func, select
+
+    from src.db.storage import storage
+    from src.models.CompactReading import CompactReading
+    from src.repositories import compact_reading_repository
+    from src.repositories.compact_reading_repository import CompactReadingRepository
+    from src.repositories.reading_repository import ReadingRepository
+    from src.services.archiver import ColdArchiver
+    from tests.utils.app import storage_app
+
+    monkeypatch.setattr(compact_reading_repository, 'COMPACT_CHUNK_SIZE', 10)
+    app = storage_app(tmp_path)
+    archived = datetime(2024, 5, 16, tzinfo=timezone.utc)
+    hot = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    with app.app_context():
+        ReadingRepository().insert_columns([1] * 25, [archived + timedelta(minutes=i) for i in range(25)],
+                                           range(25), range(25))
+        assert ColdArchiver(app).run_once() == 1
+        ReadingRepository().insert_columns([1] * 15, [hot + timedelta(minutes=i) for i in range(15)],
+                                           range(15), range(15))
+
+        commits = []
+        event.listen(storage.writer_engine, 'commit', lambda conn: commits.append(1))
+        repository = CompactReadingRepository()
+        assert repository.migrate() == 40
+        assert len(commits) == 1 + 2 + 3  # delete + lotes de 10 (quente e arquivo)
+        assert repository.migrate() == 40  # refazer não duplica
+
+        def _count():
+            with storage.reader() as conn:
+                return conn.execute(select(func.count()).select_from(CompactReading.__table__)).scalar_one()
+        assert _count() == 40
+
+        assert repository.migrate(archived + timedelta(minutes=20), archived + timedelta(days=1)) == 5
+        assert _count() == 40
+        history = repository.get_historical_data(1, archived, archived + timedelta(days=1), limit=100)
+        assert [r['raw_value'] for r in history[:2]] == [24.0, 23.0]
@@ -0,0 +1,101 @@
+# tests/test_connection_registry.py
+import asyncio
+
+import pytest
+
+from src.adapters.connection_registry import ConnectionRegistry, GatewayConnection
+from src.adapters.modbus_adapter import ModbusAdapter
+from tests.utils.modbus import start_simulator
+
+
+class _SlowClient:
+    """Client falso: cada leitura demora um pouco e registra a ordem de atendimento"""
+    connected = True
+    window = 1
+
+    def __init__(self):
+        self.served = []
+
+    async def read(self, unit_id):
+        self.served.append(unit_id)
+        await asyncio.sleep(0.001)
+
+
+def _served_order(requests, max_in_flight=1):
+    gateway = GatewayConnection('10.0.0.1', 502, timeout=1, max_in_flight=max_in_flight)
+    gateway.client = _SlowClient()
+
+    async def _one(unit_id):
+        async with gateway.request(unit_id) as client:
+            await client.read(unit_id)
+
+    async def _run():
+        await asyncio.gather(*(_one(unit_id) for unit_id in requests))
+
+    asyncio.run(_run())
+    assert gateway._in_flight == 0 and not gateway._turns
+    return gateway.client.served
+
+
+def test_units_take_turns_on_a_shared_gateway():
+    # unit 1 dispara 10 blocos antes das units 2 e 3 pedirem um cada
+    served = _served_order([1] * 10 + [2, 3])
+    assert served.index(2) <= 2 and served.index(3) <= 3
+    assert served.count(1) == 10
+
+
+def test_cancelled_request_leaves_the_queue():
+    gateway = GatewayConnection('10.0.0.1', 502, timeout=1)
+    gateway.client = _SlowClient()
+
+    async def _run():
+        async def _hold():
+            async with gateway.request(1):
+                await asyncio.sleep(0.01)
+
+        holder = asyncio.create_task(_hold())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(gateway._acquire(2))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await holder
+        async with gateway.request(3) as client:
+            await client.read(3)
+
+    asyncio.run(asyncio.wait_for(_run(), 1))
+    assert gateway._in_flight == 0 and not gateway._waiting and not gateway._turns
+
+
+@pytest.fixture(scope='module')
+def simulator_port():
+    return start_simulator()
+
+
+def test_registry_shares_gateway_and_reconnects_after_last_release(simulator_port):
+    registry = ConnectionRegistry()
+
+    async def _run():
+        first = ModbusAdapter('127.0.0.1', simulator_port, unit_id=1, timeout=2, registry=registry)
+        second = ModbusAdapter('127.0.0.1', simulator_port, unit_id=2, timeout=2, registry=registry)
+        assert await first.connect() and await second.connect()
+        shared = first.connection
+        assert second.connection is shared and shared.refs == 2
+
+        await first.disconnect()
+        assert shared.refs == 1 and shared.connected
+        assert registry.stats() == {f'127.0.0.1:{simulator_port}': {'refs': 1, 'window': 1}}
+
+        await second.disconnect()
+        assert shared.client is None
+        assert registry.stats() == {}
+
+        assert await first.connect()
+        assert first.connection is not shared and first.connection.refs == 1
+        regs = [{'id': 1, 'address': 0, 'register_type': 'holding', 'data_type': 'uint16',
+                 'scale_factor': 1.0, 'offset': 0.0}]
+        readings = await first.read_registers(regs)
+        await first.disconnect()
+        return readings
+
+    readings = asyncio.run(_run())
+    assert readings[0]['quality'] == 'good'
@@ -0,0 +1,85 @@
+# tests/test_connection_supervisor.py
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.services import connection_supervisor
+from src.services.connection_supervisor import (
+    ConnectionSupervisor, CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    state = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(connection_supervisor, 'time', SimpleNamespace(monotonic=lambda: state.now))
+    return state
+
+
+class _FakeAdapter:
+    """Falha nas primeiras `failures` tentativas e depois responde"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.attempts = []
+
+    def read(self, now):
+        self.attempts.append(now)
+        if len(self.attempts) <= self.failures:
+            raise ConnectionError("sem resposta")
+
+
+def _poll(supervisor, adapter, clock, until, step=0.125):
+    """Ciclos do poller a cada `step` s (exato em ponto flutuante), como em PollingService._poll_plc_loop"""
+    states = []
+    while clock.now < until:
+        if supervisor.allow_request():
+            try:
+                adapter.read(clock.now)
+                supervisor.record_success()
+            except ConnectionError as e:
+                supervisor.record_failure(e)
+            states.append(supervisor.state)
+        clock.now += step
+    return states
+
+
+def test_open_half_open_closed_with_exponential_backoff(clock):
+    supervisor = ConnectionSupervisor(base_delay=1.0, max_delay=60.0, failure_threshold=3, jitter=0)
+    adapter = _FakeAdapter(failures=5)
+    states = _poll(supervisor, adapter, clock, until=10)
+
+    # 3 falhas seguidas abrem; provas half-open após 1 s, depois 2 s, depois 4 s
+    assert adapter.attempts[:3] == [0.0, 0.125, 0.25]
+    assert adapter.attempts[3:6] == [1.25, 3.25, 7.25]
+    assert states[:6] == [CIRCUIT_CLOSED, CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_OPEN, CIRCUIT_OPEN, CIRCUIT_CLOSED]
+    assert supervisor.trips == 1 and supervisor.reconnects == 1
+    assert supervisor.state == CIRCUIT_CLOSED and supervisor.consecutive_failures == 0
+    assert len(adapter.attempts) == 6 + (10 - 7.375) / 0.125  # fechado: lê todo ciclo
+
+
+def test_half_open_allows_a_single_probe(clock):
+    supervisor = ConnectionSupervisor(base_delay=1.0, failure_threshold=1, jitter=0)
+    assert supervisor.record_failure("timeout") is True
+    assert supervisor.allow_request() is False
+    assert supervisor.stats()['retry_in_s'] == 1.0
+
+    clock.now = 1.0
+    assert supervisor.allow_request() is True and supervisor.state == CIRCUIT_HALF_OPEN
+    assert supervisor.record_failure("timeout") is False   # reabre sem contar nova queda
+    assert supervisor.state == CIRCUIT_OPEN and supervisor.trips == 1
+    assert supervisor.retry_at == pytest.approx(3.0)
+    assert supervisor.stats()['last_error'] == 'timeout'
+
+
+def test_backoff_is_capped_and_jittered(clock):
+    random.seed(3)
+    supervisor = ConnectionSupervisor(base_delay=1.0, max_delay=8.0, failure_threshold=1, jitter=0.5)
+    delays = []
+    for _ in range(8):
+        supervisor.record_failure()
+        delays.append(supervisor.current_delay)
+    nominal = [1, 2, 4, 8, 8, 8, 8, 8]
+    assert all(0.5 * n <= d <= 1.5 * n for d, n in zip(delays, nominal))
+    assert len(set(delays[3:])) > 1  # jitter: quedas simultâneas não voltam juntas
@@ -0,0 +1,48 @@
+# tests/test_current_values.py
+from datetime import datetime, timedelta, timezone
+
+from src.services.current_values import CurrentValueCache
+
+
+def _row(register_id, value, seconds):
+    ts = datetime(2024, 5, 16, tzinfo=timezone.utc) + timedelta(seconds=seconds)
+    return {'register_id': register_id, 'timestamp': ts, 'raw_value': value,
+            'scaled_value': value, 'quality': 'good'}
+
+
+def _cache():
+    cache = CurrentValueCache()
+    cache._store(1, dict(_row(10, 1.0, 0), name='temp', unit='°C'))
+    cache._store(1, _row(11, 2.0, 0))
+    cache._loaded = True
+    return cache
+
+
+def test_update_keeps_newest_value_and_register_metadata():
+    cache = _cache()
+    cache.update([_row(10, 5.0, 20), _row(10, 4.0, 10), _row(11, 9.0, -5)])
+    assert cache.get(10)['scaled_value'] == 5.0
+    assert cache.get(10)['name'] == 'temp'
+    assert cache.get(11)['scaled_value'] == 2.0
+
+
+def test_for_plc_and_fleet():
+    cache = _cache()
+    assert sorted(r['register_id'] for r in cache.for_plc(1)) == [10, 11]
+    assert cache.for_plc(2) == []
+    cache.forget_plc(1)
+    assert cache.fleet() == {}
+
+
+def test_record_stores_decoded_values_with_register_metadata():
+    cache = _cache()
+    registers = {10: {'id': 10, 'name': 'temp', 'unit': '°C'}, 12: {'id': 12, 'name': 'nivel', 'unit': '%'}}
+    cache.record(1, [_row(10, 7.0, 30), _row(12, 55.0, 30), _row(99, 1.0, 30)], registers, '10.0.0.5')
+    assert cache.get(10)['scaled_value'] == 7.0
+    assert (cache.get(12)['name'], cache.get(12)['unit']) == ('nivel', '%')
+    assert cache.get(99) is None
+    assert sorted(r['register_id'] for r in cache.for_plc(1)) == [10, 11, 12]
+    assert cache.plc_for_ip('10.0.0.5') == 1
+
+    cache.record(1, [_row(10, 3.0, 0)], registers)
+    assert cache.get(10)['scaled_value'] == 7.0
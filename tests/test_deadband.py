@@ -0,0 +1,32 @@
+# tests/test_deadband.py
+from src.services.deadband import DeadbandFilter
+
+
+def _row(value, quality='good'):
+    return {'register_id': 1, 'raw_value': value, 'scaled_value': value, 'quality': quality}
+
+
+def test_without_deadband_every_reading_is_stored():
+    f = DeadbandFilter()
+    regs = {1: {'id': 1}}
+    assert len(f.filter([_row(1.0)], regs)) == 1
+    assert len(f.filter([_row(1.0)], regs)) == 1
+
+
+def test_absolute_deadband_and_quality_change():
+    f = DeadbandFilter()
+    reg = {'id': 1, 'deadband': 0.5}
+    assert f.should_store(reg, 10.0, 'good', now=0)
+    f.filter([_row(10.0)], {1: reg})
+    assert not f.should_store(reg, 10.4, 'good', now=1)
+    assert f.should_store(reg, 10.6, 'good', now=1)
+    assert f.should_store(reg, 10.0, 'bad', now=1)
+
+
+def test_percent_deadband_and_heartbeat():
+    f = DeadbandFilter()
+    reg = {'id': 1, 'deadband': 10, 'deadband_mode': 'percent', 'heartbeat_interval': 60000}
+    f._last[1] = (100.0, 'good', 0.0)
+    assert not f.should_store(reg, 109.0, 'good', now=10)
+    assert f.should_store(reg, 111.0, 'good', now=10)
+    assert f.should_store(reg, 100.0, 'good', now=60)
@@ -0,0 +1,63 @@
+# tests/test_decoding.py
+import struct
+
+import pytest
+
+from src.adapters.decoding import BlockDecoder
+from src.adapters.read_planner import plan_reads
+
+
+def _reg(id, address, data_type='uint16', **kwargs):
+    reg = {'id': id, 'address': address, 'register_type': 'holding', 'data_type': data_type,
+           'scale_factor': 1.0, 'offset': 0.0}
+    reg.update(kwargs)
+    return reg
+
+
+def _decode(regs, words):
+    block = plan_reads(regs, max_gap=10)[0]
+    return {reg['id']: (raw, scaled) for reg, raw, scaled in BlockDecoder(block).decode(words)}
+
+
+def _float_words(value, order):
+    a, b, c, d = struct.pack('>f', value)
+    layout = {'ABCD': (a, b, c, d), 'CDAB': (c, d, a, b), 'BADC': (b, a, d, c), 'DCBA': (d, c, b, a)}[order]
+    return [layout[0] << 8 | layout[1], layout[2] << 8 | layout[3]]
+
+
+@pytest.mark.parametrize('order,byte_order,word_order', [
+    ('ABCD', 'big', 'big'),
+    ('CDAB', 'big', 'little'),
+    ('BADC', 'little', 'big'),
+    ('DCBA', 'little', 'little'),
+])
+def test_float32_byte_and_word_order(order, byte_order, word_order):
+    regs = [_reg(1, 0, 'float32', byte_order=byte_order, word_order=word_order)]
+    raw, _ = _decode(regs, _float_words(12.5, order))[1]
+    assert raw == 12.5
+
+
+def test_mixed_types_and_scaling_in_one_block():
+    regs = [
+        _reg(1, 0, 'int16', scale_factor=0.1),
+        _reg(2, 1, 'uint32'),
+        _reg(3, 4, 'float64', offset=1.0),
+        _reg(4, 8, 'bit', bit_index=3),
+        _reg(5, 9, 'string', length=2),
+    ]
+    words = [0xFFF6, 0x0001, 0x0002, 0]
+    words += list(struct.unpack('>4H', struct.pack('>d', 2.5)))
+    words += [0b1000, 0x4142, 0x4300]
+    result = _decode(regs, words)
+    assert result[1][0] == -10
+    assert result[1][1] == pytest.approx(-1.0)
+    assert result[2][0] == 0x00010002
+    assert result[3] == (2.5, 3.5)
+    assert result[4][0] == 1.0
+    assert result[5][0] == 'ABC'
+
+
+def test_coils_decode_as_bool():
+    regs = [dict(_reg(1, 0), register_type='coil'), dict(_reg(2, 2), register_type='coil')]
+    result = _decode(regs, [True, False, False])
+    assert result == {1: (1.0, 1.0), 2: (0.0, 0.0)}
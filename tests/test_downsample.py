@@ -0,0 +1,45 @@
+# tests/test_downsample.py
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from src.models.Rollup import Rollup1m, Rollup1h
+from src.services.downsample import lttb, minmax
+from src.services.trend_service import TrendService
+
+
+def _series(n):
+    x = np.arange(n, dtype=np.float64)
+    y = np.sin(x / 50.0)
+    y[n // 3] = 25.0  # pico isolado
+    return x, y
+
+
+def test_lttb_keeps_endpoints_order_and_peak():
+    x, y = _series(10000)
+    keep = lttb(x, y, 500)
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == 9999
+    assert np.all(np.diff(keep) > 0)
+    assert 10000 // 3 in keep
+
+
+def test_lttb_returns_everything_when_below_threshold():
+    x, y = _series(10)
+    assert list(lttb(x, y, 100)) == list(range(10))
+
+
+def test_minmax_keeps_extremes_of_every_bucket():
+    x, y = _series(10000)
+    keep = minmax(x, y, 100)
+    assert len(keep) <= 200
+    assert np.all(np.diff(keep) > 0)
+    assert y[keep].max() == 25.0
+    assert y[keep].min() == y.min()
+
+
+def test_source_picks_coarsest_rollup_that_fits_one_point():
+    end = datetime(2024, 5, 16, tzinfo=timezone.utc)
+    assert TrendService.source_for(end - timedelta(hours=6), end, 1000) is None
+    assert TrendService.source_for(end - timedelta(days=7), end, 1000) is Rollup1m
+    assert TrendService.source_for(end - timedelta(days=365), end, 2000) is Rollup1h
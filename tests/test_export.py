@@ -0,0 +1,44 @@
+# tests/test_export.py
+import json
+from datetime import datetime, timedelta, timezone
+
+from src.services import export_service
+from src.services.export_service import ExportService
+
+
+def _rows(n):
+    start = datetime(2024, 5, 16, tzinfo=timezone.utc)
+    for i in range(n):
+        yield {'register_id': 1, 'timestamp': start + timedelta(seconds=i), 'raw_value': i,
+               'scaled_value': i / 10, 'quality': 'good'}
+
+
+def test_csv_is_streamed_in_chunks(monkeypatch):
+    monkeypatch.setattr(export_service, 'FLUSH_ROWS', 2)
+    chunks = list(ExportService._csv(_rows(5)))
+    assert len(chunks) == 3
+    lines = ''.join(chunks).splitlines()
+    assert lines[0] == 'register_id,timestamp,raw_value,scaled_value,quality'
+    assert lines[1] == '1,2024-05-16T00:00:00+00:00,0,0.0,good'
+    assert len(lines) == 6
+
+
+def test_ndjson_one_object_per_line():
+    lines = ''.join(ExportService._ndjson(_rows(3))).splitlines()
+    assert [json.loads(line)['raw_value'] for line in lines] == [0, 1, 2]
+
+
+def test_export_window_with_utc_offset(tmp_path):
+    from src.repositories.reading_repository import ReadingRepository
+    from tests.utils.app import storage_app
+
+    app = storage_app(tmp_path)
+    with app.app_context():
+        ReadingRepository().insert_columns([1], [datetime(2024, 5, 16, 12, tzinfo=timezone.utc)], [5], [0.5])
+
+    client = app.test_client()
+    response = client.get('/plcs/readings/export?register_id=1&format=ndjson'
+                          '&start=2024-05-16T08:30:00-03:00&end=2024-05-16T09:30:00-03:00')
+    assert response.status_code == 200
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['raw_value'] for line in lines] == [5]
@@ -0,0 +1,30 @@
+# tests/test_history_downsample.py
+from datetime import datetime, timezone
+
+import pytest
+
+from src.repositories.reading_repository import ReadingRepository
+from tests.utils.app import storage_app
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = storage_app(tmp_path)
+    with app.app_context():
+        ReadingRepository().insert_columns([1], [datetime(2024, 5, 16, 12, tzinfo=timezone.utc)], [5], [0.5])
+    return app.test_client()
+
+
+def test_history_window_with_utc_offset(client):
+    response = client.get('/plcs/readings/history?register_id=1'
+                          '&start=2024-05-16T08:30:00-03:00&end=2024-05-16T09:30:00-03:00')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['source'] == 'raw'
+    assert body['points'] == [[int(datetime(2024, 5, 16, 12, tzinfo=timezone.utc).timestamp() * 1000), 0.5]]
+
+
+def test_history_rejects_invalid_parameters(client):
+    assert client.get('/plcs/readings/history?register_id=1&method=avg').status_code == 400
+    assert client.get('/plcs/readings/history?register_id=1&points=1').status_code == 400
+    assert client.get('/plcs/readings/history').status_code == 400
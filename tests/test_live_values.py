@@ -0,0 +1,86 @@
+# tests/test_live_values.py
+import json
+from datetime import datetime, timezone
+
+from src.services.live_values import LiveValueBroadcaster
+
+REGISTERS = {1: {'id': 1, 'name': 'temp', 'unit': '°C'}, 2: {'id': 2, 'name': 'pressao', 'unit': 'bar'}}
+TS = datetime(2024, 5, 16, 10, tzinfo=timezone.utc)
+
+
+def _reading(register_id, value, quality='good'):
+    return {'register_id': register_id, 'raw_value': value, 'scaled_value': value, 'quality': quality,
+            'timestamp': TS}
+
+
+def _payload(event):
+    assert event.startswith('data: ')
+    return json.loads(event[len('data: '):])['registers']
+
+
+def test_only_changed_registers_reach_subscribers():
+    live = LiveValueBroadcaster()
+    live.publish(1, [_reading(1, 10.0), _reading(2, 1.0)], REGISTERS)
+    sub = live.subscribe(1)
+    live.publish(1, [_reading(1, 10.0), _reading(2, 1.5)], REGISTERS)
+    live.publish(1, [_reading(1, 10.0, 'bad'), _reading(2, 1.5)], REGISTERS)
+    changes = sub.wait(0)
+    assert sorted(changes) == [1, 2]
+    assert changes[1]['quality'] == 'bad' and changes[2]['value'] == 1.5
+    assert sub.wait(0) == {}
+
+
+def test_stream_starts_with_snapshot_and_unsubscribes_on_close():
+    live = LiveValueBroadcaster()
+    live.publish(7, [_reading(1, 3.0)], REGISTERS)
+    stream = live.stream(7, keepalive=0)
+    [first] = _payload(next(stream))
+    assert (first['name'], first['value'], first['timestamp']) == ('temp', 3.0, TS.isoformat())
+    assert next(stream) == ': keepalive\n\n'
+
+    live.publish(7, [_reading(1, 4.0)], REGISTERS)
+    assert [r['value'] for r in _payload(next(stream))] == [4.0]
+    assert live.stats()['subscribers'] == 1
+    stream.close()
+    assert live.stats()['subscribers'] == 0
+
+
+def test_stream_snapshot_is_seeded_before_first_publish():
+    seeded = [dict(_reading(1, 2.0), name='temp', unit='°C'), dict(_reading(2, 0.5), name='pressao', unit='bar')]
+    live = LiveValueBroadcaster(seed=lambda plc_id: seeded if plc_id == 7 else [])
+    live.publish(7, [_reading(2, 0.7)], REGISTERS)
+
+    stream = live.stream(7, keepalive=0)
+    first = {r['register_id']: r for r in _payload(next(stream))}
+    assert (first[1]['name'], first[1]['value']) == ('temp', 2.0)
+    assert first[2]['value'] == 0.7  # o publicado vale mais que a semente
+    assert _payload(next(live.stream(8))) == []
+
+    live.publish(7, [_reading(1, 2.0), _reading(2, 0.7)], REGISTERS)
+    assert next(stream) == ': keepalive\n\n'  # nada mudou em relação à semente
+    stream.close()
+
+
+def test_stream_seed_reads_current_values_table(tmp_path):
+    from src.db import db
+    from src.models import PLC, Register
+    from src.repositories.reading_repository import ReadingRepository
+    from src.services.current_values import CurrentValueCache, current_values
+    from src.services.live_values import live_values
+    from tests.utils.app import storage_app
+
+    assert live_values.seed == current_values.for_plc
+
+    app = storage_app(tmp_path)
+    with app.app_context():
+        plc = PLC(name='p1', ip_address='10.0.0.1', portas=[502])
+        plc.registers = [Register(name='temp', unit='°C', address=0, register_type='holding')]
+        db.session.add(plc)
+        db.session.commit()
+        register_id = plc.registers[0].id
+        ReadingRepository().insert_columns([register_id] * 2, [TS, TS.replace(minute=1)], [20, 21], [2.0, 2.1])
+
+        live = LiveValueBroadcaster(seed=CurrentValueCache().for_plc)
+        [first] = _payload(next(live.stream(plc.id)))
+    assert (first['register_id'], first['name'], first['value']) == (register_id, 'temp', 2.1)
+    assert first['timestamp'] == TS.replace(minute=1).isoformat()
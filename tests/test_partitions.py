@@ -0,0 +1,65 @@
+# tests/test_partitions.py
+from datetime import date, datetime, timezone
+
+from src.db.partitions import ReadingPartitions, PARTITION_WEEK
+
+
+def _with_partitions(partitions, *keys):
+    for key in keys:
+        partitions._tables[key] = partitions._table(key)
+    partitions._loaded = True
+    return partitions
+
+
+def test_daily_and_weekly_keys():
+    ts = datetime(2024, 5, 16, 23, 59, tzinfo=timezone.utc)  # quinta-feira
+    assert ReadingPartitions().partition_key(ts) == date(2024, 5, 16)
+    assert ReadingPartitions(PARTITION_WEEK).partition_key(ts) == date(2024, 5, 13)
+    assert ReadingPartitions.table_name(date(2024, 5, 13)) == 'readings_20240513'
+
+
+def test_range_only_touches_overlapping_partitions():
+    p = _with_partitions(ReadingPartitions(), date(2024, 5, 14), date(2024, 5, 15), date(2024, 5, 16))
+    tables = p.tables_for_range(datetime(2024, 5, 15, 12, tzinfo=timezone.utc),
+                                datetime(2024, 5, 16, 1, tzinfo=timezone.utc))
+    assert [t.name for t in tables] == ['readings_20240516', 'readings_20240515']
+
+
+def test_expired_partitions_end_before_cutoff():
+    p = _with_partitions(ReadingPartitions(), date(2024, 5, 14), date(2024, 5, 15))
+    assert p.expired(datetime(2024, 5, 15, 12, tzinfo=timezone.utc)) == [date(2024, 5, 14)]
+
+
+def test_new_partition_is_visible_only_after_publish(tmp_path):
+    from sqlalchemy import create_engine, inspect
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'p.db'}")
+    p = ReadingPartitions()
+    p.load(engine)
+    key = date(2024, 5, 16)
+    day = datetime(2024, 5, 16, 12, tzinfo=timezone.utc)
+
+    created = {}
+    with engine.begin() as conn:
+        table = p.ensure(conn, key, created)
+        assert p.ensure(conn, key, created) is table
+        assert p.tables_for_range(day, day) == []  # DDL ainda não confirmado
+    p.publish(created)
+    assert [t.name for t in p.tables_for_range(day, day)] == ['readings_20240516']
+
+    created = {}
+    try:
+        with engine.begin() as conn:
+            p.ensure(conn, date(2024, 5, 17), created)
+            raise RuntimeError("falha no lote")
+    except RuntimeError:
+        pass
+    assert p.table(date(2024, 5, 17)) is None
+
+    # o pysqlite executa DDL fora da transação: a tabela pode ter sobrado e é reaproveitada
+    created = {}
+    with engine.begin() as conn:
+        p.ensure(conn, date(2024, 5, 17), created)
+    p.publish(created)
+    assert p.table(date(2024, 5, 17)) is not None
+    assert 'readings_20240517' in inspect(engine).get_table_names()
@@ -0,0 +1,68 @@
+# tests/test_plc_search.py
+import pytest
+from flask import Flask
+from sqlalchemy import insert
+
+from src.db import db
+from src.models import PLC
+from src.repositories.plc_repository import PLCRepository
+
+
+@pytest.fixture
+def plcs():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(PLC), [
+            {'name': f'Bomba-{i:03d}', 'ip_address': f'10.0.{i // 100}.{i % 100}', 'mac': f'AA:{i:04X}'}
+            for i in range(250)
+        ] + [{'name': 'caldeira', 'ip_address': '192.168.0.1', 'mac': 'FF:0001'}])
+        db.session.commit()
+        yield PLCRepository()
+
+
+def test_pages_are_ordered_by_name_with_total(plcs):
+    rows, total = plcs.search(None, limit=21, offset=21)
+    assert total == 251
+    assert [r.name for r in rows][:2] == ['Bomba-021', 'Bomba-022']
+    assert plcs.search(None, limit=21, offset=300) == ([], 251)
+
+
+def test_prefix_filter_on_name_ip_and_mac_ignores_case(plcs):
+    assert plcs.search('BOMBA-24')[1] == 10
+    assert [r.name for r in plcs.search('192.168.')[0]] == ['caldeira']
+    assert [r.name for r in plcs.search('ff:')[0]] == ['caldeira']
+    assert plcs.search('ombra')[1] == 0
+
+
+def test_prefix_ending_in_high_code_points(plcs):
+    db.session.execute(insert(PLC), [
+        {'name': 'zona\uffff', 'ip_address': '10.9.0.1'},
+        {'name': 'zona\U00010000', 'ip_address': '10.9.0.2'},
+        {'name': 'zona\U0010ffffb', 'ip_address': '10.9.0.3'},
+    ])
+    db.session.commit()
+    assert [r.ip_address for r in plcs.search('zona\uffff')[0]] == ['10.9.0.1']
+    assert [r.ip_address for r in plcs.search('zona\U0010ffff')[0]] == ['10.9.0.3']
+    assert plcs.search('\U0010ffff')[1] == 0
+
+
+def test_accented_names_ignore_case(plcs):
+    db.session.execute(insert(PLC), [
+        {'name': 'Área Norte', 'ip_address': '10.8.0.1'},
+        {'name': 'ÉTER', 'ip_address': '10.8.0.2'},
+    ])
+    db.session.add(PLC(name='Água Sul', ip_address='10.8.0.3'))
+    db.session.commit()
+    assert [r.name for r in plcs.search('área')[0]] == ['Área Norte']
+    assert [r.name for r in plcs.search('ÁREA N')[0]] == ['Área Norte']
+    assert [r.name for r in plcs.search('éter')[0]] == ['ÉTER']
+    assert [r.name for r in plcs.search('ÁGUA')[0]] == ['Água Sul']
+
+    plc = db.session.get(PLC, plcs.search('água')[0][0].id)
+    plc.name = 'Óleo'
+    db.session.commit()
+    assert plcs.search('água')[1] == 0
+    assert [r.name for r in plcs.search('óleo')[0]] == ['Óleo']
@@ -0,0 +1,58 @@
+# tests/test_plc_summary.py
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask
+from sqlalchemy import event, insert
+
+from src.db import db
+from src.models import PLC, Register, CurrentValue
+from src.services.plc_service import CLPService
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(PLC), [
+            {'id': i, 'name': f'p{i}', 'ip_address': f'10.0.0.{i}', 'manual': i == 3} for i in range(1, 4)
+        ])
+        db.session.execute(insert(Register), [
+            {'id': r, 'plc_id': 1, 'name': f'r{r}', 'address': r, 'register_type': 'holding', 'is_active': r != 3}
+            for r in range(1, 4)
+        ] + [{'id': 4, 'plc_id': 3, 'name': 'r4', 'address': 0, 'register_type': 'coil'}])
+        db.session.execute(insert(CurrentValue), [
+            {'register_id': 1, 'timestamp': datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+             'raw_value': 1, 'scaled_value': 1, 'quality': 'good'},
+            {'register_id': 2, 'timestamp': datetime(2024, 1, 1, 13, tzinfo=timezone.utc),
+             'raw_value': 0, 'scaled_value': 0, 'quality': 'bad'},
+        ])
+        db.session.commit()
+        yield app
+
+
+def test_summaries_aggregate_registers_in_a_single_query(app):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        summaries = CLPService.listar_resumos()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert len(statements) == 1
+    by_id = {s['id']: s for s in summaries}
+    assert [by_id[i]['register_count'] for i in (1, 2, 3)] == [3, 0, 1]
+    assert by_id[1]['active_register_count'] == 2
+    assert by_id[1]['bad_register_count'] == 1
+    assert by_id[1]['last_reading_at'] == '2024-01-01T13:00:00+00:00'
+    assert by_id[2]['last_reading_at'] is None
+
+
+def test_summary_filters_and_matches_to_dict(app):
+    assert [s['id'] for s in CLPService.listar_resumos(manual=False)] == [1, 2]
+    summary = CLPService.listar_resumos(manual=True)[0]
+    assert {k: summary[k] for k in db.session.get(PLC, 3).to_dict()} == db.session.get(PLC, 3).to_dict()
@@ -0,0 +1,67 @@
+# tests/test_poll_scheduler.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.services import poll_scheduler
+from src.services.poll_scheduler import FixedRateScheduler, OVERRUN_MERGE
+from src.services.polling_service import PollingService
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Relógio falso: wall = monotônico + 1000; asyncio.sleep só avança o relógio"""
+    state = SimpleNamespace(now=0.0)
+
+    async def _sleep(delay):
+        state.now += delay
+
+    monkeypatch.setattr(poll_scheduler, 'time', SimpleNamespace(monotonic=lambda: state.now,
+                                                                time=lambda: state.now + 1000.0))
+    monkeypatch.setattr(poll_scheduler, 'asyncio', SimpleNamespace(sleep=_sleep))
+    return state
+
+
+def _tick(scheduler, work=0.0, clock=None):
+    nominal = asyncio.run(scheduler.wait_next())
+    if clock is not None:
+        clock.now += work
+    return round(nominal, 6)
+
+
+def test_ticks_stay_on_the_grid_regardless_of_work_time(clock):
+    clock.now = 0.3
+    scheduler = FixedRateScheduler(1.0)
+    assert [_tick(scheduler, 0.7, clock) for _ in range(3)] == [1001.0, 1002.0, 1003.0]
+    assert scheduler.overruns == 0 and scheduler.skipped_ticks == 0
+
+
+def test_overrun_skips_missed_ticks(clock):
+    scheduler = FixedRateScheduler(1.0)
+    assert _tick(scheduler, 2.5, clock) == 1001.0   # ciclo termina em 1003.5
+    assert _tick(scheduler) == 1004.0               # 1002 e 1003 descartados
+    assert scheduler.overruns == 1 and scheduler.skipped_ticks == 2
+    assert scheduler.stats()['skipped_ticks'] == 2
+
+
+def test_overrun_merge_reads_once_immediately(clock):
+    scheduler = FixedRateScheduler(1.0, overrun_policy=OVERRUN_MERGE)
+    assert _tick(scheduler, 2.5, clock) == 1001.0
+    assert _tick(scheduler) == 1003.0               # leitura imediata no lugar de 1002 e 1003
+    assert clock.now == pytest.approx(3.5)
+    assert _tick(scheduler) == 1004.0
+    assert scheduler.overruns == 1 and scheduler.skipped_ticks == 1
+
+
+def test_phase_offsets_the_grid(clock):
+    scheduler = FixedRateScheduler(1.0, phase=0.25)
+    assert [_tick(scheduler) for _ in range(2)] == [1000.25, 1001.25]
+
+
+def test_plc_phases_are_spread_over_the_period():
+    phases = sorted(PollingService._scan_phase(plc_id, 1.0) for plc_id in range(1, 11))
+    assert all(0 <= p < 1.0 for p in phases)
+    # 10 PLCs: nenhuma distância entre fases vizinhas é menor que 1/20 do período
+    assert min(b - a for a, b in zip(phases, phases[1:])) > 0.05
+    assert PollingService._scan_phase(3, 2.0) == pytest.approx(2 * PollingService._scan_phase(3, 1.0))
@@ -0,0 +1,81 @@
+# tests/test_read_plan_cache.py
+import asyncio
+
+import pytest
+from flask import Flask
+
+from src.db import db
+from src.models import PLC, Register
+from src.services.polling_service import PollingService
+from src.services.read_plan_cache import read_plan_cache
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        for plc_id in (1, 2):
+            plc = PLC(id=plc_id, name=f'p{plc_id}', ip_address=f'10.0.0.{plc_id}', portas=[502])
+            plc.registers = [Register(name=f'r{plc_id}', address=0, register_type='holding')]
+            db.session.add(plc)
+        db.session.commit()
+        read_plan_cache.invalidate()
+        yield app
+
+
+def _fresh_plans():
+    return {plc_id: read_plan_cache.build(plc_id) for plc_id in (1, 2)}
+
+
+def test_plan_is_invalidated_after_commit_only(app):
+    _fresh_plans()
+    register = db.session.get(Register, 1)
+    register.address = 10
+    db.session.flush()
+    assert read_plan_cache.get(1) is not None  # ainda não confirmado
+
+    db.session.commit()
+    assert read_plan_cache.get(1) is None
+    assert read_plan_cache.get(2) is not None
+    assert read_plan_cache.build(1).blocks[0].start == 10
+
+
+def test_runtime_fields_and_rollback_keep_the_plan(app):
+    _fresh_plans()
+    db.session.get(PLC, 1).is_online = True
+    db.session.commit()
+    db.session.get(PLC, 2).unit_id = 7
+    db.session.flush()
+    db.session.rollback()
+    assert read_plan_cache.get(1) is not None
+    assert read_plan_cache.get(2) is not None
+
+
+def test_moving_a_register_invalidates_both_plcs(app):
+    _fresh_plans()
+    db.session.get(Register, 1).plc_id = 2
+    db.session.commit()
+    assert read_plan_cache.get(1) is None and read_plan_cache.get(2) is None
+    assert len(read_plan_cache.build(2).registers) == 2
+
+
+def test_connection_change_recreates_the_adapter(app):
+    service = PollingService(app)
+    plan = read_plan_cache.build(1)
+    adapter = service._create_adapter(plan)
+
+    async def _refresh(plan):
+        return await service._refresh_adapter(1, adapter, plan)
+
+    assert asyncio.run(_refresh(plan)) is adapter
+
+    plc = db.session.get(PLC, 1)
+    plc.ip_address, plc.pipeline_window = '10.0.0.9', 4
+    db.session.commit()
+    new_plan = read_plan_cache.build(1)
+    replaced = asyncio.run(_refresh(new_plan))
+    assert replaced is not adapter and service.adapters[1] is replaced
+    assert (replaced.ip_address, replaced.max_in_flight) == ('10.0.0.9', 4)
@@ -0,0 +1,47 @@
+# tests/test_read_planner.py
+from src.adapters.read_planner import plan_reads, MAX_WORDS_PER_READ
+
+
+def _reg(id, address, register_type='holding', data_type='uint16'):
+    return {'id': id, 'address': address, 'register_type': register_type, 'data_type': data_type}
+
+
+def test_contiguous_registers_become_one_block():
+    blocks = plan_reads([_reg(1, 0), _reg(2, 1), _reg(3, 2)], max_gap=0)
+    assert len(blocks) == 1
+    assert blocks[0].start == 0
+    assert blocks[0].count == 3
+
+
+def test_gap_threshold_controls_merging():
+    regs = [_reg(1, 0), _reg(2, 5)]
+    assert len(plan_reads(regs, max_gap=3)) == 2
+    blocks = plan_reads(regs, max_gap=4)
+    assert len(blocks) == 1
+    assert blocks[0].count == 6
+
+
+def test_groups_by_type_and_unit():
+    regs = [
+        _reg(1, 0),
+        _reg(2, 1, register_type='input'),
+        dict(_reg(3, 2), unit_id=2),
+        _reg(4, 0, register_type='coil'),
+    ]
+    blocks = plan_reads(regs, default_unit_id=1, max_gap=10)
+    keys = sorted((b.register_type, b.unit_id) for b in blocks)
+    assert keys == [('coil', 1), ('holding', 1), ('holding', 2), ('input', 1)]
+
+
+def test_block_respects_protocol_limit():
+    regs = [_reg(i, i) for i in range(MAX_WORDS_PER_READ + 10)]
+    blocks = plan_reads(regs, max_gap=0)
+    assert [b.count for b in blocks] == [MAX_WORDS_PER_READ, 10]
+
+
+def test_split_uses_data_type_width():
+    regs = [_reg(1, 10, data_type='float32'), _reg(2, 13)]
+    block = plan_reads(regs, max_gap=2)[0]
+    assert block.count == 4
+    parts = dict((reg['id'], words) for reg, words in block.split([1, 2, 3, 4]))
+    assert parts == {1: [1, 2], 2: [4]}
@@ -0,0 +1,69 @@
+# tests/test_reading_backend.py
+from datetime import datetime, timedelta, timezone
+
+from src.services.reading_backend import RingBufferBackend
+
+START = datetime(2024, 5, 16, 10, tzinfo=timezone.utc)
+
+
+def _row(register_id, value, seconds, quality='good'):
+    return {'register_id': register_id, 'timestamp': START + timedelta(seconds=seconds),
+            'raw_value': value, 'scaled_value': value, 'quality': quality}
+
+
+def test_ring_buffer_keeps_only_the_newest_rows_per_register():
+    backend = RingBufferBackend(size=3)
+    backend.ingest([_row(1, float(i), i) for i in range(5)] + [_row(2, 7.0, 0)])
+    rows = backend.range(1, START, START + timedelta(minutes=1))
+    assert [r['scaled_value'] for r in rows] == [4.0, 3.0, 2.0]
+    assert backend.stats()['rows'] == 4
+
+
+def test_latest_and_range_limits():
+    backend = RingBufferBackend()
+    backend.ingest([_row(1, 1.0, 10), _row(1, 2.0, 5), _row(2, 3.0, 0)])
+    assert sorted(r['scaled_value'] for r in backend.latest([1, 2, 3])) == [1.0, 3.0]
+    assert [r['scaled_value'] for r in backend.range(1, START, START + timedelta(seconds=8))] == [2.0]
+    assert len(backend.range(1, START, START + timedelta(minutes=1), limit=1)) == 1
+
+
+def test_aggregate_matches_rollup_shape_and_skips_bad_quality():
+    backend = RingBufferBackend()
+    backend.ingest([_row(1, 2.0, 10), _row(1, 4.0, 70), _row(1, 6.0, 80), _row(1, 99.0, 90, 'bad')])
+    buckets = backend.aggregate(1, START, START + timedelta(minutes=5), interval_minutes=1)
+    assert [b['count'] for b in buckets] == [1, 2]
+    assert buckets[1]['time_bucket'] == START + timedelta(minutes=1)
+    assert (buckets[1]['avg_value'], buckets[1]['first_value'], buckets[1]['last_value']) == (5.0, 4.0, 6.0)
+
+
+def test_iter_history_is_ascending_with_utc_timestamps():
+    backend = RingBufferBackend()
+    backend.ingest([_row(1, 2.0, 20), _row(1, 1.0, 10), _row(1, 3.0, 90), _row(2, 9.0, 15)])
+    rows = list(backend.iter_history(1, START, START + timedelta(seconds=60)))
+    assert [r['scaled_value'] for r in rows] == [1.0, 2.0]
+    assert rows[0]['timestamp'].tzinfo is timezone.utc
+
+
+def test_read_endpoints_use_the_sink_backend(tmp_path, monkeypatch):
+    import json
+
+    from src.services.reading_sink import reading_sink
+    from tests.utils.app import storage_app
+
+    app = storage_app(tmp_path, READINGS_BACKEND='memory')
+    monkeypatch.setattr(reading_sink, 'backend', reading_sink.backend)  # restaura o backend ao final
+    monkeypatch.setattr(reading_sink, 'app', reading_sink.app)
+    reading_sink.init_app(app)  # como o PollingService faz ao iniciar
+    assert reading_sink.backend.name == 'memory'
+    reading_sink.backend.ingest([_row(1, float(i), i * 60) for i in range(5)])
+
+    client = app.test_client()
+    window = '&start=2024-05-16T10:00:00Z&end=2024-05-16T11:00:00Z'
+    response = client.get('/plcs/readings/export?register_id=1&format=ndjson' + window)
+    assert [json.loads(line)['scaled_value'] for line in response.get_data(as_text=True).splitlines()] == \
+        [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    # sem rollups no ring buffer: mesmo um intervalo longo lê a série bruta
+    body = client.get('/plcs/readings/history?register_id=1'
+                      '&start=2024-05-10T00:00:00Z&end=2024-05-17T00:00:00Z').get_json()
+    assert (body['source'], body['input_points']) == ('raw', 5)
@@ -0,0 +1,73 @@
+# tests/test_reading_repository.py
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func, inspect, select
+
+from src.db.partitions import reading_partitions
+from src.db.storage import storage
+from src.models.CurrentValue import CurrentValue
+from src.repositories import reading_repository
+from src.repositories.reading_repository import ReadingRepository
+from tests.utils.app import storage_app
+
+
+def _count(table):
+    with storage.reader() as conn:
+        return conn.execute(select(func.count()).select_from(table)).scalar_one()
+
+
+def test_insert_many_counts_rows_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(reading_repository, 'INSERT_CHUNK_SIZE', 7)
+    app = storage_app(tmp_path)
+    start = datetime(2024, 5, 16, 10, tzinfo=timezone.utc)
+    rows = ({'register_id': i % 3 + 1, 'timestamp': start + timedelta(seconds=i),
+             'raw_value': i, 'scaled_value': i * 0.5, 'quality': 'good'} for i in range(50))
+    with app.app_context():
+        repository = ReadingRepository()
+        assert repository.insert_many(rows) == 50
+        assert _count(reading_partitions.table(date(2024, 5, 16))) == 50
+        with storage.reader() as conn:
+            latest = dict(conn.execute(select(CurrentValue.__table__.c.register_id,
+                                              CurrentValue.__table__.c.raw_value)).all())
+        assert latest == {1: 48, 2: 49, 3: 47}
+        history = repository.get_historical_data(1, start, start + timedelta(minutes=1), limit=100)
+        assert len(history) == 17
+        assert history[0]['raw_value'] == 48
+
+
+def test_insert_columns_routes_rows_across_midnight(tmp_path):
+    app = storage_app(tmp_path)
+    midnight = datetime(2024, 5, 17, tzinfo=timezone.utc)
+    timestamps = [midnight + timedelta(seconds=s) for s in (-2, -1, 0, 1, 2)]
+    with app.app_context():
+        repository = ReadingRepository()
+        assert repository.insert_columns([1] * 5, timestamps, range(5), range(5)) == 5
+
+        assert _count(reading_partitions.table(date(2024, 5, 16))) == 2
+        assert _count(reading_partitions.table(date(2024, 5, 17))) == 3
+        history = repository.get_historical_data(1, timestamps[0], timestamps[-1], limit=10)
+        assert [r['raw_value'] for r in history] == [4, 3, 2, 1, 0]
+
+
+def test_empty_batch_writes_nothing(tmp_path):
+    app = storage_app(tmp_path)
+    with app.app_context():
+        repository = ReadingRepository()
+        assert repository.insert_many([]) == 0
+        assert repository.insert_columns([], [], [], []) == 0
+        names = inspect(storage.writer_engine).get_table_names()
+        assert not [n for n in names if n.startswith('readings_') and n[len('readings_'):].isdigit()]
+        assert reading_partitions.tables_for_range(None, None) == []
+
+
+def test_second_batch_reuses_published_partition(tmp_path):
+    app = storage_app(tmp_path)
+    day = datetime(2024, 5, 16, 10, tzinfo=timezone.utc)
+    with app.app_context():
+        repository = ReadingRepository()
+        assert repository.insert_columns([1], [day], [1], [1]) == 1
+        assert repository.insert_columns([1], [day + timedelta(seconds=1)], [2], [2]) == 1
+
+        reading_partitions.reset()  # como após reiniciar: load() preenche as partições do banco
+        assert repository.insert_columns([1], [day + timedelta(seconds=2)], [3], [3]) == 1
+        assert _count(reading_partitions.table(date(2024, 5, 16))) == 3
@@ -0,0 +1,168 @@
+# tests/test_reading_sink.py
+import asyncio
+from datetime import datetime, timezone
+
+from flask import Flask
+
+from src.services import reading_sink as reading_sink_module
+from src.services.reading_backend import ReadingBackend
+from src.services.reading_sink import ReadingSink
+
+
+class _RecordingBackend(ReadingBackend):
+    name = 'test'
+
+    def __init__(self):
+        self.batches = []
+
+    def ingest(self, rows):
+        self.batches.append(len(rows))
+        return len(rows)
+
+    def latest(self, register_ids):
+        return []
+
+    def range(self, register_id, start_time, end_time, limit=1000):
+        return []
+
+    def iter_history(self, register_id, start_time, end_time):
+        return iter(())
+
+    def aggregate(self, register_id, start_time, end_time, interval_minutes=5):
+        return []
+
+
+def _rows(n):
+    ts = datetime(2024, 5, 16, tzinfo=timezone.utc)
+    return [{'register_id': 1, 'timestamp': ts, 'raw_value': i, 'scaled_value': i, 'quality': 'good'}
+            for i in range(n)]
+
+
+def _sink(**kwargs):
+    backend = _RecordingBackend()
+    return ReadingSink(Flask(__name__), backend=backend, **kwargs), backend
+
+
+def test_full_batches_flush_immediately():
+    sink, backend = _sink(max_batch=3, max_delay_ms=10_000)
+
+    async def _run():
+        await sink.start()
+        sink.push(_rows(7))
+        await asyncio.sleep(0.1)
+        written = list(backend.batches)
+        await sink.stop()
+        return written
+
+    assert asyncio.run(_run()) == [3, 3]
+    assert backend.batches == [3, 3, 1]  # o resto sai no encerramento
+
+
+def test_partial_batch_flushes_after_max_delay():
+    sink, backend = _sink(max_batch=1000, max_delay_ms=100)
+
+    async def _run():
+        await sink.start()
+        sink.push(_rows(2))
+        await asyncio.sleep(0.03)
+        early = list(backend.batches)
+        await asyncio.sleep(0.2)
+        late = list(backend.batches)
+        await sink.stop()
+        return early, late
+
+    assert asyncio.run(_run()) == ([], [2])
+
+
+def test_stop_flushes_everything_left():
+    sink, backend = _sink(max_batch=1000, max_delay_ms=10_000)
+
+    async def _run():
+        await sink.start()
+        sink.push(_rows(5))
+        sink.push(_rows(4))
+        await sink.stop()
+
+    asyncio.run(_run())
+    assert backend.batches == [9]
+    assert sink.stats()['queue_depth'] == 0 and sink.rows_written == 9
+
+
+def test_partial_flush_keeps_age_of_rows_left_behind(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(reading_sink_module.time, 'monotonic', lambda: clock[0])
+    sink, backend = _sink(max_batch=3, max_delay_ms=500, max_queue=5)
+
+    sink.push(_rows(2))          # t=0
+    clock[0] = 1.0
+    sink.push(_rows(2))          # t=1
+    clock[0] = 5.0
+    asyncio.run(sink._flush())   # grava 3: sobra uma linha do push de t=1
+    assert backend.batches == [3]
+    assert sink.oldest_enqueued == 1.0
+
+    sink.push(_rows(5))          # fila com 6 > max_queue: descarta a linha de t=1
+    assert sink.rows_dropped == 1
+    assert sink.oldest_enqueued == 5.0
+    asyncio.run(sink._flush())
+    asyncio.run(sink._flush())
+    assert sink.oldest_enqueued == 5.0 and not sink._arrivals
+
+
+class _FlakyBackend(_RecordingBackend):
+    """Falha nas primeiras `failures` gravações (ex.: "database is locked")"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.rows = []
+
+    def ingest(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        self.rows.extend(r['raw_value'] for r in rows)
+        return super().ingest(rows)
+
+
+def test_failed_batch_is_retried_with_backoff_until_written():
+    backend = _FlakyBackend(failures=3)
+    sink = ReadingSink(Flask(__name__), backend=backend, max_batch=4, max_delay_ms=10_000,
+                       retry_delay_ms=20, max_retry_delay_ms=40)
+
+    async def _run():
+        await sink.start()
+        sink.push(_rows(6))
+        await asyncio.sleep(0.03)
+        in_backoff = sink.stats()
+        await asyncio.sleep(0.2)
+        await sink.stop()
+        return in_backoff
+
+    in_backoff = asyncio.run(_run())
+    assert in_backoff['queue_depth'] == 6 and in_backoff['write_failures'] >= 1
+    assert backend.rows == list(range(6))  # nada perdido, ordem mantida
+    assert sink.rows_written == 6 and sink.rows_dropped == 0
+    assert sink.rows_failed == 12 and sink.stats()['write_failures'] == 0
+
+
+def test_requeued_batch_keeps_age_and_only_overflow_drops(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(reading_sink_module.time, 'monotonic', lambda: clock[0])
+    backend = _FlakyBackend(failures=10)
+    sink = ReadingSink(Flask(__name__), backend=backend, max_batch=3, max_queue=5,
+                       retry_delay_ms=500, max_retry_delay_ms=1000)
+
+    sink.push(_rows(4))
+    clock[0] = 2.0
+    asyncio.run(sink._flush())
+    assert len(sink._queue) == 4 and sink.oldest_enqueued == 0.0
+    assert sink._retry_at == 2.5
+    asyncio.run(sink._flush())
+    assert sink._retry_at == 3.0  # espera dobra até max_retry_delay_ms
+    asyncio.run(sink._flush())
+    assert sink._retry_at == 3.0
+
+    sink.push(_rows(3))  # 7 > max_queue: só o excesso (as mais antigas) sai
+    assert sink.rows_dropped == 2
+    assert [r['raw_value'] for r in sink._queue] == [2, 3, 0, 1, 2]
@@ -0,0 +1,58 @@
+# tests/test_rollups.py
+from datetime import datetime, timezone
+
+from src.models.Rollup import Rollup1m, Rollup1h, Rollup1d
+from src.repositories.rollup_repository import RollupRepository, aggregate_rows
+
+
+def _row(second, value, quality='good'):
+    ts = datetime(2024, 5, 16, 10, 0, second, tzinfo=timezone.utc)
+    return {'register_id': 7, 'timestamp': ts, 'scaled_value': value, 'quality': quality}
+
+
+def test_aggregate_min_max_first_last_and_skips_bad_quality():
+    rows = [_row(30, 5.0), _row(10, 2.0), _row(50, 9.0), _row(20, 100.0, 'bad')]
+    [bucket] = aggregate_rows(rows, 60)
+    assert bucket['bucket'] == int(datetime(2024, 5, 16, 10, tzinfo=timezone.utc).timestamp())
+    assert (bucket['count'], bucket['sum_value']) == (3, 16.0)
+    assert (bucket['min_value'], bucket['max_value']) == (2.0, 9.0)
+    assert (bucket['first_value'], bucket['last_value']) == (2.0, 9.0)
+
+
+def test_rollup_level_for_interval():
+    assert RollupRepository.model_for(5) is Rollup1m
+    assert RollupRepository.model_for(90) is Rollup1m
+    assert RollupRepository.model_for(120) is Rollup1h
+    assert RollupRepository.model_for(7 * 24 * 60) is Rollup1d
+
+
+def test_backfill_keeps_rollups_of_archived_days(tmp_path):
+    from datetime import timedelta
+
+    from src.repositories.reading_repository import ReadingRepository
+    from src.services.archiver import ColdArchiver
+    from tests.utils.app import storage_app
+
+    app = storage_app(tmp_path)
+    archived = datetime(2024, 5, 16, tzinfo=timezone.utc)
+    hot = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    with app.app_context():
+        repository = ReadingRepository()
+        repository.insert_columns([1] * 120 + [2] * 60,
+                                  [archived + timedelta(minutes=i) for i in range(120)]
+                                  + [archived + timedelta(hours=5, minutes=i) for i in range(60)],
+                                  range(180), [1.0] * 120 + [2.0] * 60)
+        repository.insert_columns([1] * 10, [hot + timedelta(minutes=i) for i in range(10)], range(10), [3.0] * 10)
+        assert ColdArchiver(app).run_once() == 1
+
+        rollups = RollupRepository()
+        assert rollups.backfill() == 190
+        [day] = rollups.get_buckets(Rollup1d, 1, archived, archived)
+        assert (day['count'], day['sum_value']) == (120, 120.0)
+        assert len(rollups.get_buckets(Rollup1h, 2, archived, archived + timedelta(days=1))) == 1
+        [today] = rollups.get_buckets(Rollup1d, 1, hot, hot)
+        assert today['count'] == 10
+
+        # intervalo só com o dia quente: o dia arquivado fica como estava
+        assert rollups.backfill(start_time=hot) == 10
+        assert rollups.get_buckets(Rollup1d, 1, archived, archived)[0]['count'] == 120
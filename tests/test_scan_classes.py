@@ -0,0 +1,29 @@
+# tests/test_scan_classes.py
+from types import SimpleNamespace
+
+from src.services.polling_service import PollingService
+from src.services.read_plan_cache import PLCReadPlan
+
+
+def _due_sequence(periods, ticks_ms):
+    plan = SimpleNamespace(scan_classes={period: [] for period in periods})
+    next_due = {}
+    return [sorted(PollingService._due_scan_classes(plan, next_due, t / 1000)) for t in ticks_ms]
+
+
+def test_each_class_fires_on_its_own_grid():
+    due = _due_sequence([100, 500], range(1_000_000, 1_001_100, 100))
+    assert [d for d in due if 500 in d] == [[100, 500], [100, 500], [100, 500]]
+    assert due[0] == [100, 500] and due[1] == [100] and due[5] == [100, 500]
+
+
+def test_skipped_tick_reads_on_the_next_one():
+    # o tick de 1_000_500 foi pulado: a classe de 500 ms lê em 1_000_600, sem esperar 1_001_000
+    due = _due_sequence([100, 500], [1_000_000, 1_000_400, 1_000_600, 1_000_700, 1_001_000])
+    assert due == [[100, 500], [100], [100, 500], [100], [100, 500]]
+
+
+def test_base_period_is_gcd_unless_too_small():
+    assert PLCReadPlan._base_period([1000, 250, 500]) == 250
+    assert PLCReadPlan._base_period([1000, 1500]) == 500
+    assert PLCReadPlan._base_period([1000, 1001]) == 1000
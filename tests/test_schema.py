@@ -0,0 +1,30 @@
+# tests/test_schema.py
+import os
+import shutil
+
+from sqlalchemy import inspect
+
+from src.db import db
+from src.db.schema import add_missing_columns
+from src.models import PLC, Register
+from src.models.PLC import search_key
+from tests.utils.app import storage_app
+
+APP_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src', 'db', 'app.db')
+
+
+def test_existing_database_gets_new_columns_at_startup(tmp_path):
+    # banco criado antes das colunas novas de plcs/registers
+    shutil.copy(APP_DB, tmp_path / 'test.db')
+    app = storage_app(tmp_path)
+    with app.app_context():
+        columns = {c['name'] for c in inspect(db.engine).get_columns('registers')}
+        assert {'byte_order', 'word_order', 'bit_index', 'length', 'deadband', 'deadband_mode',
+                'heartbeat_interval', 'scan_class'} <= columns
+        plc = db.session.query(PLC).first()
+        assert plc.pipeline_window == 1  # linhas antigas recebem o default do modelo
+        assert plc.name_search == search_key(plc.name)
+        assert Register.query.count() == 0
+
+        with db.engine.begin() as conn:
+            assert add_missing_columns(conn, PLC.__table__) == []
@@ -0,0 +1,33 @@
+# tests/test_storage.py
+from sqlalchemy import text
+
+from config import Config
+from src.db.storage import storage, DEFAULT_SQLITE_PRAGMAS
+from tests.utils.app import storage_app
+
+
+def _pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_config_uses_storage_default_pragmas():
+    assert Config.SQLITE_PRAGMAS == DEFAULT_SQLITE_PRAGMAS
+
+
+def test_writer_and_reader_connections_report_pragmas(tmp_path):
+    storage_app(tmp_path)
+
+    with storage.writer() as conn:
+        assert _pragma(conn, 'journal_mode') == 'wal'
+        assert _pragma(conn, 'synchronous') == 1  # NORMAL
+        assert _pragma(conn, 'busy_timeout') == 5000
+        assert _pragma(conn, 'cache_size') == -64000
+        assert _pragma(conn, 'temp_store') == 2  # MEMORY
+        assert _pragma(conn, 'query_only') == 0
+
+    with storage.reader() as conn:
+        assert _pragma(conn, 'journal_mode') == 'wal'
+        assert _pragma(conn, 'busy_timeout') == 5000
+        assert _pragma(conn, 'cache_size') == -64000
+        assert _pragma(conn, 'temp_store') == 2
+        assert _pragma(conn, 'query_only') == 1
@@ -0,0 +1,23 @@
+# tests/utils/app.py
+import os
+
+from config import Config
+from src.db.partitions import reading_partitions
+from src.views import create_app
+
+
+def storage_app(tmp_path, **config):
+    """
+    App completa sobre um SQLite em arquivo dentro de `tmp_path` (engines de
+    escrita e leitura separados, como em produção) e arquivo frio no mesmo diretório.
+    """
+    class TestConfig(Config):
+        TESTING = True
+        LOGIN_DISABLED = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp_path, 'test.db')}"
+        ARCHIVE_DIR = os.path.join(tmp_path, 'archive')
+
+    for key, value in config.items():
+        setattr(TestConfig, key, value)
+    reading_partitions.reset()
+    return create_app(TestConfig)
@@ -0,0 +1,26 @@
+# tests/utils/modbus.py
+import socket
+import threading
+import time
+
+from src.simulations.simulation import start_modbus_simulator
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_simulator(timeout: float = 5.0) -> int:
+    """Sobe o simulador Modbus de src/simulations em uma thread e retorna a porta"""
+    port = free_port()
+    threading.Thread(target=start_modbus_simulator, args=('127.0.0.1', port), daemon=True).start()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return port
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("simulador Modbus não subiu")